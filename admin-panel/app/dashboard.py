@@ -17,7 +17,7 @@ import streamlit as st
 
 # ── Shared imports ───────────────────────────────────────────────────────────
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import load_config, save_config
+from shared.config_store import load_config, save_config, set_config_value, transaction
 try:
     from shared.recipient_manager import render_recipient_manager
 except ImportError:
@@ -59,7 +59,15 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 
 def _load_module(tool_dir: str, module_file: str):
-    """Load a Python module by file path using importlib (avoids 'app' package collision)."""
+    """Load a Python module by file path using importlib (avoids 'app' package collision).
+
+    Each module is executed once per process and reused on reruns; running
+    it again would create new live config values (and config-change
+    subscriptions) every time.
+    """
+    mod_name = f"_admin_{tool_dir.replace('-', '_')}_{module_file.replace('.py', '')}"
+    if mod_name in sys.modules:
+        return sys.modules[mod_name]
     file_path = _PROJECT_ROOT / tool_dir / "app" / module_file
     if not file_path.exists():
         return None
@@ -69,11 +77,14 @@ def _load_module(tool_dir: str, module_file: str):
     for p in (tool_root, shared_root):
         if p not in sys.path:
             sys.path.insert(0, p)
-    mod_name = f"_admin_{tool_dir.replace('-', '_')}_{module_file.replace('.py', '')}"
     spec = importlib.util.spec_from_file_location(mod_name, file_path)
     mod = importlib.util.module_from_spec(spec)
     sys.modules[mod_name] = mod  # register before exec so @dataclass can find it
-    spec.loader.exec_module(mod)
+    try:
+        spec.loader.exec_module(mod)
+    except BaseException:
+        del sys.modules[mod_name]  # don't reuse a half-initialized module
+        raise
     return mod
 
 
@@ -82,10 +93,10 @@ def _load_defaults(tool_name: str) -> dict:
     try:
         if tool_name == "case-checklist":
             mod = _load_module("case-checklist", "checklists.py")
-            return {"case_types": mod.CASE_TYPES, "templates": mod._TEMPLATES}
+            return {"case_types": mod.CASE_TYPES.copy(), "templates": mod._TEMPLATES.copy()}
         elif tool_name == "cover-letters":
             mod = _load_module("cover-letters", "templates.py")
-            return {"filing_offices": mod.FILING_OFFICES, "templates": mod.TEMPLATES}
+            return {"filing_offices": mod.FILING_OFFICES.copy(), "templates": mod.TEMPLATES.copy()}
         elif tool_name == "declaration-drafter":
             mod = _load_module("declaration-drafter", "prompts.py")
             return {"declaration_types": mod.DECLARATION_TYPES, "prompts": mod.DECLARATION_PROMPTS}
@@ -93,19 +104,19 @@ def _load_defaults(tool_name: str) -> dict:
             mod = _load_module("legal-research", "case_law.py")
             from dataclasses import asdict
             decisions = {k: asdict(v) for k, v in mod.KEY_DECISIONS.items()}
-            return {"decisions": decisions, "topics": mod.LEGAL_TOPICS}
+            return {"decisions": decisions, "topics": mod.LEGAL_TOPICS.copy()}
         elif tool_name == "forms-assistant":
             mod = _load_module("forms-assistant", "form_definitions.py")
-            return {"supported_forms": mod.SUPPORTED_FORMS}
+            return {"supported_forms": mod.SUPPORTED_FORMS.copy()}
         elif tool_name == "evidence-indexer":
             mod = _load_module("evidence-indexer", "evidence.py")
-            return {"document_categories": mod.DOCUMENT_CATEGORIES}
+            return {"document_categories": mod.DOCUMENT_CATEGORIES.copy()}
         elif tool_name == "timeline-builder":
             mod = _load_module("timeline-builder", "events.py")
-            return {"event_categories": mod.EVENT_CATEGORIES, "category_descriptions": mod.CATEGORY_DESCRIPTIONS}
+            return {"event_categories": mod.EVENT_CATEGORIES.copy(), "category_descriptions": mod.CATEGORY_DESCRIPTIONS.copy()}
         elif tool_name == "document-translator":
             mod = _load_module("document-translator", "translator.py")
-            return {"languages": mod.LANGUAGES}
+            return {"languages": mod.LANGUAGES.copy()}
     except Exception:
         pass
     return {}
@@ -1065,12 +1076,27 @@ def _editor_salesforce_fields():
         "Turn off any field that causes permission errors. Changes take effect immediately on save."
     )
 
+    # Describe metadata is cached on disk and shared by every tool; the
+    # refresh button drops that cache so all tools see schema changes now.
+    sys.path.insert(0, str(_PROJECT_ROOT))
+    from shared import sf_describe_cache
+
+    _desc_info = sf_describe_cache.get_cache_info()
+    if _desc_info["oldest_check"]:
+        from datetime import datetime as _dt
+
+        _checked = _dt.fromtimestamp(_desc_info["oldest_check"]).strftime("%b %d %H:%M")
+        st.caption(
+            f"Cached metadata for {_desc_info['objects']} object(s), "
+            f"{_desc_info['bytes'] / 1024:.0f} KB; oldest check against Salesforce {_checked}."
+        )
+
     # Try to pull live field metadata from Salesforce
     sf_meta = {}
     if st.button("Refresh field metadata from Salesforce", key="sf_refresh"):
         try:
-            sys.path.insert(0, str(_PROJECT_ROOT))
-            from shared.salesforce_client import get_field_metadata
+            from shared.salesforce_client import get_field_metadata, refresh_describe_cache
+            refresh_describe_cache()
             sf_meta = get_field_metadata()
             st.session_state._sf_field_meta = sf_meta
             st.toast(f"Loaded metadata for {len(sf_meta)} fields")
@@ -1752,8 +1778,7 @@ def _editor_client_banner():
              "When disabled, only the read-only info ribbon is shown.",
     )
     if _new_pull_bar != _cur_pull_bar:
-        _global["show_pull_bar"] = _new_pull_bar
-        save_config("global-settings", _global)
+        set_config_value("global-settings", "show_pull_bar", _new_pull_bar)
         st.toast("Pull bar setting saved!")
         st.rerun()
 
@@ -1809,9 +1834,9 @@ def _editor_client_banner():
 
     if _fields_changed or _size_changed:
         if st.button("Save Banner Settings", type="primary", key="_banner_fields_save"):
-            _global["banner_fields"] = updated_fields
-            _global["banner_font_size"] = new_size
-            save_config("global-settings", _global)
+            with transaction("global-settings") as txn:
+                txn["banner_fields"] = updated_fields
+                txn["banner_font_size"] = new_size
             st.toast("Banner settings saved! Restart tools to see changes.")
             st.rerun()
     else:
@@ -2073,8 +2098,7 @@ def _editor_firm_info():
     new_name = st.text_input("Firm Name", value=cur_name, key="_firm_name")
     if new_name != cur_name:
         if st.button("Save Firm Name", type="primary", key="_firm_name_save"):
-            _global["firm_name"] = new_name
-            save_config("global-settings", _global)
+            set_config_value("global-settings", "firm_name", new_name)
             st.toast("Firm name saved!")
             st.rerun()
 
@@ -2110,8 +2134,7 @@ def _editor_firm_info():
                 })
                 save_config("firm-locations", locations)
                 # Keep firm_address in sync with first location
-                _global["firm_address"] = locations[0]["address"]
-                save_config("global-settings", _global)
+                set_config_value("global-settings", "firm_address", locations[0]["address"])
                 st.toast(f"Added location: {loc_name.strip()}")
                 st.rerun()
 
@@ -2135,15 +2158,13 @@ def _editor_firm_info():
             removed = locations.pop(li)
             st.toast(f"Removed location: {removed.get('name', '')}")
         save_config("firm-locations", locations)
-        _global["firm_address"] = locations[0]["address"] if locations else ""
-        save_config("global-settings", _global)
+        set_config_value("global-settings", "firm_address", locations[0]["address"] if locations else "")
         st.rerun()
 
     if loc_changed:
         if st.button("Save Location Changes", type="primary", key="_loc_save"):
             save_config("firm-locations", locations)
-            _global["firm_address"] = locations[0]["address"] if locations else ""
-            save_config("global-settings", _global)
+            set_config_value("global-settings", "firm_address", locations[0]["address"] if locations else "")
             st.toast("Locations saved!")
             st.rerun()
 
@@ -2344,11 +2365,13 @@ def _editor_api_usage():
 
     try:
         from shared.usage_tracker import (
+            get_cache_summary,
             get_daily_breakdown,
             get_entries_since,
             get_monthly_summary,
             get_per_tool_breakdown,
             load_budgets,
+            rebuild_rollups,
             save_budgets,
         )
     except ImportError:
@@ -2377,6 +2400,8 @@ def _editor_api_usage():
             st.metric("Tokens Used", f"{total_tokens / 1_000:.1f}K")
         else:
             st.metric("Tokens Used", f"{total_tokens}")
+        if anth.get("cache_read_tokens"):
+            st.caption(f"+{anth['cache_read_tokens']:,} read from prompt cache")
     with m3:
         st.metric("Estimated Cost", f"${anth['cost_usd']:.2f}")
     with m4:
@@ -2447,10 +2472,25 @@ def _editor_api_usage():
             step=5.0,
             key="_budget_google",
         )
+        _modes = {
+            "warn": "Warn only — calls continue past the budget",
+            "block": "Block — AI and translation calls stop once the budget is spent",
+            "off": "Off — don't check budgets",
+        }
+        _cur_mode = budgets.get("enforcement", "warn")
+        new_mode = st.radio(
+            "When a budget is reached",
+            options=list(_modes),
+            index=list(_modes).index(_cur_mode) if _cur_mode in _modes else 0,
+            format_func=_modes.get,
+            key="_budget_enforcement",
+        )
         if st.button("Save Budgets", type="primary", key="_budget_save"):
             save_budgets({
+                **budgets,
                 "anthropic_monthly_usd": new_anth,
                 "google_monthly_usd": new_google,
+                "enforcement": new_mode,
             })
             st.toast("Budgets saved!")
             st.rerun()
@@ -2480,6 +2520,186 @@ def _editor_api_usage():
     else:
         st.info("No API calls recorded this month.")
 
+    # ── Salesforce API ──────────────────────────────────────────────────────
+    st.markdown("---")
+    st.markdown("### Salesforce API")
+    st.caption(
+        "Salesforce allows the org a fixed number of REST calls per rolling 24 hours. "
+        "Background jobs (the client mirror) pause once the share set below is used."
+    )
+
+    from shared import salesforce_client
+    from shared.usage_tracker import get_api_limit, get_salesforce_summary
+
+    sf_summary = get_salesforce_summary()
+    sf_limit = get_api_limit("salesforce")
+    sa1, sa2, sa3 = st.columns(3)
+    with sa1:
+        if sf_limit and sf_limit["limit"]:
+            st.metric("Org Usage (24h)", f"{sf_limit['used']:,} / {sf_limit['limit']:,}")
+            st.progress(min(sf_limit["fraction"], 1.0))
+            st.caption(f"As of {datetime.fromtimestamp(sf_limit['checked_at']):%b %d, %H:%M}")
+        else:
+            st.metric("Org Usage (24h)", "—")
+    with sa2:
+        st.metric("Our Calls Today", f"{sf_summary['today']:,}")
+    with sa3:
+        st.metric("Our Calls This Month", f"{sf_summary['month']:,}")
+
+    if sf_summary["tools"]:
+        for row in sf_summary["tools"]:
+            c1, c2, c3 = st.columns([3, 1, 1])
+            with c1:
+                st.markdown(f"**{row['tool']}**")
+            with c2:
+                st.caption(f"{row['today']:,} today")
+            with c3:
+                st.caption(f"{row['month']:,} this month")
+        if sf_summary["operations_today"]:
+            st.caption("Today by operation: " + ", ".join(
+                f"{op} {n:,}" for op, n in sf_summary["operations_today"].items()
+            ))
+
+    with st.expander("Background Throttling"):
+        new_fraction = st.slider(
+            "Pause background jobs at this share of the daily limit",
+            min_value=0.1,
+            max_value=1.0,
+            value=salesforce_client.background_threshold(),
+            step=0.05,
+            format="%.2f",
+            key="_sf_bg_fraction",
+        )
+        sl1, sl2 = st.columns(2)
+        with sl1:
+            if st.button("Save Threshold", type="primary", key="_sf_bg_save"):
+                set_config_value("sf-api-limits", "background_max_fraction", float(new_fraction))
+                st.toast("Salesforce throttling saved!")
+                st.rerun()
+        with sl2:
+            if st.button("Check Limits Now", key="_sf_limits_refresh"):
+                try:
+                    salesforce_client.get_api_limits(refresh=True)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Could not read Salesforce limits: {e}")
+
+    # ── Response cache ──────────────────────────────────────────────────────
+    st.markdown("---")
+    st.markdown("### Response Cache")
+    st.caption(
+        "Identical drafting requests can be answered from a local cache instead of "
+        "a new API call. Off by default; enable it per tool below."
+    )
+
+    from shared import response_cache
+
+    cache_stats = get_cache_summary()
+    cache_info = response_cache.get_cache_info()
+    rc1, rc2, rc3, rc4 = st.columns(4)
+    with rc1:
+        st.metric("Cache Hits", f"{cache_stats['hits']}")
+    with rc2:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    with rc3:
+        st.metric("Saved This Month", f"${cache_stats['saved_usd']:.2f}")
+    with rc4:
+        st.metric("Cached Responses", f"{cache_info['entries']}",
+                  help=f"{cache_info['bytes'] / 1024 / 1024:.1f} MB on disk")
+
+    with st.expander("Cache Settings"):
+        cache_settings = response_cache.load_settings()
+        new_tools = dict(cache_settings["tools"])
+        for _tk, _tl in response_cache.cacheable_tools().items():
+            new_tools[_tk] = st.toggle(
+                _tl, value=bool(new_tools.get(_tk, False)), key=f"_rc_tool_{_tk}"
+            )
+        cs1, cs2 = st.columns(2)
+        with cs1:
+            new_ttl = st.number_input(
+                "Keep responses for (hours)",
+                value=float(cache_settings["ttl_hours"]),
+                min_value=1.0,
+                step=12.0,
+                key="_rc_ttl",
+            )
+        with cs2:
+            new_max_mb = st.number_input(
+                "Maximum cache size (MB)",
+                value=float(cache_settings["max_mb"]),
+                min_value=1.0,
+                step=50.0,
+                key="_rc_max_mb",
+            )
+        bc1, bc2 = st.columns(2)
+        with bc1:
+            if st.button("Save Cache Settings", type="primary", key="_rc_save"):
+                response_cache.save_settings({
+                    "tools": new_tools,
+                    "ttl_hours": new_ttl,
+                    "max_mb": new_max_mb,
+                })
+                st.toast("Cache settings saved!")
+                st.rerun()
+        with bc2:
+            if st.button("Clear Cache", key="_rc_clear"):
+                removed = response_cache.clear()
+                st.toast(f"Removed {removed} cached responses.")
+                st.rerun()
+
+    # ── Model routing ───────────────────────────────────────────────────────
+    st.markdown("---")
+    st.markdown("### Model Routing")
+    st.caption(
+        "Send small or simple calls to Haiku instead of Sonnet. Calls whose output "
+        "fails validation are retried on Sonnet automatically."
+    )
+
+    with st.expander("Routing Rules"):
+        routing = load_config("model-routing") or {}
+        routes = dict(routing.get("routes", {}))
+        _ROUTE_CHOICES = {"sonnet": "Sonnet", "haiku": "Haiku", "auto": "Auto (by size)"}
+        _ROUTE_TOOLS = [
+            ("brief-builder", "Brief Builder"),
+            ("cover-letters", "Filing Assembler"),
+            ("declaration-drafter", "Declaration Drafter"),
+            ("timeline-builder", "Timeline Builder"),
+            ("document-assembler", "Translation"),
+            ("hearing-prep", "Hearing Prep"),
+            ("country-reports", "Country Reports"),
+            ("legal-research", "Legal Research"),
+        ]
+        for _tk, _tl in _ROUTE_TOOLS:
+            current = routes.get(_tk, {})
+            mr1, mr2 = st.columns([2, 1])
+            with mr1:
+                model_choice = st.selectbox(
+                    _tl,
+                    options=list(_ROUTE_CHOICES),
+                    format_func=_ROUTE_CHOICES.get,
+                    index=list(_ROUTE_CHOICES).index(current.get("model", "sonnet"))
+                    if current.get("model", "sonnet") in _ROUTE_CHOICES else 0,
+                    key=f"_mr_model_{_tk}",
+                )
+            with mr2:
+                threshold = st.number_input(
+                    "Haiku below (tokens)",
+                    value=int(current.get("small_below_tokens", 2000)),
+                    min_value=0,
+                    step=500,
+                    key=f"_mr_small_{_tk}",
+                    disabled=model_choice != "auto",
+                )
+            if model_choice == "sonnet":
+                routes.pop(_tk, None)
+            else:
+                routes[_tk] = {"model": model_choice, "small_below_tokens": int(threshold)}
+        if st.button("Save Routing", type="primary", key="_mr_save"):
+            routing["routes"] = routes
+            save_config("model-routing", routing)
+            st.toast("Model routing saved!")
+            st.rerun()
+
     # ── Daily trend ─────────────────────────────────────────────────────────
     st.markdown("---")
     st.markdown("### Daily Trend (Last 30 Days)")
@@ -2536,6 +2756,9 @@ def _editor_api_usage():
             "|-------|-------|--------|\n"
             "| Claude Sonnet 4.5 | $3.00 / MTok | $15.00 / MTok |\n"
             "| Claude Haiku 3.5 | $0.80 / MTok | $4.00 / MTok |\n"
+            "| Prompt cache write | 1.25× input price | — |\n"
+            "| Prompt cache read | 0.1× input price | — |\n"
+            "| Message Batches | 50% of the above | 50% of the above |\n"
             "| Google Translate v2 | $20.00 / M chars | — |\n"
             "| Google Docs upload | Free | — |"
         )
@@ -2543,6 +2766,14 @@ def _editor_api_usage():
             "Costs are estimated locally based on token counts from API responses. "
             "Actual billing may differ slightly. Check console.anthropic.com for your real balance."
         )
+        st.caption(
+            "Totals above come from pre-aggregated daily rollups. If they ever look out of "
+            "sync with Recent Activity, rebuild them from the raw log."
+        )
+        if st.button("Rebuild Usage Totals", key="_usage_rebuild_rollups"):
+            rebuild_rollups()
+            st.toast("Usage totals rebuilt from the raw log.")
+            st.rerun()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -2915,8 +3146,7 @@ with tab_governance:
                 _ct[_comp_key] = _comp_cfg
 
         if _ct_changed:
-            _global_ct["component_toggles"] = _ct
-            save_config("global-settings", _global_ct)
+            set_config_value("global-settings", "component_toggles", _ct)
             st.toast("Component toggle settings saved!")
             st.rerun()
 
@@ -2939,8 +3169,7 @@ with tab_governance:
                 _sidebars[_tool_key] = _val
                 _changed = True
         if _changed:
-            _global["sidebars"] = _sidebars
-            save_config("global-settings", _global)
+            set_config_value("global-settings", "sidebars", _sidebars)
             st.toast("Sidebar settings saved!")
             st.rerun()
     elif gov_sub == "Security":
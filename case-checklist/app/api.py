@@ -63,7 +63,7 @@ class AddItemRequest(BaseModel):
 @app.get("/api/case-types")
 def get_case_types() -> list[str]:
     """List all available case types."""
-    return CASE_TYPES
+    return list(CASE_TYPES)
 
 
 @app.get("/api/cases")
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import json
 import uuid
+from collections.abc import Mapping, Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -18,7 +19,7 @@ from typing import Any
 
 import sys as _sys
 _sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value
+from shared.config_store import live_config_value
 
 # ── Storage ──────────────────────────────────────────────────────────────────
 
@@ -59,7 +60,7 @@ class Case:
 
 # ── Templates ────────────────────────────────────────────────────────────────
 
-_DEFAULT_CASE_TYPES: list[str] = [
+_DEFAULT_CASE_TYPES: Sequence[str] = [
     "Asylum (I-589)",
     "Family-Based (I-130/I-485)",
     "Adjustment of Status (I-485)",
@@ -76,7 +77,7 @@ _DEFAULT_CASE_TYPES: list[str] = [
     "Bond / Custody (I-352)",
 ]
 
-_DEFAULT_TEMPLATES: dict[str, list[dict[str, str]]] = {
+_DEFAULT_TEMPLATES: Mapping[str, list[dict[str, str]]] = {
     "Asylum (I-589)": [
         # Filing
         {"title": "I-589 application completed and signed", "category": "Filing"},
@@ -440,8 +441,8 @@ _DEFAULT_TEMPLATES: dict[str, list[dict[str, str]]] = {
 }
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-CASE_TYPES: list[str] = get_config_value("case-checklist", "case_types", _DEFAULT_CASE_TYPES)
-_TEMPLATES: dict[str, list[dict[str, str]]] = get_config_value("case-checklist", "templates", _DEFAULT_TEMPLATES)
+CASE_TYPES: Sequence[str] = live_config_value("case-checklist", "case_types", _DEFAULT_CASE_TYPES)
+_TEMPLATES: Mapping[str, list[dict[str, str]]] = live_config_value("case-checklist", "templates", _DEFAULT_TEMPLATES)
 
 
 def _make_item_id() -> str:
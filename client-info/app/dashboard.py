@@ -22,6 +22,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from shared.config_store import get_config_value
 from shared.salesforce_client import (
     get_client,
+    get_client_snapshot,
     get_field_metadata,
     get_legal_cases,
     get_legal_case_field_metadata,
@@ -180,6 +181,8 @@ with pull_cols[0]:
     )
 with pull_cols[1]:
     do_pull = st.button("Pull from Salesforce", type="primary", use_container_width=True)
+# A click re-queries Salesforce; auto-pulls may use the short-lived record cache
+force_refresh = do_pull
 
 # Auto-pull on first load from query param or shared file
 if not st.session_state.get("_ci_loaded"):
@@ -200,18 +203,16 @@ if do_pull and customer_id:
         if key.startswith("fld_"):
             del st.session_state[key]
     try:
-        record = get_client(customer_id.strip())
+        # Contact, legal cases and tasks in a single round trip
+        snapshot = get_client_snapshot(customer_id.strip(), refresh=force_refresh)
+        record = snapshot["client"] if snapshot else None
         if record:
             st.session_state.sf_client = record
             st.session_state.sf_id = record.get("Id", "")
             st.session_state._ci_loaded = True
-            # Fetch Legal Cases
             sf_id = record.get("Id", "")
             if sf_id:
-                try:
-                    cases = get_legal_cases(sf_id)
-                except Exception:
-                    cases = []
+                cases = snapshot["legal_cases"]
                 st.session_state.sf_legal_cases = cases
                 # Auto-select: match Contact's Legal_Case__c lookup, or sole case
                 lc_lookup = record.get("Legal_Case__c")
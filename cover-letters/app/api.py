@@ -15,7 +15,6 @@ from pydantic import BaseModel
 
 from app.drafts import delete_draft, list_drafts, load_draft, save_draft
 from app.templates import (
-    CASE_TYPES,
     TEMPLATES,
     get_filing_office_address,
     render_cover_letter,
@@ -68,8 +67,7 @@ class DraftSaveRequest(BaseModel):
 def api_list_templates() -> list[dict]:
     """List all available case types and their template metadata."""
     result = []
-    for case_type in CASE_TYPES:
-        tpl = TEMPLATES[case_type]
+    for case_type, tpl in TEMPLATES.items():
         result.append({
             "case_type": case_type,
             "form_numbers": tpl.get("form_numbers", []),
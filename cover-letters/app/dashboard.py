@@ -66,10 +66,10 @@ try:
 except ImportError:
     get_legal_case_field_metadata = None
 try:
-    from shared.salesforce_client import get_case_beneficiaries, update_case_beneficiary, describe_case_contact_relationships
+    from shared.salesforce_client import get_case_beneficiaries, update_records, describe_case_contact_relationships
 except ImportError:
     get_case_beneficiaries = None
-    update_case_beneficiary = None
+    update_records = None
     describe_case_contact_relationships = None
 try:
     from shared.google_doc_creator import render_google_doc_button
@@ -2294,22 +2294,29 @@ with tab_eoir:
                                 st.markdown("---")
 
                         # Sync edits back to Salesforce
-                        if update_case_beneficiary:
+                        if update_records:
                             if st.button("Sync Beneficiary Edits to Salesforce", key="_cben_sync"):
                                 _sync_count = 0
+                                _sync_bens = [_sb for _sb in _selected_bens if _sb.get("Id")]
                                 with st.spinner("Syncing beneficiary edits..."):
-                                    for _sb in _selected_bens:
-                                        _sb_id = _sb.get("Id", "")
-                                        if not _sb_id:
-                                            continue
-                                        _sb_updates = {
-                                            "Alien_Number_Dashed__c": _sb.get("Alien_Number_Dashed__c", ""),
-                                        }
-                                        try:
-                                            update_case_beneficiary(_sb_id, _sb_updates)
+                                    # One collection request for the whole grid
+                                    try:
+                                        _sync_results = update_records("Case_Contact__c", [
+                                            {
+                                                "Id": _sb["Id"],
+                                                "Alien_Number_Dashed__c": _sb.get("Alien_Number_Dashed__c", ""),
+                                            }
+                                            for _sb in _sync_bens
+                                        ])
+                                    except Exception as e:
+                                        _sync_results = []
+                                        st.error(f"Failed to sync beneficiaries: {e}")
+                                    for _sb, _sr in zip(_sync_bens, _sync_results):
+                                        if _sr.get("success"):
                                             _sync_count += 1
-                                        except Exception as e:
-                                            st.error(f"Failed to sync {_sb.get('Contact_Name', '')}: {e}")
+                                        else:
+                                            _sr_msg = "; ".join(e.get("message", "") for e in _sr.get("errors", []))
+                                            st.error(f"Failed to sync {_sb.get('Contact_Name', '')}: {_sr_msg}")
                                 if _sync_count:
                                     st.toast(f"Synced {_sync_count} beneficiar{'ies' if _sync_count != 1 else 'y'} to Salesforce!")
             else:
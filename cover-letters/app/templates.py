@@ -8,11 +8,12 @@ the complete cover letter text from case data.
 from __future__ import annotations
 
 import sys as _sys
+from collections.abc import Mapping, Sequence
 from datetime import date
 from pathlib import Path as _Path
 
 _sys.path.insert(0, str(_Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value, load_config, save_config
+from shared.config_store import get_config_value, live_config_value, live_value, load_config, save_config
 
 import json
 
@@ -21,7 +22,7 @@ import json
 # Filing office address book
 # ---------------------------------------------------------------------------
 
-_DEFAULT_FILING_OFFICES: dict[str, str] = {
+_DEFAULT_FILING_OFFICES: Mapping[str, str] = {
     "USCIS Nebraska Service Center": (
         "USCIS Nebraska Service Center\n"
         "P.O. Box 87589\n"
@@ -269,7 +270,7 @@ def save_recipient_addresses(addresses: list[dict]) -> None:
 # Template definitions by case type
 # ---------------------------------------------------------------------------
 
-_DEFAULT_TEMPLATES: dict[str, dict] = {
+_DEFAULT_TEMPLATES: Mapping[str, dict] = {
     "Asylum (I-589)": {
         "case_type": "Asylum (I-589)",
         "form_numbers": ["I-589"],
@@ -575,8 +576,8 @@ _DEFAULT_TEMPLATES: dict[str, dict] = {
 }
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-FILING_OFFICES: dict[str, str] = get_config_value("cover-letters", "filing_offices", _DEFAULT_FILING_OFFICES)
-TEMPLATES: dict[str, dict] = get_config_value("cover-letters", "templates", _DEFAULT_TEMPLATES)
+FILING_OFFICES: Mapping[str, str] = live_config_value("cover-letters", "filing_offices", _DEFAULT_FILING_OFFICES)
+TEMPLATES: Mapping[str, dict] = live_config_value("cover-letters", "templates", _DEFAULT_TEMPLATES)
 
 
 def get_govt_cover_letter_templates() -> dict[str, dict]:
@@ -592,7 +593,11 @@ def get_govt_cover_letter_templates() -> dict[str, dict]:
     return dict(_DEFAULT_TEMPLATES)
 
 # Ordered list of case type names for UI selectors
-CASE_TYPES: list[str] = list(TEMPLATES.keys())
+CASE_TYPES: Sequence[str] = live_value(
+    "cover-letters",
+    lambda: list(get_config_value("cover-letters", "templates", _DEFAULT_TEMPLATES)),
+    list,
+)
 
 
 # ---------------------------------------------------------------------------
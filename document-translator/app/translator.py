@@ -10,12 +10,13 @@ from __future__ import annotations
 import os
 import re
 import sys as _sys
+from collections.abc import Mapping
 from pathlib import Path as _Path
 
 import requests
 
 _sys.path.insert(0, str(_Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value
+from shared.config_store import get_config_value, live_config_value, live_value
 
 # Google Translate v2 Basic API
 _API_KEY = os.environ.get("GOOGLE_TRANSLATE_API_KEY", "")
@@ -61,10 +62,16 @@ _DEFAULT_LANGUAGES: dict[str, str] = {
 }
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-LANGUAGES: dict[str, str] = get_config_value("document-translator", "languages", _DEFAULT_LANGUAGES)
+LANGUAGES: Mapping[str, str] = live_config_value("document-translator", "languages", _DEFAULT_LANGUAGES)
 
 # Reverse lookup: display name -> code
-LANGUAGE_BY_NAME: dict[str, str] = {v: k for k, v in LANGUAGES.items()}
+LANGUAGE_BY_NAME: Mapping[str, str] = live_value(
+    "document-translator",
+    lambda: {
+        v: k
+        for k, v in get_config_value("document-translator", "languages", _DEFAULT_LANGUAGES).items()
+    },
+)
 
 # Target languages offered in the UI (subset, most useful)
 TARGET_LANGUAGES: list[str] = [
@@ -218,9 +225,20 @@ def translate_paragraphs(
     Returns a list of dicts: {original, translated, detected_lang}.
 
     on_progress(completed, total) is called after each batch if provided.
+    Raises BudgetExceededError if the Google budget is spent and the Admin
+    Panel is set to block.
     """
+    from shared.usage_tracker import GOOGLE_TRANSLATE_PRICE_PER_M_CHARS, check_budget
+
     _check_api_key()
 
+    total_chars = sum(len(p) for p in paragraphs)
+    check_budget(
+        "google_translate",
+        total_chars * GOOGLE_TRANSLATE_PRICE_PER_M_CHARS / 1_000_000,
+        tool="document-translator",
+    )
+
     target_code = LANGUAGE_BY_NAME.get(target_lang, target_lang)
 
     results: list[dict] = []
@@ -248,6 +266,21 @@ def translate_paragraphs(
         resp.raise_for_status()
         data = resp.json()
 
+        try:
+            from shared.usage_tracker import log_api_call
+
+            chars = sum(len(p) for p in batch)
+            log_api_call(
+                service="google_translate",
+                tool="document-translator",
+                operation="translate",
+                input_tokens=chars,
+                estimated_cost_usd=chars * GOOGLE_TRANSLATE_PRICE_PER_M_CHARS / 1_000_000,
+                details=f"Translate {len(batch)} paragraphs to {target_code}",
+            )
+        except Exception:
+            pass  # never let logging break translation
+
         translations = data.get("data", {}).get("translations", [])
         for j, t in enumerate(translations):
             results.append(
@@ -81,7 +81,7 @@ class ReorderRequest(BaseModel):
 @app.get("/api/categories")
 def get_categories() -> list[str]:
     """List standard immigration evidence document categories."""
-    return DOCUMENT_CATEGORIES
+    return list(DOCUMENT_CATEGORIES)
 
 
 @app.get("/api/cases")
@@ -12,6 +12,7 @@ from __future__ import annotations
 import io
 import json
 import uuid
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
@@ -19,7 +20,7 @@ from typing import Any
 
 import sys as _sys
 _sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value
+from shared.config_store import live_config_value
 
 
 # ---------------------------------------------------------------------------
@@ -53,7 +54,7 @@ class EvidenceItem:
 # Standard immigration evidence categories
 # ---------------------------------------------------------------------------
 
-_DEFAULT_DOCUMENT_CATEGORIES: list[str] = [
+_DEFAULT_DOCUMENT_CATEGORIES: Sequence[str] = [
     # Core ICPM evidence categories (Immigration Court Practice Manual Ch. 3-4)
     "Identity Documents",           # Passport, birth certificate, national ID
     "Application / Petition",       # I-589, I-130, EOIR-42B, etc.
@@ -77,7 +78,7 @@ _DEFAULT_DOCUMENT_CATEGORIES: list[str] = [
 ]
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-DOCUMENT_CATEGORIES: list[str] = get_config_value("evidence-indexer", "document_categories", _DEFAULT_DOCUMENT_CATEGORIES)
+DOCUMENT_CATEGORIES: Sequence[str] = live_config_value("evidence-indexer", "document_categories", _DEFAULT_DOCUMENT_CATEGORIES)
 
 
 # ---------------------------------------------------------------------------
@@ -14,6 +14,12 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from shared.claude_client import draft_with_claude
+from shared.claude_executor import run_batches
+
+# Token budgets per translation call (max_tokens is 8192)
+_MAX_INPUT_TOKENS = 60_000
+_MAX_OUTPUT_TOKENS = 7_000
+_OUTPUT_RATIO = 1.2  # translated text vs. source, with some headroom
 
 # US Letter dimensions in points
 _PAGE_W = 612
@@ -53,67 +59,147 @@ def extract_text_from_pdf(file_bytes: bytes) -> list[str]:
     return paragraphs
 
 
-def translate_with_claude(
-    paragraphs: list[str],
-    source_lang: str,
-    target_lang: str = "English",
-) -> list[dict]:
-    """Translate paragraphs using Claude, chunking into ~3000-word batches.
+def _plan_batches(paragraphs: list[str], system_prompt: str):
+    """Group whole paragraphs into ``shared.chunker.Chunk`` batches by estimated tokens.
 
-    Returns a list of {original, translated} dicts.
+    The translation of a batch is about as long as the batch itself, so
+    the expected output — not the input — is what limits batch size.
     """
-    results: list[dict] = []
+    from shared.chunker import estimate_tokens, pack
+
+    return pack(
+        paragraphs,
+        max_input_tokens=_MAX_INPUT_TOKENS,
+        max_output_tokens=_MAX_OUTPUT_TOKENS,
+        output_ratio=_OUTPUT_RATIO,
+        prompt_tokens=estimate_tokens(system_prompt) + 60,  # + per-batch instructions
+        tool_name="document-assembler",
+        operation="translate",
+    )
+
 
-    # Chunk paragraphs into batches of ~3000 words
-    batches: list[list[str]] = []
-    current_batch: list[str] = []
-    current_words = 0
+def _chunk_paragraphs(paragraphs: list[str], system_prompt: str = "") -> list[list[str]]:
+    return [c.items for c in _plan_batches(paragraphs, system_prompt)]
 
-    for para in paragraphs:
-        word_count = len(para.split())
-        if current_words + word_count > 3000 and current_batch:
-            batches.append(current_batch)
-            current_batch = []
-            current_words = 0
-        current_batch.append(para)
-        current_words += word_count
 
-    if current_batch:
-        batches.append(current_batch)
+def estimate_translation(
+    paragraphs: list[str], source_lang: str, target_lang: str = "English"
+) -> dict:
+    """Preview a translation: ``{"batches": int, "cost_usd": float}``."""
+    from shared.chunker import total_cost
 
     system = _SYSTEM_PROMPT.format(source_lang=source_lang, target_lang=target_lang)
+    chunks = _plan_batches(paragraphs, system)
+    return {"batches": len(chunks), "cost_usd": total_cost(chunks)}
 
-    for batch in batches:
-        # Number paragraphs for alignment
-        numbered = "\n\n".join(
-            f"[{i+1}] {para}" for i, para in enumerate(batch)
-        )
-        user_msg = (
-            f"Translate each numbered paragraph below from {source_lang} to "
-            f"{target_lang}. Output each translation prefixed with the same "
-            f"number in brackets. Do not include the original text.\n\n"
-            f"{numbered}"
-        )
 
-        response = draft_with_claude(
-            system_prompt=system,
-            user_message=user_msg,
-            max_tokens=8192,
-            tool_name="document-assembler",
-        )
+def _translation_message(batch: list[str], source_lang: str, target_lang: str) -> str:
+    # Number paragraphs for alignment
+    numbered = "\n\n".join(
+        f"[{i+1}] {para}" for i, para in enumerate(batch)
+    )
+    return (
+        f"Translate each numbered paragraph below from {source_lang} to "
+        f"{target_lang}. Output each translation prefixed with the same "
+        f"number in brackets. Do not include the original text.\n\n"
+        f"{numbered}"
+    )
 
+
+def _pair_translations(batches: list[list[str]], responses: list[str | None]) -> list[dict]:
+    """Align each batch's numbered response with its original paragraphs."""
+    results: list[dict] = []
+    for batch, response in zip(batches, responses):
         # Parse numbered translations from response
-        translated_paras = _parse_numbered_response(response, len(batch))
+        translated_paras = _parse_numbered_response(response or "", len(batch))
 
         for i, para in enumerate(batch):
             results.append({
                 "original": para,
                 "translated": translated_paras[i] if i < len(translated_paras) else para,
             })
-
     return results
 
 
+def translate_with_claude(
+    paragraphs: list[str],
+    source_lang: str,
+    target_lang: str = "English",
+) -> list[dict]:
+    """Translate paragraphs using Claude, in token-budgeted batches.
+
+    Returns a list of {original, translated} dicts.
+    """
+    system = _SYSTEM_PROMPT.format(source_lang=source_lang, target_lang=target_lang)
+    batches = _chunk_paragraphs(paragraphs, system)
+
+    def _translate_batch(batch: list[str]) -> str:
+        return draft_with_claude(
+            system_prompt=system,
+            user_message=_translation_message(batch, source_lang, target_lang),
+            max_tokens=8192,
+            tool_name="document-assembler",
+            operation="translate",
+            cache_prompt=True,
+            # A cheaper model that drops paragraph numbers gets retried on the larger one
+            validate=lambda response: _numbered_count(response) >= len(batch),
+        )
+
+    # Batches are independent, so send several at once (results stay in order)
+    responses = run_batches(_translate_batch, batches)
+    return _pair_translations(batches, responses)
+
+
+def submit_translation_batch(
+    paragraphs: list[str],
+    source_lang: str,
+    target_lang: str = "English",
+    label: str = "",
+) -> str:
+    """Queue a translation as a half-price Message Batch and return its id.
+
+    Collect it later with ``collect_translation_batch``.
+    """
+    from shared.claude_client import submit_batch
+
+    system = _SYSTEM_PROMPT.format(source_lang=source_lang, target_lang=target_lang)
+    batches = _chunk_paragraphs(paragraphs, system)
+    requests = [
+        {
+            "system_prompt": system,
+            "user_message": _translation_message(batch, source_lang, target_lang),
+            "max_tokens": 8192,
+            "cache_prompt": True,
+            "operation": "translate",
+        }
+        for batch in batches
+    ]
+    return submit_batch(
+        requests,
+        tool_name="document-assembler",
+        label=label or f"{source_lang} → {target_lang} translation",
+        context={"batches": batches, "source_lang": source_lang, "target_lang": target_lang},
+    )
+
+
+def collect_translation_batch(batch_id: str) -> list[dict]:
+    """{original, translated} dicts from a finished translation batch.
+
+    Paragraphs whose request failed come back with an empty translation.
+    Raises RuntimeError if the batch is still processing.
+    """
+    from shared.claude_client import collect_batch, load_batch
+
+    record = load_batch(batch_id) or {}
+    batches = record.get("context", {}).get("batches", [])
+    return _pair_translations(batches, collect_batch(batch_id))
+
+
+def _numbered_count(response: str) -> int:
+    """How many distinct ``[n]`` paragraph markers *response* contains."""
+    return len(set(re.findall(r"\[(\d+)\]", response)))
+
+
 def _parse_numbered_response(response: str, expected_count: int) -> list[str]:
     """Parse numbered translation response into a list of paragraphs."""
     # Try to extract [1], [2], etc.
@@ -12,13 +12,14 @@ from __future__ import annotations
 import json
 import re
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
 import sys as _sys
 _sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value
+from shared.config_store import get_config_value, live_config_value
 
 
 @dataclass
@@ -38,7 +39,7 @@ class FormField:
 # Supported forms with metadata
 # ---------------------------------------------------------------------------
 
-_DEFAULT_SUPPORTED_FORMS: dict[str, dict] = {
+_DEFAULT_SUPPORTED_FORMS: Mapping[str, dict] = {
     "I-589": {
         "title": "Application for Asylum and for Withholding of Removal",
         "agency": "USCIS / EOIR",
@@ -239,7 +240,7 @@ _DEFAULT_SUPPORTED_FORMS: dict[str, dict] = {
 }
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-SUPPORTED_FORMS: dict[str, dict] = get_config_value("forms-assistant", "supported_forms", _DEFAULT_SUPPORTED_FORMS)
+SUPPORTED_FORMS: Mapping[str, dict] = live_config_value("forms-assistant", "supported_forms", _DEFAULT_SUPPORTED_FORMS)
 
 
 # ---------------------------------------------------------------------------
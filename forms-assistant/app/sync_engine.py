@@ -23,29 +23,33 @@ from app.audit_log import log_action
 
 try:
     from shared.salesforce_client import (
-        _sf_conn,
         load_active_client,
-        update_client,
         get_client,
+        get_record,
         get_related_record,
+        get_related_records,
+        update_records,
     )
 except ImportError:
     # Graceful degradation when shared module is unavailable
-    def _sf_conn():  # type: ignore[misc]
-        return None
-
     def load_active_client() -> dict | None:  # type: ignore[misc]
         return None
 
-    def update_client(sf_id: str, updates: dict) -> None:  # type: ignore[misc]
-        pass
-
     def get_client(customer_id: str, fields: list[str] | None = None) -> dict | None:  # type: ignore[misc]
         return None
 
+    def get_record(object_name: str, record_id: str, fields: list[str]) -> dict | None:  # type: ignore[misc]
+        return None
+
     def get_related_record(contact_id: str, object_name: str, lookup_field: str = "Contact__c") -> dict | None:  # type: ignore[misc]
         return None
 
+    def get_related_records(contact_id: str, object_names: list[str], lookup_field: str = "Contact__c") -> dict:  # type: ignore[misc]
+        return {}
+
+    def update_records(object_name: str, records: list[dict], all_or_none: bool = False) -> list[dict]:  # type: ignore[misc]
+        return [{"id": r.get("Id"), "success": True, "errors": []} for r in records]
+
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "audit"
 SYNC_LOG_PATH = DATA_DIR / "sync_log.jsonl"
@@ -121,10 +125,6 @@ def _fetch_related_object_data(
     fields: list[str],
 ) -> dict | None:
     """Fetch field values from a related custom object record."""
-    sf = _sf_conn()
-    if sf is None:
-        return None
-
     related = get_related_record(contact_id, object_name)
     if not related:
         return None
@@ -133,20 +133,10 @@ def _fetch_related_object_data(
     if not record_id:
         return None
 
-    # Always include Id
-    query_fields = list(set(["Id"] + fields))
-    field_list = ", ".join(query_fields)
-    query = f"SELECT {field_list} FROM {object_name} WHERE Id = '{record_id}' LIMIT 1"
-
     try:
-        result = sf.query(query)
-        records = result.get("records", [])
-        if records:
-            return {k: v for k, v in records[0].items() if k != "attributes"}
+        return get_record(object_name, record_id, fields)
     except Exception:
-        pass
-
-    return None
+        return None
 
 
 def pull_from_sf(
@@ -212,14 +202,7 @@ def pull_from_sf(
                 if customer_id:
                     record = get_client(customer_id, fields=sf_fields_needed)
                 else:
-                    sf = _sf_conn()
-                    if sf is None:
-                        raise RuntimeError("Salesforce connection unavailable")
-                    field_list = ", ".join(sf_fields_needed)
-                    query = f"SELECT {field_list} FROM Contact WHERE Id = '{sf_record_id}' LIMIT 1"
-                    query_result = sf.query(query)
-                    records = query_result.get("records", [])
-                    record = {k: v for k, v in records[0].items() if k != "attributes"} if records else None
+                    record = get_record("Contact", sf_record_id, sf_fields_needed)
 
                 if record:
                     resolved_id = record.get("Id") or resolved_id
@@ -369,78 +352,95 @@ def push_to_sf(
     # Group by SF object
     groups = _group_mappings_by_object(approved)
 
-    # --- Push Contact fields ---
-    contact_mappings = groups.get("Contact", [])
-    if contact_mappings:
-        contact_updates: dict = {}
-        for mapping in contact_mappings:
+    # Collect values per object; all records are then saved in one
+    # sObject Collections request (plus one lookup for the related records)
+    def _non_empty_values(mappings: list) -> dict:
+        values: dict = {}
+        for mapping in mappings:
             form_val = form_data.get(mapping.field_id)
             if form_val is not None and form_val != "":
-                contact_updates[mapping.sf_field] = form_val
-
-        if contact_updates:
-            try:
-                update_client(sf_record_id, contact_updates)
-                all_updates.update(contact_updates)
-            except Exception as exc:
-                entry = SyncLogEntry(
-                    timestamp=datetime.now(timezone.utc).isoformat(),
-                    direction="form_to_sf",
-                    form_id=form_id,
-                    contact_id=sf_record_id,
-                    fields_synced={k: {"old": None, "new": v} for k, v in contact_updates.items()},
-                    status="failed",
-                    error=f"Contact push failed: {exc}",
-                )
-                _append_sync_log(entry)
+                values[mapping.sf_field] = form_val
+        return values
+
+    contact_updates = _non_empty_values(groups.get("Contact", []))
+    related_updates = {
+        obj_name: values
+        for obj_name in ["Contact_Plus__c", "Contact_Plus_1__c"]
+        if (values := _non_empty_values(groups.get(obj_name, [])))
+    }
+
+    records: list[dict] = []
+    record_keys: list[tuple[str, dict]] = []  # (object, updates) per record
+    if contact_updates:
+        records.append({"attributes": {"type": "Contact"}, "Id": sf_record_id, **contact_updates})
+        record_keys.append(("Contact", contact_updates))
+
+    if related_updates:
+        try:
+            related = get_related_records(sf_record_id, list(related_updates))
+            lookup_error = ""
+        except Exception as exc:
+            related, lookup_error = {}, str(exc)
+        for obj_name, obj_updates in related_updates.items():
+            related_id = (related.get(obj_name) or {}).get("Id", "")
+            if not related_id:
                 log_action(
                     "sync_executed",
                     form_id=form_id,
-                    details={"direction": "form_to_sf", "error": str(exc)},
+                    details={
+                        "direction": "form_to_sf",
+                        "error": f"{obj_name} push failed: "
+                                 f"{lookup_error or f'Could not find/create {obj_name} record'}",
+                    },
                 )
-                return {}
-
-    # --- Push custom object fields ---
-    for obj_name in ["Contact_Plus__c", "Contact_Plus_1__c"]:
-        obj_mappings = groups.get(obj_name, [])
-        if not obj_mappings:
-            continue
-
-        obj_updates: dict = {}
-        for mapping in obj_mappings:
-            form_val = form_data.get(mapping.field_id)
-            if form_val is not None and form_val != "":
-                obj_updates[mapping.sf_field] = form_val
-
-        if not obj_updates:
-            continue
+            else:
+                records.append({"attributes": {"type": obj_name}, "Id": related_id, **obj_updates})
+                record_keys.append((obj_name, obj_updates))
 
+    if records:
+        # All or none: if any record fails, Salesforce rolls back the whole
+        # save, so what the sync log reports always matches the org.
         try:
-            sf = _sf_conn()
-            if sf is None:
-                raise RuntimeError("Salesforce connection unavailable")
-
-            related = get_related_record(sf_record_id, obj_name)
-            if not related:
-                raise RuntimeError(f"Could not find/create {obj_name} record")
-
-            related_id = related.get("Id", "")
-            if not related_id:
-                raise RuntimeError(f"No Id for {obj_name} record")
-
-            getattr(sf, obj_name).update(related_id, obj_updates)
-            # Prefix keys for tracking
-            for k, v in obj_updates.items():
-                all_updates[f"{obj_name}.{k}"] = v
+            results = update_records("", records, all_or_none=True)
         except Exception as exc:
+            results = [{"success": False, "errors": [{"message": str(exc)}]} for _ in records]
+
+        if len(results) != len(records) or not all(r.get("success") for r in results):
+            errors = [
+                f"{obj_name}: {e.get('message', '')}"
+                for (obj_name, _), result in zip(record_keys, results)
+                for e in result.get("errors", [])
+                if e.get("statusCode") != "ALL_OR_NONE_OPERATION_ROLLED_BACK"
+            ]
+            error = "; ".join(errors) or "unknown error"
+            entry = SyncLogEntry(
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                direction="form_to_sf",
+                form_id=form_id,
+                contact_id=sf_record_id,
+                fields_synced={
+                    (k if obj_name == "Contact" else f"{obj_name}.{k}"): {"old": None, "new": v}
+                    for obj_name, obj_updates in record_keys
+                    for k, v in obj_updates.items()
+                },
+                status="failed",
+                error=f"Push failed, nothing saved: {error}",
+            )
+            _append_sync_log(entry)
             log_action(
                 "sync_executed",
                 form_id=form_id,
-                details={
-                    "direction": "form_to_sf",
-                    "error": f"{obj_name} push failed: {exc}",
-                },
+                details={"direction": "form_to_sf", "error": error},
             )
+            return {}
+
+        for obj_name, obj_updates in record_keys:
+            if obj_name == "Contact":
+                all_updates.update(obj_updates)
+            else:
+                # Prefix keys for tracking
+                for k, v in obj_updates.items():
+                    all_updates[f"{obj_name}.{k}"] = v
 
     if not all_updates:
         entry = SyncLogEntry(
@@ -1,10 +1,11 @@
 """Multi-turn Claude evaluator for Hearing Prep.
 
-Unlike shared/claude_client.py (single-turn, used by 13 tools), this module
+Unlike draft_with_claude (single-turn, used by 13 tools), this module
 maintains conversation history across turns so Claude can detect inconsistencies
 and ask increasingly probing follow-ups.
 
-Uses the same API key loading, model constant, and usage tracking pattern.
+Calls go through shared.claude_client.chat_with_claude, so they share the
+process-wide API client, budget check, and usage tracking.
 """
 
 from __future__ import annotations
@@ -16,9 +17,6 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-_ENV_PATH = Path(__file__).resolve().parent.parent.parent / ".env"
-_MODEL = "claude-sonnet-4-5-20250929"
-
 
 def evaluate_answer(
     system_prompt: str,
@@ -46,16 +44,7 @@ def evaluate_answer(
             "follow_up_question": str,
         }
     """
-    from dotenv import dotenv_values
-    import anthropic
-
-    env = dotenv_values(_ENV_PATH)
-    api_key = env.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        raise RuntimeError(
-            "ANTHROPIC_API_KEY not found in .env. "
-            "Add it to /Users/jeff/my-new-website/.env to enable AI evaluation."
-        )
+    from shared.claude_client import chat_with_claude
 
     # Build the current turn's user message
     user_message = (
@@ -68,34 +57,17 @@ def evaluate_answer(
     # Combine history with current message
     messages = list(conversation_history) + [{"role": "user", "content": user_message}]
 
-    client = anthropic.Anthropic(api_key=api_key)
-    message = client.messages.create(
-        model=_MODEL,
+    response_text = chat_with_claude(
+        system_prompt,
+        messages,
         max_tokens=2048,
-        system=system_prompt,
-        messages=messages,
+        tool_name="hearing-prep",
+        operation="evaluate",
+        # The system prompt and earlier turns repeat every turn; cache them
+        cache_prompt=True,
+        validate=lambda text: _find_evaluation_json(text) is not None,
     )
 
-    response_text = message.content[0].text
-
-    # Log usage
-    try:
-        from shared.usage_tracker import estimate_cost, log_api_call
-
-        inp = message.usage.input_tokens
-        out = message.usage.output_tokens
-        log_api_call(
-            service="anthropic",
-            tool="hearing-prep",
-            operation="evaluate",
-            model=_MODEL,
-            input_tokens=inp,
-            output_tokens=out,
-            estimated_cost_usd=estimate_cost(_MODEL, inp, out),
-        )
-    except Exception:
-        pass
-
     return _parse_evaluation(response_text)
 
 
@@ -137,11 +109,8 @@ def build_conversation_history(turns_and_evals: list[dict]) -> list[dict]:
     return messages
 
 
-def _parse_evaluation(text: str) -> dict:
-    """Extract evaluation JSON from Claude's response.
-
-    Handles markdown fences, extra text around JSON, and malformed output.
-    """
+def _find_evaluation_json(text: str) -> dict | None:
+    """Locate and parse the evaluation JSON object in *text*, or None."""
     # Try to find JSON in markdown code fences
     fence_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
     if fence_match:
@@ -151,17 +120,26 @@ def _parse_evaluation(text: str) -> dict:
     json_match = re.search(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text, re.DOTALL)
     if json_match:
         try:
-            parsed = json.loads(json_match.group())
-            return _normalize_evaluation(parsed)
+            return json.loads(json_match.group())
         except json.JSONDecodeError:
             pass
 
     # Try parsing the whole text as JSON
     try:
         parsed = json.loads(text)
-        return _normalize_evaluation(parsed)
+        return parsed if isinstance(parsed, dict) else None
     except json.JSONDecodeError:
-        pass
+        return None
+
+
+def _parse_evaluation(text: str) -> dict:
+    """Extract evaluation JSON from Claude's response.
+
+    Handles markdown fences, extra text around JSON, and malformed output.
+    """
+    parsed = _find_evaluation_json(text)
+    if parsed is not None:
+        return _normalize_evaluation(parsed)
 
     # Fallback: return the raw text as the evaluation
     return {
@@ -111,7 +111,7 @@ def get_decision(decision_id: str) -> dict[str, Any]:
 @app.get("/api/topics")
 def list_topics() -> list[str]:
     """List all legal topics available for filtering."""
-    return LEGAL_TOPICS
+    return list(LEGAL_TOPICS)
 
 
 @app.post("/api/collections")
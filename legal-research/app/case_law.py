@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import json
 import uuid
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -18,7 +19,7 @@ from typing import Any
 
 import sys as _sys
 _sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from shared.config_store import get_config_value
+from shared.config_store import get_config_value, live_config_value, live_value
 
 
 # ---------------------------------------------------------------------------
@@ -751,8 +752,9 @@ def _load_decisions() -> dict[str, CaseLaw]:
             )
     return result
 
-KEY_DECISIONS: dict[str, CaseLaw] = _load_decisions()
-LEGAL_TOPICS: list[str] = get_config_value("legal-research", "topics", _DEFAULT_LEGAL_TOPICS)
+# Rebuilt (not edited in place) after the admin panel changes the decisions
+KEY_DECISIONS: Mapping[str, CaseLaw] = live_value("legal-research", _load_decisions)
+LEGAL_TOPICS: Sequence[str] = live_config_value("legal-research", "topics", _DEFAULT_LEGAL_TOPICS)
 
 
 # ---------------------------------------------------------------------------
@@ -2,6 +2,8 @@
 
 Stores attorney info at data/config/attorneys.json. Used by the
 Forms Assistant to auto-fill attorney fields on uploaded PDF forms.
+With ``CONFIG_BACKEND=sqlite`` the list lives in the config database
+under "attorneys" instead.
 """
 
 from __future__ import annotations
@@ -10,6 +12,8 @@ import json
 import uuid
 from pathlib import Path
 
+from shared.config_store import backend_name, load_config, save_config
+
 CONFIG_DIR = Path(__file__).resolve().parent.parent / "data" / "config"
 ATTORNEYS_FILE = CONFIG_DIR / "attorneys.json"
 
@@ -20,6 +24,9 @@ def _ensure_dir() -> None:
 
 def load_attorneys() -> list[dict]:
     """Load all attorneys from JSON. Returns empty list if file missing."""
+    if backend_name() != "json":
+        data = load_config("attorneys")
+        return data if isinstance(data, list) else []
     if not ATTORNEYS_FILE.exists():
         return []
     try:
@@ -31,6 +38,9 @@ def load_attorneys() -> list[dict]:
 
 def save_attorneys(attorneys: list[dict]) -> None:
     """Save the full attorney list to JSON."""
+    if backend_name() != "json":
+        save_config("attorneys", attorneys)
+        return
     _ensure_dir()
     ATTORNEYS_FILE.write_text(json.dumps(attorneys, indent=2, ensure_ascii=False))
 
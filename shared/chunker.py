@@ -0,0 +1,122 @@
+"""Token-aware batching of paragraphs or pages for Claude calls.
+
+Fixed batch sizes (3000 words, 25 pages) go wrong in both directions:
+dense scans and CJK text overflow ``max_tokens``, sparse pages waste
+calls. ``pack`` instead estimates tokens for each paragraph or page and
+fills each batch up to an input budget *and* an expected-output budget,
+without ever splitting an item. Each batch carries its token estimates
+and estimated cost (at the model routing would pick for it), so the UI
+can show the price before anything is sent.
+
+Token counts are a local heuristic, deliberately on the high side: ~4
+characters per token for Latin script, ~2 for other alphabets (Cyrillic,
+Arabic, Devanagari, ...), 1 per character for Chinese, Japanese and Korean.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough (conservative) Claude token count for *text*."""
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    other = len(_NON_ASCII.findall(text)) - cjk
+    ascii_chars = len(text) - cjk - other
+    return math.ceil(cjk + other / 2 + ascii_chars / 4)
+
+
+@dataclass
+class Chunk:
+    """One batch of whole items (paragraphs or pages) for a single call."""
+
+    items: list[str]
+    start: int                  # index of items[0] in the original list
+    input_tokens: int           # items + prompt overhead
+    output_tokens: int          # expected response size
+    estimated_cost_usd: float = 0.0
+    oversized: bool = False     # a single item that alone exceeds a budget
+    model: str = ""             # model the cost was estimated for
+
+    @property
+    def end(self) -> int:
+        """Index one past the last item."""
+        return self.start + len(self.items)
+
+
+def pack(
+    items: list[str],
+    max_input_tokens: int,
+    max_output_tokens: int,
+    output_ratio: float = 1.0,
+    prompt_tokens: int = 0,
+    item_overhead_tokens: int = 4,
+    tool_name: str = "",
+    operation: str = "draft",
+    model: str = "",
+) -> list[Chunk]:
+    """Group consecutive *items* into chunks that fit both budgets.
+
+    *output_ratio* is expected output tokens per input token of item text
+    (≈1 for translation, much less for extraction). *prompt_tokens* is the
+    fixed system prompt/instructions sent with every chunk and
+    *item_overhead_tokens* covers per-item labels like ``[12]`` or
+    ``[Page 3]``. An item too large for the budgets on its own gets a
+    chunk to itself, flagged ``oversized``.
+
+    Costs are estimated for *model*, or by default for the model
+    ``choose_model`` routes each chunk's calls to (pass the *tool_name*
+    and *operation* the calls will be made with).
+    """
+    from shared.claude_client import choose_model
+    from shared.usage_tracker import estimate_cost
+
+    chunks: list[Chunk] = []
+    current: list[str] = []
+    start = 0
+    item_tokens = 0
+
+    def _close() -> None:
+        out = math.ceil(item_tokens * output_ratio)
+        inp = prompt_tokens + item_tokens
+        chunk_model = model or choose_model(tool_name, operation, inp)
+        chunks.append(Chunk(
+            items=current,
+            start=start,
+            input_tokens=inp,
+            output_tokens=out,
+            estimated_cost_usd=estimate_cost(chunk_model, inp, out),
+            oversized=len(current) == 1 and (
+                inp > max_input_tokens or out > max_output_tokens
+            ),
+            model=chunk_model,
+        ))
+
+    for index, item in enumerate(items):
+        tokens = estimate_tokens(item) + item_overhead_tokens
+        fits = (
+            prompt_tokens + item_tokens + tokens <= max_input_tokens
+            and (item_tokens + tokens) * output_ratio <= max_output_tokens
+        )
+        if current and not fits:
+            _close()
+            current, item_tokens = [], 0
+        if not current:
+            start = index
+        current.append(item)
+        item_tokens += tokens
+    if current:
+        _close()
+    return chunks
+
+
+def total_cost(chunks: list[Chunk]) -> float:
+    """Sum of the chunks' estimated costs (USD)."""
+    return sum(c.estimated_cost_usd for c in chunks)
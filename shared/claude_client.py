@@ -1,59 +1,648 @@
-"""Thin wrapper around the Anthropic SDK for Claude AI drafting."""
+"""Thin wrapper around the Anthropic SDK for Claude AI drafting.
+
+One ``anthropic.Anthropic`` client is shared per process (see
+``get_client``), so calls reuse its keep-alive HTTP connection pool
+instead of paying a new TLS handshake each time. The API key is re-read
+only when the shared .env file changes.
+
+``stream_with_claude`` is the streaming counterpart of
+``draft_with_claude``: it yields text as it is generated, so the UI can
+show the first words within a second or two instead of after the whole
+draft.
+
+``submit_batch`` / ``poll_batch`` / ``collect_batch`` queue work that can
+wait (overnight extraction, bulk translation) as an Anthropic Message
+Batch at half price. Batch records are kept in data/config/claude-batches/
+so results can be collected from a later session.
+
+``shared.claude_replay`` can record calls to fixtures and replay them
+offline; ``get_client`` hands out its client while a mode is active.
+
+``choose_model`` routes each call to Sonnet or Haiku according to the
+``model-routing`` config (per tool and operation, optionally by input
+size). When a cheaper model's answer fails the caller's ``validate``
+check, the call is retried once on the larger model.
+"""
 
 from __future__ import annotations
 
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from datetime import datetime
 from pathlib import Path
 
 _ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
 _MODEL = "claude-sonnet-4-5-20250929"
+_SMALL_MODEL = "claude-haiku-4-5-20251001"
+MODEL_ALIASES = {"sonnet": _MODEL, "haiku": _SMALL_MODEL}
+# Optional per-call quality tier: "fast" always uses the small model,
+# "best" always the large one; "" follows the routing config.
+TIERS = {"fast": _SMALL_MODEL, "best": _MODEL}
+_ROUTING_CONFIG = "model-routing"
+_BATCH_DIR = Path(__file__).resolve().parent.parent / "data" / "config" / "claude-batches"
 
+_client = None
+_no_retry_client = None  # same connection pool, for calls run_batches retries itself
+_client_key = ""
+_env_stamp: tuple[int, int] | None = None
+_api_key = ""
+_client_lock = threading.Lock()
 
-def draft_with_claude(
-    system_prompt: str,
-    user_message: str,
-    max_tokens: int = 4096,
-    tool_name: str = "",
-) -> str:
-    """Send a drafting request to Claude and return the text response.
 
-    Loads the API key from the shared .env file. Raises RuntimeError if
-    the key is missing. Logs token usage to the usage tracker.
+def _load_api_key() -> str:
+    """Return ANTHROPIC_API_KEY from .env, re-parsing only when the file changes."""
+    global _env_stamp, _api_key
+    try:
+        st = _ENV_PATH.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    if stamp != _env_stamp:
+        from dotenv import dotenv_values
+
+        env = dotenv_values(_ENV_PATH) if stamp else {}
+        _api_key = env.get("ANTHROPIC_API_KEY", "") or ""
+        _env_stamp = stamp
+    return _api_key
+
+
+def get_client():
+    """Return the process-wide Anthropic client, creating it on first use.
+
+    Rebuilt only if the API key in .env changes. Raises RuntimeError if
+    the key is missing. While ``claude_replay`` is recording or replaying,
+    returns its harness client instead (replay needs no key).
+    """
+    from shared import claude_replay
+
+    harness = claude_replay.current()
+    if harness is None:
+        return _live_client()
+    if harness.mode == "replay":
+        return claude_replay.client()
+    return claude_replay.client(_live_client())
+
+
+def _replaying() -> bool:
+    from shared import claude_replay
+
+    return claude_replay.is_replaying()
+
+
+def _check_budget(tool_name: str) -> None:
+    """Monthly budget check; skipped for replayed calls, which cost nothing."""
+    if _replaying():
+        return
+    from shared.usage_tracker import check_budget
+
+    check_budget("anthropic", tool=tool_name)
+
+
+def _live_client():
+    """The shared SDK client; on ``run_batches`` workers, a copy with SDK retries off.
+
+    The executor retries 429/529 itself and shrinks its concurrency when it
+    sees them. If the SDK retried first, the executor would never see them.
     """
-    from dotenv import dotenv_values
-    import anthropic
+    global _client, _client_key, _no_retry_client
+    from shared.claude_executor import owns_retries
 
-    env = dotenv_values(_ENV_PATH)
-    api_key = env.get("ANTHROPIC_API_KEY", "")
+    api_key = _load_api_key()
     if not api_key:
         raise RuntimeError(
             "ANTHROPIC_API_KEY not found in .env. "
             "Add it to /Users/jeff/my-new-website/.env to enable AI drafting."
         )
+    with _client_lock:
+        if _client is None or _client_key != api_key:
+            import anthropic
 
-    client = anthropic.Anthropic(api_key=api_key)
-    message = client.messages.create(
-        model=_MODEL,
-        max_tokens=max_tokens,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_message}],
+            _client = anthropic.Anthropic(api_key=api_key)
+            _client_key = api_key
+            _no_retry_client = None
+        if not owns_retries():
+            return _client
+        if _no_retry_client is None:
+            _no_retry_client = _client.with_options(max_retries=0)
+        return _no_retry_client
+
+
+def reset_client() -> None:
+    """Drop the cached client and key (next call re-reads .env)."""
+    global _client, _client_key, _env_stamp, _api_key, _no_retry_client
+    with _client_lock:
+        _client = None
+        _no_retry_client = None
+        _client_key = ""
+        _env_stamp = None
+        _api_key = ""
+
+
+# ── Model routing ────────────────────────────────────────────────────────
+
+
+def _route_for(tool_name: str, operation: str) -> dict:
+    """Effective routing rule: default, overridden by tool, then tool:operation."""
+    from shared.config_store import load_config
+
+    cfg = load_config(_ROUTING_CONFIG) or {}
+    routes = cfg.get("routes", {})
+    return {
+        **cfg.get("default", {}),
+        **routes.get(tool_name, {}),
+        **routes.get(f"{tool_name}:{operation}", {}),
+    }
+
+
+def choose_model(
+    tool_name: str = "",
+    operation: str = "draft",
+    input_tokens: int = 0,
+    tier: str = "",
+) -> str:
+    """Pick the model for a call.
+
+    The ``model-routing`` config looks like::
+
+        {"default": {"model": "sonnet"},
+         "routes": {"document-assembler": {"model": "auto", "small_below_tokens": 2000},
+                    "cover-letters:draft": {"model": "haiku"}}}
+
+    ``model`` is ``"sonnet"``, ``"haiku"``, a full model id, or ``"auto"``
+    (Haiku when the estimated input is under ``small_below_tokens``,
+    otherwise Sonnet). With no config every call uses Sonnet, as before.
+    """
+    if tier in TIERS:
+        return TIERS[tier]
+    try:
+        route = _route_for(tool_name, operation)
+    except Exception:
+        return _MODEL
+    model = route.get("model", "sonnet")
+    if model != "auto":
+        return MODEL_ALIASES.get(model, model)
+    if input_tokens and input_tokens < route.get("small_below_tokens", 0):
+        return _SMALL_MODEL
+    return _MODEL
+
+
+def _route(system_prompt: str, messages: list[dict], tool_name: str,
+           operation: str, tier: str) -> str:
+    from shared.chunker import estimate_tokens
+
+    size = estimate_tokens(system_prompt) + sum(
+        estimate_tokens(m["content"]) if isinstance(m["content"], str) else 0
+        for m in messages
     )
+    return choose_model(tool_name, operation, size, tier)
+
+
+def _usage_tokens(usage, field: str) -> int:
+    """Token count from an API usage object; 0 when absent (e.g. cache fields)."""
+    value = getattr(usage, field, 0)
+    return value if isinstance(value, int) else 0
 
-    # Log usage
+
+def _log_usage(message, tool_name: str, operation: str, model: str, batch: bool = False,
+               details: str = "") -> float:
+    """Log a call's token usage; returns its estimated cost (0.0 if logging failed)."""
     try:
         from shared.usage_tracker import estimate_cost, log_api_call
 
-        inp = message.usage.input_tokens
-        out = message.usage.output_tokens
+        usage = message.usage
+        inp = _usage_tokens(usage, "input_tokens")
+        out = _usage_tokens(usage, "output_tokens")
+        cache_write = _usage_tokens(usage, "cache_creation_input_tokens")
+        cache_read = _usage_tokens(usage, "cache_read_input_tokens")
+        cost = estimate_cost(model, inp, out, batch=batch,
+                             cache_write_tokens=cache_write, cache_read_tokens=cache_read)
+        if _replaying():
+            return cost  # what the call would have cost; nothing was spent
         log_api_call(
             service="anthropic",
             tool=tool_name or "unknown",
-            operation="draft",
-            model=_MODEL,
+            operation=operation,
+            model=model,
             input_tokens=inp,
             output_tokens=out,
-            estimated_cost_usd=estimate_cost(_MODEL, inp, out),
+            cache_write_tokens=cache_write,
+            cache_read_tokens=cache_read,
+            estimated_cost_usd=cost,
+            details=details,
         )
+        return cost
     except Exception:
-        pass  # never let logging break the drafting flow
+        return 0.0  # never let logging break the drafting flow
+
+
+_EPHEMERAL = {"type": "ephemeral"}
+
 
+def _system_param(system_prompt: str, cache_prompt: bool):
+    """The ``system`` argument, with a cache breakpoint after it if requested."""
+    if not cache_prompt:
+        return system_prompt
+    return [{"type": "text", "text": system_prompt, "cache_control": _EPHEMERAL}]
+
+
+def _messages_param(messages: list[dict], cache_prompt: bool) -> list[dict]:
+    """Put a cache breakpoint on the last message, so the next turn of the
+    same conversation reads everything up to here from the prompt cache."""
+    if not cache_prompt or not messages:
+        return messages
+    last = dict(messages[-1])
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = [dict(block) for block in content]
+    content[-1]["cache_control"] = _EPHEMERAL
+    last["content"] = content
+    return [*messages[:-1], last]
+
+
+def _create_message(
+    system_prompt: str,
+    messages: list[dict],
+    max_tokens: int,
+    tool_name: str,
+    operation: str,
+    cache_system: bool = False,
+    cache_messages: bool = False,
+    model: str = _MODEL,
+    details: str = "",
+):
+    """Budget-check, call the API, log usage. Returns ``(message, cost_usd)``."""
+    _check_budget(tool_name)
+    client = get_client()
+    message = client.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        system=_system_param(system_prompt, cache_system),
+        messages=_messages_param(messages, cache_messages),
+    )
+    return message, _log_usage(message, tool_name, operation, model, details=details)
+
+
+def _create_routed(
+    system_prompt: str,
+    messages: list[dict],
+    max_tokens: int,
+    tool_name: str,
+    operation: str,
+    tier: str,
+    validate: Callable[[str], bool] | None,
+    cache_system: bool = False,
+    cache_messages: bool = False,
+    model: str | None = None,
+):
+    """``_create_message`` on the routed model, falling back to the large model
+    if *validate* rejects a smaller model's answer. Returns ``(message, cost, model)``."""
+    model = model or _route(system_prompt, messages, tool_name, operation, tier)
+    message, cost = _create_message(
+        system_prompt, messages, max_tokens, tool_name, operation,
+        cache_system=cache_system, cache_messages=cache_messages, model=model,
+    )
+    if model != _MODEL and validate is not None and not validate(message.content[0].text):
+        message, retry_cost = _create_message(
+            system_prompt, messages, max_tokens, tool_name, operation,
+            cache_system=cache_system, cache_messages=cache_messages, model=_MODEL,
+            details=f"fallback from {model}",
+        )
+        return message, cost + retry_cost, _MODEL
+    return message, cost, model
+
+
+def chat_with_claude(
+    system_prompt: str,
+    messages: list[dict],
+    max_tokens: int = 4096,
+    tool_name: str = "",
+    operation: str = "draft",
+    cache_prompt: bool = False,
+    tier: str = "",
+    validate: Callable[[str], bool] | None = None,
+) -> str:
+    """Send a (possibly multi-turn) conversation to Claude and return the reply text.
+
+    *messages* uses the API's format: ``[{"role": "user", "content": ...}, ...]``.
+    Checks the monthly budget first and logs token usage afterwards.
+
+    With *cache_prompt*, the system prompt and the conversation so far are
+    marked as cacheable, so the next turn pays ~10% for that prefix.
+    The model is picked by ``choose_model``; see *validate* on
+    ``draft_with_claude``.
+    """
+    message, _, _ = _create_routed(
+        system_prompt, messages, max_tokens, tool_name, operation, tier, validate,
+        cache_system=cache_prompt, cache_messages=cache_prompt,
+    )
     return message.content[0].text
+
+
+def _cache_lookup(system_prompt: str, user_message: str, max_tokens: int,
+                  tool_name: str, use_cache: bool, model: str = _MODEL):
+    """Return ``(settings, key, cached)`` for the response cache.
+
+    *settings* and *key* are None when caching is off for *tool_name*;
+    *cached* is the cached response dict on a hit, else None.
+    """
+    from shared import claude_replay, response_cache
+    from shared.usage_tracker import record_cache_lookup
+
+    if claude_replay.current() is not None:
+        # Recording must reach the API (and write a fixture), replay the fixtures
+        return None, None, None
+    try:
+        settings = response_cache.load_settings()
+        if not settings["tools"].get(tool_name, False):
+            return None, None, None
+    except Exception:
+        return None, None, None
+    key = response_cache.cache_key(model, system_prompt, user_message, max_tokens)
+    if not use_cache:
+        return settings, key, None
+    cached = response_cache.get(key, ttl_hours=settings["ttl_hours"])
+    record_cache_lookup(tool_name, hit=cached is not None,
+                        saved_usd=cached["cost_usd"] if cached else 0.0)
+    return settings, key, cached
+
+
+def _cache_store(settings, key, text: str, message, cost: float, tool_name: str,
+                 model: str = _MODEL) -> None:
+    if settings is None:
+        return
+    from shared import response_cache
+
+    response_cache.put(
+        key,
+        text,
+        tool_name=tool_name,
+        model=model,
+        input_tokens=message.usage.input_tokens,
+        output_tokens=message.usage.output_tokens,
+        cost_usd=cost,
+        max_mb=settings["max_mb"],
+    )
+
+
+def draft_with_claude(
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int = 4096,
+    tool_name: str = "",
+    use_cache: bool = True,
+    cache_prompt: bool = False,
+    operation: str = "draft",
+    tier: str = "",
+    validate: Callable[[str], bool] | None = None,
+) -> str:
+    """Send a drafting request to Claude and return the text response.
+
+    Loads the API key from the shared .env file. Raises RuntimeError if
+    the key is missing. Logs token usage to the usage tracker. Raises
+    BudgetExceededError (a RuntimeError) if the monthly Anthropic budget
+    is spent and the Admin Panel is set to block.
+
+    If the response cache is enabled for *tool_name* (see
+    shared/response_cache.py), an identical earlier request is answered
+    from disk. Pass ``use_cache=False`` to always call the API (the fresh
+    response still refreshes the cache).
+
+    Set *cache_prompt* when the same long system prompt is sent many times
+    in a row (e.g. one per batch of pages): the API then caches it, and
+    repeat reads are billed at a tenth of the input price.
+
+    The model comes from ``choose_model`` (routing config for *tool_name*
+    and *operation*, or the *tier* override). If a smaller model was used
+    and ``validate(text)`` returns False — e.g. the JSON didn't parse —
+    the request is repeated once on the larger model.
+    """
+    messages = [{"role": "user", "content": user_message}]
+    model = _route(system_prompt, messages, tool_name, operation, tier)
+    settings, key, cached = _cache_lookup(
+        system_prompt, user_message, max_tokens, tool_name, use_cache, model
+    )
+    if cached is not None:
+        return cached["text"]
+
+    message, cost, used_model = _create_routed(
+        system_prompt, messages, max_tokens, tool_name, operation, tier, validate,
+        cache_system=cache_prompt, model=model,
+    )
+    text = message.content[0].text
+    _cache_store(settings, key, text, message, cost, tool_name, used_model)
+    return text
+
+
+def stream_with_claude(
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int = 4096,
+    tool_name: str = "",
+    use_cache: bool = True,
+    cache_prompt: bool = False,
+    operation: str = "draft",
+    tier: str = "",
+) -> Iterator[str]:
+    """Like ``draft_with_claude`` but yields text deltas as they arrive.
+
+    Token usage is logged once the stream finishes — or, if the caller
+    stops iterating early, for whatever was generated up to that point.
+    A response-cache hit is yielded as a single chunk. Only complete
+    responses are cached. The model is routed like ``draft_with_claude``,
+    but without a fallback (the text has already been shown).
+    """
+    messages = [{"role": "user", "content": user_message}]
+    model = _route(system_prompt, messages, tool_name, operation, tier)
+    settings, key, cached = _cache_lookup(
+        system_prompt, user_message, max_tokens, tool_name, use_cache, model
+    )
+    if cached is not None:
+        yield cached["text"]
+        return
+
+    _check_budget(tool_name)
+    client = get_client()
+    parts: list[str] = []
+    message = None
+    cost = 0.0
+    with client.messages.stream(
+        model=model,
+        max_tokens=max_tokens,
+        system=_system_param(system_prompt, cache_prompt),
+        messages=messages,
+    ) as stream:
+        try:
+            for text in stream.text_stream:
+                parts.append(text)
+                yield text
+            message = stream.get_final_message()
+        finally:
+            usage_source = message
+            if usage_source is None:
+                try:
+                    usage_source = stream.current_message_snapshot
+                except Exception:
+                    pass  # stopped before the first event; nothing was billed
+            if usage_source is not None:
+                cost = _log_usage(usage_source, tool_name, operation, model)
+    _cache_store(settings, key, "".join(parts), message, cost, tool_name, model)
+
+
+# ── Message Batches ──────────────────────────────────────────────────────
+
+
+def _batch_path(batch_id: str) -> Path:
+    return _BATCH_DIR / f"{batch_id}.json"
+
+
+def _save_batch_record(record: dict) -> None:
+    _BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=_BATCH_DIR, prefix=".batch.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, indent=2, ensure_ascii=False)
+        os.replace(tmp, _batch_path(record["id"]))
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_batch(batch_id: str) -> dict | None:
+    """Return the local record for *batch_id*, or None if unknown."""
+    try:
+        return json.loads(_batch_path(batch_id).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def list_batches(tool_name: str | None = None) -> list[dict]:
+    """Local batch records (newest first), optionally only *tool_name*'s."""
+    if not _BATCH_DIR.exists():
+        return []
+    records = []
+    for path in _BATCH_DIR.glob("*.json"):
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if tool_name is None or record.get("tool") == tool_name:
+            records.append(record)
+    return sorted(records, key=lambda r: r.get("created_at", ""), reverse=True)
+
+
+def forget_batch(batch_id: str) -> None:
+    """Delete the local record for *batch_id* (the batch itself is untouched)."""
+    try:
+        _batch_path(batch_id).unlink()
+    except OSError:
+        pass
+
+
+def submit_batch(
+    requests: list[dict],
+    tool_name: str = "",
+    label: str = "",
+    context: dict | None = None,
+) -> str:
+    """Submit drafting requests as one Message Batch and return its id.
+
+    Each request is a dict with ``system_prompt``, ``user_message`` and
+    optional ``max_tokens`` (default 4096), ``cache_prompt``, ``operation``
+    and ``tier`` (for model routing). *context* is stored with the local
+    record, for the caller to rebuild its results at collect time.
+    """
+    if not requests:
+        raise ValueError("submit_batch needs at least one request")
+    _check_budget(tool_name)
+    client = get_client()
+    batch = client.messages.batches.create(
+        requests=[
+            {
+                "custom_id": f"req-{i}",
+                "params": {
+                    "model": _route(
+                        req["system_prompt"],
+                        [{"role": "user", "content": req["user_message"]}],
+                        tool_name,
+                        req.get("operation", "draft"),
+                        req.get("tier", ""),
+                    ),
+                    "max_tokens": req.get("max_tokens", 4096),
+                    "system": _system_param(req["system_prompt"], req.get("cache_prompt", False)),
+                    "messages": [{"role": "user", "content": req["user_message"]}],
+                },
+            }
+            for i, req in enumerate(requests)
+        ]
+    )
+    _save_batch_record({
+        "id": batch.id,
+        "tool": tool_name,
+        "label": label,
+        "created_at": datetime.now().isoformat(),
+        "request_count": len(requests),
+        "status": batch.processing_status,
+        "context": context or {},
+        "results": None,
+    })
+    return batch.id
+
+
+def poll_batch(batch_id: str) -> dict:
+    """Refresh and return the local record with the batch's current status.
+
+    ``status`` is ``"in_progress"``, ``"canceling"`` or ``"ended"``;
+    ``counts`` has the API's per-outcome request counts.
+    """
+    record = load_batch(batch_id)
+    if record is None:
+        raise KeyError(f"Unknown batch {batch_id}")
+    if record.get("results") is not None:
+        return record  # already collected
+    batch = get_client().messages.batches.retrieve(batch_id)
+    record["status"] = batch.processing_status
+    counts = getattr(batch, "request_counts", None)
+    if counts is not None:
+        record["counts"] = {
+            k: getattr(counts, k, 0)
+            for k in ("processing", "succeeded", "errored", "canceled", "expired")
+        }
+    _save_batch_record(record)
+    return record
+
+
+def collect_batch(batch_id: str) -> list[str | None]:
+    """Return the batch's response texts in submission order.
+
+    Requests that errored or expired come back as None. Usage is logged
+    (at batch pricing) the first time a batch is collected; the texts are
+    then kept in the local record, so collecting again is free. Raises
+    RuntimeError if the batch hasn't finished yet.
+    """
+    record = poll_batch(batch_id)
+    if record.get("results") is not None:
+        return record["results"]
+    if record["status"] != "ended":
+        raise RuntimeError(f"Batch {batch_id} is still {record['status']}")
+
+    texts: list[str | None] = [None] * record["request_count"]
+    for entry in get_client().messages.batches.results(batch_id):
+        index = int(entry.custom_id.rsplit("-", 1)[1])
+        if entry.result.type != "succeeded":
+            continue
+        message = entry.result.message
+        texts[index] = message.content[0].text
+        model = getattr(message, "model", None)
+        _log_usage(message, record.get("tool", ""), "batch",
+                   model if isinstance(model, str) else _MODEL, batch=True)
+    record["results"] = texts
+    record["collected_at"] = datetime.now().isoformat()
+    _save_batch_record(record)
+    return texts
@@ -0,0 +1,159 @@
+"""Bounded-concurrency executor for batches of Claude calls.
+
+Long documents are split into batches (pages, paragraphs) that are
+independent of each other. ``run_batches`` sends them a few at a time
+instead of one after another and returns the results in input order.
+
+Concurrency adapts to the API: a 429 (rate limited) or 529 (overloaded)
+response halves the number of calls in flight, and each run of
+successes lets it creep back up to the configured ceiling. Throttled and
+transient failures (5xx, connection errors) are retried with jittered
+exponential backoff, honouring ``retry-after`` when the API sends it.
+Anything else — bad requests, BudgetExceededError — fails immediately.
+Because the executor owns retries, ``claude_client`` turns off the SDK's
+own retries for calls made from its worker threads (``owns_retries``).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 4
+_MAX_RETRIES = 4
+_BASE_DELAY = 1.0   # seconds; doubles each attempt
+_MAX_DELAY = 30.0
+
+_THROTTLE_STATUSES = {429, 529}
+_RETRY_STATUSES = {500, 502, 503, 504}
+_RETRY_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+_worker = threading.local()
+
+
+def owns_retries() -> bool:
+    """Whether this thread is running a ``run_batches`` item (retried here, not by the SDK)."""
+    return getattr(_worker, "owns_retries", False)
+
+
+class _AdaptiveLimit:
+    """AIMD limit on calls in flight: halve on throttling, +1 after a run of successes."""
+
+    def __init__(self, ceiling: int) -> None:
+        self.ceiling = max(1, ceiling)
+        self.limit = self.ceiling
+        self.active = 0
+        self._streak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, throttled: bool = False) -> None:
+        with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._streak = 0
+            else:
+                self._streak += 1
+                if self._streak >= self.limit and self.limit < self.ceiling:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+def _classify(exc: BaseException) -> str | None:
+    """'throttle', 'retry', or None (not retryable) for an API exception."""
+    status = getattr(exc, "status_code", None)
+    if status in _THROTTLE_STATUSES:
+        return "throttle"
+    if status in _RETRY_STATUSES or type(exc).__name__ in _RETRY_ERRORS:
+        return "retry"
+    return None
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, exc: BaseException) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+    delay = random.uniform(0, min(_MAX_DELAY, _BASE_DELAY * 2 ** attempt))
+    hint = _retry_after(exc)
+    return max(delay, hint) if hint is not None else delay
+
+
+def run_batches(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    max_workers: int = DEFAULT_CONCURRENCY,
+    max_retries: int = _MAX_RETRIES,
+    on_done: Callable[[int, int], None] | None = None,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """Call ``fn(item)`` for every item, up to *max_workers* at a time.
+
+    Returns results in the same order as *items*. *on_done* is called
+    with ``(completed, total)`` from the calling thread as each item
+    finishes, so it is safe to update Streamlit widgets from it.
+
+    If an item still fails after retries, its exception is raised (and
+    items not yet started are cancelled), unless *return_exceptions* is
+    set, in which case the exception object takes that item's place in
+    the result list.
+    """
+    if not items:
+        return []
+    limit = _AdaptiveLimit(max_workers)
+
+    def _call(item: T) -> R:
+        _worker.owns_retries = True
+        attempt = 0
+        while True:
+            limit.acquire()
+            try:
+                result = fn(item)
+            except Exception as exc:
+                kind = _classify(exc)
+                limit.release(throttled=kind == "throttle")
+                if kind is None or attempt >= max_retries:
+                    raise
+                delay = _backoff(attempt, exc)
+            else:
+                limit.release()
+                return result
+            time.sleep(delay)
+            attempt += 1
+
+    results: list[Any] = [None] * len(items)
+    workers = min(limit.ceiling, len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="claude-batch") as pool:
+        futures = {pool.submit(_call, item): i for i, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as exc:
+                if not return_exceptions:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                results[futures[future]] = exc
+            if on_done:
+                on_done(done, len(items))
+    return results
@@ -0,0 +1,279 @@
+"""Record/replay harness for Claude calls.
+
+Lets the LLM-backed pipelines (timeline extraction, translation, hearing
+evaluation) run offline for benchmarks and regression tests:
+
+- **record**: calls go to the real API as usual, and each request/response
+  pair is also written to a fixture directory as one JSON file.
+- **replay**: no network and no API key. Each request is answered from
+  its fixture after a simulated latency, which by default is the
+  recorded duration.
+
+A fixture is keyed by a hash of the request (model, system prompt,
+messages, max_tokens), so the same pipeline input always maps to the
+same file. Switch it on in code::
+
+    from shared import claude_replay
+    harness = claude_replay.enable("replay", "tests/fixtures/claude", latency=0.2)
+    ...
+    claude_replay.disable()
+
+or from the environment, for a whole Streamlit or script run::
+
+    CLAUDE_REPLAY=record CLAUDE_REPLAY_DIR=/tmp/fixtures streamlit run ...
+
+``shared.claude_client.get_client`` returns the harness client whenever a
+mode is active. In replay mode the budget check, usage log and response
+cache are skipped, since nothing is spent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "claude"
+MODES = ("record", "replay")
+_STREAM_CHUNK_CHARS = 40
+
+_active: "Harness | None" = None
+
+
+class FixtureMissing(LookupError):
+    """Replay mode found no recorded response for a request."""
+
+
+def _usage_dict(usage) -> dict:
+    fields = ("input_tokens", "output_tokens",
+              "cache_creation_input_tokens", "cache_read_input_tokens")
+    out = {}
+    for field in fields:
+        value = getattr(usage, field, 0)
+        out[field] = value if isinstance(value, int) else 0
+    return out
+
+
+def _as_message(response: dict) -> SimpleNamespace:
+    """Rebuild an SDK-like Message from a fixture's ``response`` dict."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=response["text"])],
+        model=response.get("model", ""),
+        stop_reason=response.get("stop_reason", "end_turn"),
+        usage=SimpleNamespace(**response.get("usage", {})),
+    )
+
+
+def request_key(request: dict) -> str:
+    """Stable fixture key for a ``messages.create`` / ``messages.stream`` call."""
+    relevant = {k: request.get(k) for k in ("model", "system", "messages", "max_tokens")}
+    blob = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class Harness:
+    """Active record/replay settings plus simple counters for benchmarks."""
+
+    def __init__(self, mode: str, fixture_dir: Path | str | None = None,
+                 latency: float | None = None) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else DEFAULT_FIXTURE_DIR
+        # None: replay each response after its recorded duration
+        self.latency = latency
+        self.calls = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.fixture_dir / f"{key}.json"
+
+    def _count(self, recorded: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            if recorded:
+                self.recorded += 1
+
+    def save(self, request: dict, message, elapsed_s: float) -> None:
+        """Write one request/response pair as a fixture (atomically)."""
+        key = request_key(request)
+        fixture = {
+            "request": {k: request.get(k) for k in ("model", "system", "messages", "max_tokens")},
+            "response": {
+                "text": message.content[0].text,
+                "model": getattr(message, "model", request.get("model", "")),
+                "stop_reason": getattr(message, "stop_reason", "end_turn"),
+                "usage": _usage_dict(message.usage),
+            },
+            "elapsed_s": round(elapsed_s, 3),
+        }
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.fixture_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self._path(key))
+        self._count(recorded=True)
+
+    def load(self, request: dict) -> dict:
+        """Return the fixture for *request*; raises FixtureMissing."""
+        key = request_key(request)
+        path = self._path(key)
+        try:
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise FixtureMissing(
+                f"No recorded Claude response {key[:12]}… in {self.fixture_dir}. "
+                "Run once with CLAUDE_REPLAY=record to capture it."
+            ) from None
+        self._count()
+        return fixture
+
+    def delay(self, fixture: dict) -> float:
+        """Simulated latency (seconds) for replaying *fixture*."""
+        if self.latency is not None:
+            return self.latency
+        return float(fixture.get("elapsed_s", 0.0))
+
+
+class _ReplayStream:
+    """Replays a fixture through the MessageStream interface, in chunks."""
+
+    def __init__(self, harness: Harness, fixture: dict) -> None:
+        self._message = _as_message(fixture["response"])
+        self._delay = harness.delay(fixture)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        text = self._message.content[0].text
+        chunks = [text[i:i + _STREAM_CHUNK_CHARS]
+                  for i in range(0, len(text), _STREAM_CHUNK_CHARS)] or [""]
+        for chunk in chunks:
+            time.sleep(self._delay / len(chunks))
+            yield chunk
+
+    def get_final_message(self):
+        return self._message
+
+    @property
+    def current_message_snapshot(self):
+        return self._message
+
+
+class _RecordingStream:
+    """Wraps a real MessageStream and saves the pair once it completes."""
+
+    def __init__(self, harness: Harness, request: dict, stream) -> None:
+        self._harness = harness
+        self._request = request
+        self._stream = stream
+        self._inner = None
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        self._inner = self._stream.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._stream.__exit__(*exc)
+
+    @property
+    def text_stream(self):
+        return self._inner.text_stream
+
+    def get_final_message(self):
+        message = self._inner.get_final_message()
+        self._harness.save(self._request, message, time.monotonic() - self._started)
+        return message
+
+    @property
+    def current_message_snapshot(self):
+        return self._inner.current_message_snapshot
+
+
+class _Messages:
+    def __init__(self, harness: Harness, real_client) -> None:
+        self._harness = harness
+        self._real = real_client
+
+    def create(self, **request):
+        if self._harness.mode == "replay":
+            fixture = self._harness.load(request)
+            time.sleep(self._harness.delay(fixture))
+            return _as_message(fixture["response"])
+        started = time.monotonic()
+        message = self._real.messages.create(**request)
+        self._harness.save(request, message, time.monotonic() - started)
+        return message
+
+    def stream(self, **request):
+        if self._harness.mode == "replay":
+            return _ReplayStream(self._harness, self._harness.load(request))
+        return _RecordingStream(self._harness, request, self._real.messages.stream(**request))
+
+    def __getattr__(self, name):
+        # e.g. messages.batches: passed through when recording, unavailable offline
+        if self._real is None:
+            raise AttributeError(f"messages.{name} is not available in replay mode")
+        return getattr(self._real.messages, name)
+
+
+class _HarnessClient:
+    """Stands in for ``anthropic.Anthropic`` while a mode is active."""
+
+    def __init__(self, harness: Harness, real_client=None) -> None:
+        self.messages = _Messages(harness, real_client)
+
+
+def enable(mode: str, fixture_dir: Path | str | None = None,
+           latency: float | None = None) -> Harness:
+    """Turn on record or replay mode for this process; returns the harness."""
+    global _active
+    _active = Harness(mode, fixture_dir, latency)
+    return _active
+
+
+def disable() -> None:
+    """Back to normal live calls."""
+    global _active
+    _active = None
+
+
+def current() -> Harness | None:
+    """The active harness, from ``enable`` or the CLAUDE_REPLAY env vars."""
+    global _active
+    if _active is None:
+        mode = os.environ.get("CLAUDE_REPLAY", "").strip().lower()
+        if mode in MODES:
+            latency = os.environ.get("CLAUDE_REPLAY_LATENCY", "")
+            _active = Harness(
+                mode,
+                os.environ.get("CLAUDE_REPLAY_DIR") or None,
+                float(latency) if latency else None,
+            )
+    return _active
+
+
+def is_replaying() -> bool:
+    harness = current()
+    return harness is not None and harness.mode == "replay"
+
+
+def client(real_client=None) -> _HarnessClient:
+    """Harness client for the active mode; *real_client* is needed to record."""
+    harness = current()
+    if harness is None:
+        raise RuntimeError("claude_replay is not enabled")
+    return _HarnessClient(harness, real_client)
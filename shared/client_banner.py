@@ -473,11 +473,9 @@ def _show_email_compose(client_record: dict, sf_available: bool):
     can_send = bool(subject.strip() and body.strip() and sender_name and sf_available)
     if st.button("Send Email", type="primary", key="_email_send", disabled=not can_send):
         try:
-            from shared.email_service import send_email
-            from shared.salesforce_client import _sf_conn
-            sf = _sf_conn()
+            from shared.salesforce_client import send_contact_email
             contact_id = client_record.get("Id", "")
-            result = send_email(sf, contact_id, client_email, subject, body, sender_name)
+            result = send_contact_email(contact_id, client_email, subject, body, sender_name)
             if result.get("success"):
                 st.success(result.get("message", "Email sent!"))
                 for key in ("_email_last_tpl", "_email_subj_val", "_email_body_val"):
@@ -506,6 +504,7 @@ def render_client_banner() -> dict | None:
     try:
         from shared.salesforce_client import (
             get_client,
+            get_client_snapshot,
             load_active_client,
             save_active_client,
         )
@@ -519,6 +518,7 @@ def render_client_banner() -> dict | None:
             except Exception: return None
         def save_active_client(r): pass
         def get_client(c): return None
+        def get_client_snapshot(c, refresh=False): return None
 
     # 1. Check query param
     qp_cid = st.query_params.get("client_id", "")
@@ -604,7 +604,10 @@ def render_client_banner() -> dict | None:
             )
             if cid_to_pull:
                 try:
-                    record = get_client(cid_to_pull)
+                    # One round trip; also primes the task list for the Files dialog.
+                    # An explicit Pull click bypasses the record cache.
+                    snapshot = get_client_snapshot(cid_to_pull, refresh=do_pull)
+                    record = snapshot["client"] if snapshot else None
                     if record:
                         save_active_client(record)
                         st.session_state.sf_client = record
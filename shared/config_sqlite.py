@@ -0,0 +1,206 @@
+"""SQLite backend for the config store — one row per config key.
+
+Used by ``shared.config_store`` when ``CONFIG_BACKEND=sqlite``. All tool
+configs live in a single WAL-mode database (data/config/config.db), so
+reading or writing one key touches one row instead of parsing and
+rewriting the whole JSON document. Writers are serialized by SQLite
+itself (``BEGIN IMMEDIATE``), readers never block.
+
+Configs whose top level is not a dict (e.g. ``staff-directory``,
+``attorneys``) are stored whole under a single row.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config_docs (
+    tool    TEXT PRIMARY KEY,
+    kind    TEXT NOT NULL,          -- 'dict' (one row per key) or 'whole'
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS config_values (
+    tool  TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    pos   INTEGER NOT NULL,         -- preserves JSON key order
+    value TEXT NOT NULL,
+    PRIMARY KEY (tool, key)
+) WITHOUT ROWID;
+"""
+
+_WHOLE_KEY = ""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class SqliteConfigBackend:
+    """Key-level config storage in a single SQLite file."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    # ── connection ───────────────────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ── reads ────────────────────────────────────────────────────────────
+
+    def version(self, tool: str) -> int | None:
+        """Current version of *tool*'s config, or None if it doesn't exist."""
+        row = self._conn().execute(
+            "SELECT version FROM config_docs WHERE tool = ?", (tool,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def load(self, tool: str) -> tuple[int | None, Any]:
+        """Return ``(version, document)`` read in one snapshot."""
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(
+                "SELECT kind, version FROM config_docs WHERE tool = ?", (tool,)
+            ).fetchone()
+            if row is None:
+                return None, None
+            kind, version = row
+            rows = conn.execute(
+                "SELECT key, value FROM config_values WHERE tool = ? ORDER BY pos",
+                (tool,),
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        if kind == "whole":
+            return version, json.loads(rows[0][1]) if rows else None
+        return version, {k: json.loads(v) for k, v in rows}
+
+    def get_value(self, tool: str, key: str, default: Any) -> Any:
+        row = self._conn().execute(
+            "SELECT d.kind, v.value FROM config_docs d "
+            "JOIN config_values v ON v.tool = d.tool "
+            "WHERE d.tool = ? AND v.key = ?",
+            (tool, key),
+        ).fetchone()
+        if row is None or row[0] != "dict":
+            return default
+        return json.loads(row[1])
+
+    def tools(self) -> list[str]:
+        return [r[0] for r in self._conn().execute("SELECT tool FROM config_docs ORDER BY tool")]
+
+    # ── writes ───────────────────────────────────────────────────────────
+
+    def _bump(self, conn: sqlite3.Connection, tool: str, kind: str) -> int:
+        row = conn.execute("SELECT version FROM config_docs WHERE tool = ?", (tool,)).fetchone()
+        version = (row[0] if row else 0) + 1
+        conn.execute(
+            "INSERT INTO config_docs (tool, kind, version) VALUES (?, ?, ?) "
+            "ON CONFLICT(tool) DO UPDATE SET kind = excluded.kind, version = excluded.version",
+            (tool, kind, version),
+        )
+        return version
+
+    def save(self, tool: str, doc: Any) -> int:
+        """Replace *tool*'s whole config. Returns the new version."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM config_values WHERE tool = ?", (tool,))
+            if isinstance(doc, dict):
+                conn.executemany(
+                    "INSERT INTO config_values (tool, key, pos, value) VALUES (?, ?, ?, ?)",
+                    [(tool, k, i, _dumps(v)) for i, (k, v) in enumerate(doc.items())],
+                )
+                version = self._bump(conn, tool, "dict")
+            else:
+                conn.execute(
+                    "INSERT INTO config_values (tool, key, pos, value) VALUES (?, ?, 0, ?)",
+                    (tool, _WHOLE_KEY, _dumps(doc)),
+                )
+                version = self._bump(conn, tool, "whole")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return version
+
+    def update(
+        self,
+        tool: str,
+        writes: dict[str, Any],
+        expected: dict[str, Any],
+        missing: object,
+    ) -> int | None:
+        """Apply key writes atomically. Returns the new version.
+
+        *writes* maps key → value, or → *missing* to delete the key.
+        *expected* maps keys the caller read → the value it saw (or
+        *missing*); if any differ now, nothing is written and None is
+        returned so the caller can report a conflict.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            kind_row = conn.execute(
+                "SELECT kind FROM config_docs WHERE tool = ?", (tool,)
+            ).fetchone()
+            if kind_row and kind_row[0] != "dict":
+                # Key updates on a non-dict config replace it, like the JSON backend
+                conn.execute("DELETE FROM config_values WHERE tool = ?", (tool,))
+            for key, seen in expected.items():
+                row = conn.execute(
+                    "SELECT value FROM config_values WHERE tool = ? AND key = ?", (tool, key)
+                ).fetchone()
+                current = json.loads(row[0]) if row else missing
+                if current != seen:
+                    conn.execute("ROLLBACK")
+                    return None
+            next_pos = conn.execute(
+                "SELECT COALESCE(MAX(pos), -1) + 1 FROM config_values WHERE tool = ?", (tool,)
+            ).fetchone()[0]
+            for key, value in writes.items():
+                if value is missing:
+                    conn.execute(
+                        "DELETE FROM config_values WHERE tool = ? AND key = ?", (tool, key)
+                    )
+                    continue
+                updated = conn.execute(
+                    "UPDATE config_values SET value = ? WHERE tool = ? AND key = ?",
+                    (_dumps(value), tool, key),
+                ).rowcount
+                if not updated:
+                    conn.execute(
+                        "INSERT INTO config_values (tool, key, pos, value) VALUES (?, ?, ?, ?)",
+                        (tool, key, next_pos, _dumps(value)),
+                    )
+                    next_pos += 1
+            version = self._bump(conn, tool, "dict")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return version
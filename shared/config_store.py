@@ -3,48 +3,586 @@
 Reads and writes per-tool JSON config files in data/config/.
 Each tool gets a single JSON file keyed by tool name (e.g., "case-checklist.json").
 Tools load config values with fallback to their hardcoded defaults.
+
+Parsed configs are cached per process and revalidated with a single
+``stat()`` per read — the file is only re-read and re-parsed when its
+mtime, size or inode changes (e.g. after a ``save_config`` in another
+app). Callers always receive their own copy, so mutating a loaded config
+never corrupts the cache.
+
+Writes go to a temp file that is renamed over the config, so readers in
+other processes never see a half-written file. Use ``transaction()`` to
+apply several key updates in one write.
+
+Set ``CONFIG_BACKEND=sqlite`` to keep configs in a single SQLite file
+(data/config/config.db) with one row per key instead — see
+``shared.config_sqlite``. Run ``import_json_configs()`` once to copy the
+existing JSON files over before switching.
+
+Every write is also announced on a small append-only change log
+(data/config/.changes.log). Long-lived module-level values can call
+``subscribe()`` (or use ``live_config_value()``/``live_value()``) to be
+refreshed only when their tool's config actually changes, in any process.
 """
 
 from __future__ import annotations
 
+import contextlib
 import json
+import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows — commits fall back to the in-process lock only
+    fcntl = None
 
 CONFIG_DIR = Path(__file__).resolve().parent.parent / "data" / "config"
 
+# Files in CONFIG_DIR owned by other modules (not tool configs); auth and
+# sessions hold the password hash and login tokens (shared.auth)
+_NOT_CONFIGS = {"api-usage", "api-budgets", "auth", "sessions"}
+
+# path (or db::tool) -> (version stamp, parsed document)
+_cache: dict[str, tuple[object, Any]] = {}
+_cache_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+_MAX_COMMIT_ATTEMPTS = 5
+_MISSING = object()
+
+
+_CHANGES_LOG = ".changes.log"
+_CHANGES_MAX_BYTES = 1_000_000  # truncated past this; watchers treat it as "everything changed"
+_WATCH_INTERVAL = 1.0  # seconds between change-log polls
+
+_subscribers: dict[str, list[Callable[[str], None]]] = {}
+_changes_lock = threading.RLock()
+_changes_pos: tuple[str, int] | None = None  # (log path, bytes consumed)
+_watcher: threading.Thread | None = None
+
+
+class ConfigConflictError(RuntimeError):
+    """A transaction read a key that another writer changed before commit."""
+
+
+def backend_name() -> str:
+    """Active storage backend: ``"json"`` (default) or ``"sqlite"``."""
+    return os.environ.get("CONFIG_BACKEND", "").strip().lower() or "json"
+
+
+_sqlite_db = None
+
+
+def _get_sqlite():
+    """Return the SQLite backend for the current CONFIG_DIR (created lazily)."""
+    from shared.config_sqlite import SqliteConfigBackend
+
+    global _sqlite_db
+    db_path = CONFIG_DIR / "config.db"
+    if _sqlite_db is None or _sqlite_db.db_path != db_path:
+        _sqlite_db = SqliteConfigBackend(db_path)
+    return _sqlite_db
+
+
+def _sqlite_backend():
+    """Return the SQLite backend if it is the active one, else None."""
+    return _get_sqlite() if backend_name() == "sqlite" else None
+
+
+def _stamp(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _clone(value: Any) -> Any:
+    """Copy a JSON value. Much cheaper than ``copy.deepcopy`` for plain JSON."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+def _read_versioned_sqlite(db, tool_name: str) -> tuple[object, Any]:
+    key = f"{db.db_path}::{tool_name}"
+    version = db.version(tool_name)
+    if version is None:
+        with _cache_lock:
+            _cache.pop(key, None)
+        return None, None
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit is not None and hit[0] == version:
+        return version, hit[1]
+    version, data = db.load(tool_name)
+    with _cache_lock:
+        _cache[key] = (version, data)
+    return version, data
+
+
+def _read_versioned(tool_name: str) -> tuple[object, Any]:
+    """Return ``(stamp, cached document)``; stamp is None if the config is missing.
+
+    The document is shared with the cache — callers must not mutate it.
+    """
+    db = _sqlite_backend()
+    if db is not None:
+        return _read_versioned_sqlite(db, tool_name)
 
-def load_config(tool_name: str) -> dict | None:
-    """Load a tool's JSON config. Returns None if file doesn't exist."""
     path = CONFIG_DIR / f"{tool_name}.json"
-    if not path.exists():
-        return None
+    key = str(path)
+    try:
+        stamp = _stamp(path.stat())
+    except OSError:
+        with _cache_lock:
+            _cache.pop(key, None)
+        return None, None
+
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        return stamp, hit[1]
+
     try:
-        return json.loads(path.read_text())
+        data = json.loads(path.read_text())
     except (json.JSONDecodeError, OSError):
-        return None
+        return stamp, None
+    with _cache_lock:
+        _cache[key] = (stamp, data)
+    return stamp, data
 
 
-def save_config(tool_name: str, config: dict) -> None:
-    """Write a tool's config to JSON. Creates dir if needed."""
+def _read_cached(tool_name: str) -> Any:
+    """Return the cached parsed config (shared, do not mutate) or None."""
+    return _read_versioned(tool_name)[1]
+
+
+@contextlib.contextmanager
+def _commit_lock(tool_name: str) -> Iterator[None]:
+    """Serialize the check-and-rename step of a write across threads/processes.
+
+    Held only for a stat and a rename, never while callers build their
+    changes, so concurrent writers don't wait on each other's work.
+    """
+    with _write_lock:
+        if fcntl is None:
+            yield
+            return
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CONFIG_DIR / f".{tool_name}.lock", "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_atomic(tool_name: str, config: Any) -> None:
+    """Write *config* via temp file + rename and refresh the cache entry.
+
+    Must be called with ``_commit_lock(tool_name)`` held.
+    """
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     path = CONFIG_DIR / f"{tool_name}.json"
-    path.write_text(json.dumps(config, indent=2, ensure_ascii=False))
+    fd, tmp = tempfile.mkstemp(dir=CONFIG_DIR, prefix=f".{tool_name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(config, indent=2, ensure_ascii=False))
+        os.chmod(tmp, 0o644)
+        # rename keeps the inode and mtime, so this stamp is the new file's
+        stamp = _stamp(os.stat(tmp))
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    with _cache_lock:
+        _cache[str(path)] = (stamp, _clone(config))
+
+
+def clear_cache() -> None:
+    """Drop all cached configs (next read goes to disk)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def load_config(tool_name: str) -> dict | None:
+    """Load a tool's JSON config. Returns None if file doesn't exist."""
+    data = _read_cached(tool_name)
+    return None if data is None else _clone(data)
+
+
+def save_config(tool_name: str, config: dict) -> None:
+    """Write a tool's config to JSON. Creates dir if needed."""
+    db = _sqlite_backend()
+    if db is not None:
+        version = db.save(tool_name, config)
+        with _cache_lock:
+            _cache[f"{db.db_path}::{tool_name}"] = (version, _clone(config))
+    else:
+        with _commit_lock(tool_name):
+            _write_atomic(tool_name, config)
+    _announce(tool_name)
 
 
 def get_config_value(tool_name: str, key: str, default: Any) -> Any:
     """Get a single key from a tool's config, with fallback to default."""
-    config = load_config(tool_name)
-    if config is None:
+    db = _sqlite_backend()
+    if db is not None:
+        return db.get_value(tool_name, key, default)
+    config = _read_cached(tool_name)
+    if not isinstance(config, dict):
         return default
-    return config.get(key, default)
+    if key not in config:
+        return default
+    return _clone(config[key])
 
 
 def set_config_value(tool_name: str, key: str, value: Any) -> None:
     """Set a single key in a tool's config, preserving other keys."""
-    config = load_config(tool_name) or {}
-    config[key] = value
-    save_config(tool_name, config)
+    with transaction(tool_name) as txn:
+        txn[key] = value
+
+
+class ConfigTransaction:
+    """Pending key updates to one tool's config, applied in a single write.
+
+    Created by ``transaction()``. Reads see the config as of the start of
+    the transaction plus this transaction's own pending changes. With the
+    SQLite backend each key is instead fetched when first read (so a
+    write-only transaction never loads the document); a key that changes
+    after being read still makes ``commit`` raise ConfigConflictError.
+    """
+
+    def __init__(self, tool_name: str) -> None:
+        self.tool_name = tool_name
+        self._db = _sqlite_backend()
+        self._base_stamp: object = None
+        self._base: dict = {}
+        if self._db is None:
+            stamp, doc = _read_versioned(tool_name)
+            self._base_stamp = stamp
+            self._base = doc if isinstance(doc, dict) else {}
+        self._writes: dict[str, Any] = {}  # key -> value, or _MISSING to delete
+        self._reads: dict[str, Any] = {}   # key -> value seen (for conflict checks)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._writes:
+            value = self._writes[key]
+            return default if value is _MISSING else _clone(value)
+        if key in self._reads:
+            value = self._reads[key]
+        elif self._db is not None:
+            value = self._db.get_value(self.tool_name, key, _MISSING)
+        else:
+            value = self._base.get(key, _MISSING)
+        self._reads[key] = value
+        return default if value is _MISSING else _clone(value)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        self._writes[key] = _clone(value)
+
+    __setitem__ = set
+
+    def update(self, values: dict) -> None:
+        for key, value in values.items():
+            self.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self._writes[key] = _MISSING
+
+    __delitem__ = delete
+
+    def commit(self) -> None:
+        """Apply pending writes with an optimistic version check.
+
+        If another writer replaced the file since the transaction began,
+        the pending writes are re-applied on top of the new version —
+        unless a key this transaction *read* has changed, in which case
+        ``ConfigConflictError`` is raised instead of losing that update.
+        """
+        if not self._writes:
+            return
+        db = self._db
+        if db is not None:
+            if db.update(self.tool_name, self._writes, self._reads, _MISSING) is None:
+                raise ConfigConflictError(
+                    f"A key read from {self.tool_name} was changed by another writer"
+                )
+            _announce(self.tool_name)
+            return
+        base_stamp, base = self._base_stamp, self._base
+        for _ in range(_MAX_COMMIT_ATTEMPTS):
+            doc = dict(base)
+            for key, value in self._writes.items():
+                if value is _MISSING:
+                    doc.pop(key, None)
+                else:
+                    doc[key] = value
+            with _commit_lock(self.tool_name):
+                stamp, current = _read_versioned(self.tool_name)
+                if stamp == base_stamp:
+                    _write_atomic(self.tool_name, doc)
+                    break
+            base_stamp = stamp
+            base = current if isinstance(current, dict) else {}
+            for key, seen in self._reads.items():
+                if base.get(key, _MISSING) != seen:
+                    raise ConfigConflictError(
+                        f"'{key}' in {self.tool_name} was changed by another writer"
+                    )
+        else:
+            raise ConfigConflictError(f"Could not commit {self.tool_name}: too much contention")
+        _announce(self.tool_name)
+
+
+@contextlib.contextmanager
+def transaction(tool_name: str) -> Iterator[ConfigTransaction]:
+    """Collect several key updates and write them once on exit.
+
+    Usage::
+
+        with transaction("global-settings") as txn:
+            txn["banner_fields"] = fields
+            txn["banner_font_size"] = size
+
+    Nothing is written if the block raises.
+    """
+    txn = ConfigTransaction(tool_name)
+    yield txn
+    txn.commit()
+
+
+# ── Change notifications ─────────────────────────────────────────────────
+
+
+def _announce(tool_name: str) -> None:
+    """Record that *tool_name* changed, for watchers in every process.
+
+    One short ``O_APPEND`` write, so concurrent announcements never
+    interleave.
+    """
+    path = CONFIG_DIR / _CHANGES_LOG
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            if os.fstat(fd).st_size > _CHANGES_MAX_BYTES:
+                os.ftruncate(fd, 0)
+            os.write(fd, f"{tool_name}\n".encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # notifications are best-effort; caches still revalidate on read
+
+
+def _invalidate(tool_name: str) -> None:
+    with _cache_lock:
+        _cache.pop(str(CONFIG_DIR / f"{tool_name}.json"), None)
+        if _sqlite_db is not None:
+            _cache.pop(f"{_sqlite_db.db_path}::{tool_name}", None)
+
+
+def poll_changes() -> set[str]:
+    """Check the change log and notify subscribers of changed tools.
+
+    Costs one ``stat()`` when nothing changed. Returns the names of the
+    tools that changed since the last poll in this process.
+    """
+    path = str(CONFIG_DIR / _CHANGES_LOG)
+    global _changes_pos
+    with _changes_lock:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = 0
+        if _changes_pos is None or _changes_pos[0] != path:
+            _changes_pos = (path, size)
+            return set()
+        offset = _changes_pos[1]
+        if size == offset:
+            return set()
+        if size < offset:
+            # Log was truncated — we can't tell what changed, so assume everything
+            changed = set(_subscribers) - {"*"}
+        else:
+            with open(path, "rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read(size - offset)
+            # Only consume complete lines; a partial one is finished next poll
+            size = offset + chunk.rfind(b"\n") + 1
+            changed = {line for line in chunk[: size - offset].decode(errors="replace").split("\n") if line}
+        _changes_pos = (path, size)
+
+        for tool_name in changed:
+            _invalidate(tool_name)
+            for callback in _subscribers.get(tool_name, []) + _subscribers.get("*", []):
+                try:
+                    callback(tool_name)
+                except Exception:
+                    pass  # one bad subscriber must not stop the others
+        return changed
+
+
+def _watch() -> None:
+    import time
+
+    while True:
+        time.sleep(_WATCH_INTERVAL)
+        try:
+            poll_changes()
+        except Exception:
+            pass
+
+
+def subscribe(tool_name: str, callback: Callable[[str], None]) -> Callable[[], None]:
+    """Call ``callback(tool_name)`` whenever *tool_name*'s config changes.
+
+    Use ``"*"`` to hear about every tool. Starts a background watcher
+    thread on first use. Returns a function that unsubscribes.
+    """
+    global _watcher
+    with _changes_lock:
+        poll_changes()  # establish the starting point before listening
+        _subscribers.setdefault(tool_name, []).append(callback)
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(target=_watch, name="config-watcher", daemon=True)
+            _watcher.start()
+
+    def _unsubscribe() -> None:
+        with _changes_lock:
+            callbacks = _subscribers.get(tool_name, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    return _unsubscribe
+
+
+_UNLOADED = object()
+
+
+class _LiveValue:
+    """Read-only view of a value derived from a tool's config.
+
+    ``load()`` runs on first read, which is also when the view subscribes
+    to the tool's changes (and so starts the watcher). A change loads a new
+    value and swaps the reference in one assignment; the old value is never
+    mutated, so a reader iterating it always sees one complete snapshot.
+    """
+
+    def __init__(self, tool_name: str, load: Callable[[], Any]) -> None:
+        self._tool_name = tool_name
+        self._load = load
+        self._value: Any = _UNLOADED
+        self._lock = threading.Lock()
+
+    def _current(self) -> Any:
+        value = self._value
+        if value is _UNLOADED:
+            with self._lock:
+                if self._value is _UNLOADED:
+                    subscribe(self._tool_name, self._reload)
+                    self._value = self._load()
+                value = self._value
+        return value
+
+    def _reload(self, _tool: str) -> None:
+        self._value = self._load()
+
+    def copy(self) -> Any:
+        """A plain, independent copy of the current value."""
+        return _clone(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    def __iter__(self) -> Iterator:
+        return iter(self._current())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._current()
+
+    def __getitem__(self, key):
+        return self._current()[key]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _LiveValue):
+            other = other._current()
+        return self._current() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._current()!r})"
+
+
+class LiveDict(_LiveValue, Mapping):
+    """Read-only, always-current dict view (see ``live_value``)."""
+
+    def keys(self):
+        return self._current().keys()
+
+    def items(self):
+        return self._current().items()
+
+    def values(self):
+        return self._current().values()
+
+    def get(self, key, default=None):
+        return self._current().get(key, default)
+
+
+class LiveList(_LiveValue, Sequence):
+    """Read-only, always-current list view (see ``live_value``)."""
+
+    def __reversed__(self) -> Iterator:
+        return reversed(self._current())
+
+    def index(self, *args) -> int:
+        return self._current().index(*args)
+
+    def count(self, item: object) -> int:
+        return self._current().count(item)
+
+    def __add__(self, other: list) -> list:
+        return self._current() + list(other)
+
+    def __radd__(self, other: list) -> list:
+        return list(other) + self._current()
+
+
+def live_value(tool_name: str, load: Callable[[], Any], kind: type = dict) -> LiveDict | LiveList:
+    """A read-only view of ``load()`` that is rebuilt when *tool_name* changes.
+
+    For module-level values derived from config: nothing is loaded and no
+    watcher starts until the first read, and names bound with
+    ``from module import NAME`` stay current. *kind* is ``dict`` or ``list``.
+    """
+    return (LiveList if kind is list else LiveDict)(tool_name, load)
+
+
+def live_config_value(tool_name: str, key: str, default: Any) -> Any:
+    """Like ``get_config_value`` but kept current for module-level constants.
+
+    Dict and list values come back as ``live_value`` views; other values
+    are returned as-is.
+    """
+    if not isinstance(default, (dict, list)):
+        return get_config_value(tool_name, key, default)
+    return live_value(tool_name, lambda: get_config_value(tool_name, key, default), type(default))
 
 
 def is_component_enabled(component_name: str, tool_name: str, default: bool = True) -> bool:
@@ -53,9 +591,35 @@ def is_component_enabled(component_name: str, tool_name: str, default: bool = Tr
     Reads ``global-settings.json`` → ``component_toggles`` → *component_name*
     → *tool_name*.  Returns *default* when no config exists.
     """
-    gs = load_config("global-settings")
+    gs = _read_cached("global-settings")
     if not gs:
         return default
     toggles = gs.get("component_toggles", {})
     component = toggles.get(component_name, {})
     return component.get(tool_name, default)
+
+
+def import_json_configs(overwrite: bool = False) -> list[str]:
+    """Copy every JSON config in CONFIG_DIR into the SQLite backend.
+
+    One-shot migration, safe to re-run: configs already in the database
+    are skipped unless *overwrite* is set. Returns the imported tool names.
+    The JSON files are left in place.
+    """
+    db = _get_sqlite()
+    existing = set(db.tools())
+    imported = []
+    for path in sorted(CONFIG_DIR.glob("*.json")):
+        tool_name = path.stem
+        if tool_name.startswith(".") or tool_name in _NOT_CONFIGS:
+            continue
+        if tool_name in existing and not overwrite:
+            continue
+        try:
+            doc = json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        db.save(tool_name, doc)
+        _announce(tool_name)
+        imported.append(tool_name)
+    return imported
@@ -301,8 +301,7 @@ def _show_draft_editor(tool_name: str, client_name: str, document_type: str):
         ):
             with st.spinner("Sending email via Salesforce..."):
                 try:
-                    from shared.email_service import send_email
-                    from shared.salesforce_client import _sf_conn
+                    from shared.salesforce_client import send_contact_email
 
                     # Load staff directory for sender name
                     staff_list = load_config("staff-directory") or []
@@ -312,9 +311,7 @@ def _show_draft_editor(tool_name: str, client_name: str, document_type: str):
                         s = staff_list[0]
                         sender_name = f"{s.get('first_name', '')} {s.get('last_name', '')}".strip() or sender_name
 
-                    sf = _sf_conn()
-                    send_email(
-                        sf_connection=sf,
+                    send_contact_email(
                         contact_id=_contact_id,
                         to_email=_email_to.strip(),
                         subject=_email_subject.strip(),
@@ -381,9 +378,9 @@ def render_draft_box(tool_name: str, context: dict) -> None:
         if not instructions.strip():
             st.warning("Enter instructions describing what you'd like drafted.")
         else:
-            with st.spinner("Drafting with Claude..."):
+            with st.container(border=True):
                 try:
-                    from shared.claude_client import draft_with_claude
+                    from shared.claude_client import stream_with_claude
 
                     global_prompt, tool_prompt = _get_prompts(tool_name)
                     system_prompt = global_prompt
@@ -409,7 +406,10 @@ def render_draft_box(tool_name: str, context: dict) -> None:
                         )
                         user_message += f"\n\n## Enclosed Documents\n\n{docs_list}"
 
-                    draft_text = draft_with_claude(system_prompt, user_message, tool_name=tool_name)
+                    # Show the draft as it is generated rather than behind a spinner
+                    draft_text = st.write_stream(
+                        stream_with_claude(system_prompt, user_message, tool_name=tool_name)
+                    )
 
                     # Save to session state
                     st.session_state[f"_draft_box_latest_{tool_name}"] = draft_text
@@ -2,6 +2,8 @@
 
 Stores preparer info at data/config/preparers.json. Used by the
 Forms Assistant to auto-fill preparer fields on uploaded PDF forms.
+With ``CONFIG_BACKEND=sqlite`` the list lives in the config database
+under "preparers" instead.
 """
 
 from __future__ import annotations
@@ -10,6 +12,8 @@ import json
 import uuid
 from pathlib import Path
 
+from shared.config_store import backend_name, load_config, save_config
+
 CONFIG_DIR = Path(__file__).resolve().parent.parent / "data" / "config"
 PREPARERS_FILE = CONFIG_DIR / "preparers.json"
 
@@ -20,6 +24,9 @@ def _ensure_dir() -> None:
 
 def load_preparers() -> list[dict]:
     """Load all preparers from JSON. Returns empty list if file missing."""
+    if backend_name() != "json":
+        data = load_config("preparers")
+        return data if isinstance(data, list) else []
     if not PREPARERS_FILE.exists():
         return []
     try:
@@ -31,6 +38,9 @@ def load_preparers() -> list[dict]:
 
 def save_preparers(preparers: list[dict]) -> None:
     """Save the full preparer list to JSON."""
+    if backend_name() != "json":
+        save_config("preparers", preparers)
+        return
     _ensure_dir()
     PREPARERS_FILE.write_text(json.dumps(preparers, indent=2, ensure_ascii=False))
 
@@ -0,0 +1,215 @@
+"""Opt-in on-disk cache of Claude drafting responses.
+
+Identical drafting requests (same model, system prompt, user message and
+max_tokens) are answered from data/config/response-cache/responses.db
+instead of making another paid API call. Entries expire after a TTL and
+the least recently used ones are evicted once the cache grows past its
+size limit.
+
+Caching is off by default. It is switched on per tool in the
+``response-cache`` config (editable in the Admin Panel)::
+
+    {"tools": {"timeline-builder": true}, "ttl_hours": 72, "max_mb": 100}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "config" / "response-cache"
+_SETTINGS_NAME = "response-cache"
+
+DEFAULT_TTL_HOURS = 72
+DEFAULT_MAX_MB = 100
+
+# Tools whose drafting goes through claude_client.draft_with_claude (the
+# only cached call), by the tool_name they pass, with their display names
+CACHING_TOOLS = {
+    "document-assembler": "Document Assembler",
+    "timeline-builder": "Timeline Builder",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    tool          TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    text          TEXT NOT NULL,
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd      REAL NOT NULL DEFAULT 0,
+    size          INTEGER NOT NULL,
+    created       REAL NOT NULL,
+    last_used     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+_local = threading.local()
+
+
+def _conn() -> sqlite3.Connection:
+    """Per-thread connection to the cache database for the current _CACHE_DIR."""
+    db_path = _CACHE_DIR / "responses.db"
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conns[db_path] = conn
+    return conn
+
+
+# ── Settings ─────────────────────────────────────────────────────────────
+
+
+def load_settings() -> dict:
+    """Return the cache settings with defaults filled in."""
+    from shared.config_store import load_config
+
+    cfg = load_config(_SETTINGS_NAME) or {}
+    return {
+        "tools": dict(cfg.get("tools", {})),
+        "ttl_hours": float(cfg.get("ttl_hours", DEFAULT_TTL_HOURS)),
+        "max_mb": float(cfg.get("max_mb", DEFAULT_MAX_MB)),
+    }
+
+
+def cacheable_tools() -> dict[str, str]:
+    """Tools that can use the cache, ``{tool_name: display name}``.
+
+    ``CACHING_TOOLS`` plus any other tool that already has cached entries.
+    """
+    tools = dict(CACHING_TOOLS)
+    try:
+        rows = _conn().execute("SELECT DISTINCT tool FROM responses").fetchall()
+    except sqlite3.Error:
+        rows = []
+    for (tool,) in rows:
+        tools.setdefault(tool, tool.replace("-", " ").title())
+    return tools
+
+
+def save_settings(settings: dict) -> None:
+    from shared.config_store import save_config
+
+    save_config(_SETTINGS_NAME, settings)
+
+
+def is_enabled(tool_name: str) -> bool:
+    """Whether responses for *tool_name* should be cached (off unless opted in)."""
+    return bool(load_settings()["tools"].get(tool_name, False))
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────
+
+
+def cache_key(model: str, system_prompt: str, user_message: str, max_tokens: int) -> str:
+    """Content hash identifying a drafting request."""
+    payload = json.dumps([model, system_prompt, user_message, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str, ttl_hours: float = DEFAULT_TTL_HOURS) -> dict | None:
+    """Return the cached response for *key*, or None if absent or expired.
+
+    A hit refreshes the entry's LRU position. The dict has ``text``,
+    ``model``, ``input_tokens``, ``output_tokens`` and ``cost_usd`` (what
+    the original call cost, i.e. what this hit saved).
+    """
+    now = time.time()
+    try:
+        conn = _conn()
+        row = conn.execute(
+            "SELECT text, model, input_tokens, output_tokens, cost_usd, created "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[5] > ttl_hours * 3600:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+    except sqlite3.Error:
+        return None
+    return {
+        "text": row[0],
+        "model": row[1],
+        "input_tokens": row[2],
+        "output_tokens": row[3],
+        "cost_usd": row[4],
+    }
+
+
+def put(
+    key: str,
+    text: str,
+    tool_name: str,
+    model: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cost_usd: float = 0.0,
+    max_mb: float = DEFAULT_MAX_MB,
+) -> None:
+    """Store a response, then evict least recently used entries over *max_mb*."""
+    now = time.time()
+    size = len(text.encode("utf-8"))
+    try:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, tool, model, text, input_tokens, output_tokens, cost_usd, size, "
+                "created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, tool_name, model, text, input_tokens, output_tokens, cost_usd,
+                 size, now, now),
+            )
+            _evict(conn, int(max_mb * 1024 * 1024))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        pass  # caching is best-effort
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int) -> None:
+    """Drop the oldest-used entries until the total size fits in *max_bytes*."""
+    conn.execute(
+        "DELETE FROM responses WHERE key IN ("
+        "  SELECT key FROM ("
+        "    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running"
+        "    FROM responses"
+        "  ) WHERE running > ?"
+        ")",
+        (max_bytes,),
+    )
+
+
+def clear() -> int:
+    """Delete every cached response. Returns how many were removed."""
+    try:
+        return _conn().execute("DELETE FROM responses").rowcount
+    except sqlite3.Error:
+        return 0
+
+
+def get_cache_info() -> dict:
+    """Return ``{"entries": int, "bytes": int}`` for the Admin Panel."""
+    try:
+        entries, size = _conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+    except sqlite3.Error:
+        return {"entries": 0, "bytes": 0}
+    return {"entries": entries, "bytes": size}
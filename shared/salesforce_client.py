@@ -11,9 +11,12 @@ Credentials are read from environment variables:
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import os
 import re
+import threading
 import time
 from pathlib import Path
 
@@ -41,20 +44,22 @@ def _save_session(sf) -> None:
 
 
 def _restore_session():
-    """Try to restore a cached SF session without full re-auth."""
+    """Try to restore a cached SF session without full re-auth.
+
+    The session isn't probed here (that would cost an API call per
+    restore); if it has expired, the first real call fails with
+    SalesforceExpiredSession and ``_run_direct`` logs in again.
+    """
     if not _SF_SESSION_PATH.exists():
         return None
     try:
         from simple_salesforce import Salesforce
 
         data = json.loads(_SF_SESSION_PATH.read_text())
-        sf = Salesforce(
+        return Salesforce(
             instance=data["sf_instance"],
             session_id=data["session_id"],
         )
-        # Validate the session is still alive with a lightweight call
-        sf.query("SELECT Id FROM Organization LIMIT 1")
-        return sf
     except Exception:
         # Session expired or invalid — remove stale cache
         try:
@@ -83,48 +88,363 @@ def _get_connection():
 _sf = None
 _sf_connected_at: float = 0
 _SF_SESSION_TTL = 3600  # re-auth after 1 hour to avoid expired session errors
+# Concurrent callers (gateway request threads, Streamlit sessions) must not
+# each restore or log in; the first one does it, the others wait for it
+_sf_lock = threading.RLock()
 
 
 def _sf_conn():
     global _sf, _sf_connected_at
-    if _sf is not None and (time.time() - _sf_connected_at) > _SF_SESSION_TTL:
-        # Proactively re-auth before session expires
+    with _sf_lock:
+        if _sf is not None and (time.time() - _sf_connected_at) > _SF_SESSION_TTL:
+            # Proactively re-auth before session expires
+            _sf = None
+            try:
+                _SF_SESSION_PATH.unlink(missing_ok=True)
+            except Exception:
+                pass
+        if _sf is None:
+            # Try restoring a cached session first
+            _sf = _restore_session()
+            if _sf is None:
+                _sf = _get_connection()
+            _instrument(_sf)
+            _sf_connected_at = time.time()
+        return _sf
+
+
+def _drop_connection():
+    """Forget this process's connection and the saved session."""
+    global _sf
+    with _sf_lock:
         _sf = None
         try:
             _SF_SESSION_PATH.unlink(missing_ok=True)
         except Exception:
             pass
-    if _sf is None:
-        # Try restoring a cached session first
-        _sf = _restore_session()
-        if _sf is None:
-            _sf = _get_connection()
-        _sf_connected_at = time.time()
-    return _sf
 
 
+# ── Gateway ──────────────────────────────────────────────────────────────
+# When the shared gateway (shared/sf_gateway.py) is running, the functions
+# below marked @_via_gateway run inside it, so every tool shares one
+# Salesforce session, one record cache and one rate limit. Without it (or
+# with SF_GATEWAY=off) they run in this process as before.
+
+GATEWAY_FUNCTIONS: dict[str, object] = {}
+
+# The gateway's request threads set .direct so their calls execute here
+_gateway_local = threading.local()
+
+
+def _run_direct(fn, args, kwargs):
+    """Call *fn* here, logging in again once if the session has expired.
+
+    A request rejected for an expired session was never executed, so the
+    retry can't apply a write twice.
+    """
+    try:
+        return fn(*args, **kwargs)
+    except Exception as e:
+        if type(e).__name__ != "SalesforceExpiredSession":
+            raise
+        print(f"[SF] session expired during {fn.__name__}; logging in again")
+        _drop_connection()
+        return fn(*args, **kwargs)
+
+
+def _via_gateway(fn):
+    @functools.wraps(fn)
+    def direct(*args, **kwargs):
+        return _run_direct(fn, args, kwargs)
+
+    GATEWAY_FUNCTIONS[fn.__name__] = direct
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not getattr(_gateway_local, "direct", False) and os.environ.get("SF_GATEWAY", "").lower() != "off":
+            from shared import sf_gateway
+
+            forwarded, result = sf_gateway.try_call(fn.__name__, args, kwargs)
+            if forwarded:
+                return result
+        return _run_direct(fn, args, kwargs)
+
+    return wrapper
+
+
+@_via_gateway
 def reset_connection():
-    """Force a fresh connection on next call (e.g. after token expiry)."""
-    global _sf
-    _sf = None
+    """Force a fresh connection on next call (e.g. after token expiry).
+
+    With the gateway running this resets the shared connection there.
+    """
+    _drop_connection()
+
+
+# ── API usage and limits ─────────────────────────────────────────────────
+# Every response on the connection's HTTP session is counted per tool and
+# operation in the usage tracker. Salesforce reports the org's rolling
+# 24-hour REST usage on each response ("Sforce-Limit-Info: api-usage=
+# 1234/15000"), so those figures are recorded too, at most every
+# _LIMIT_RECORD_INTERVAL seconds. Background jobs call
+# background_throttled() and pause once the share of the daily allowance
+# set in the "sf-api-limits" config (background_max_fraction) is used.
+
+BACKGROUND_MAX_FRACTION = 0.8  # default when the config doesn't set one
+LIMITS_MAX_AGE = 600  # seconds before recorded figures are re-read from /limits
+_LIMIT_RECORD_INTERVAL = 15
+_limit_recorded_at = 0.0
+
+
+@functools.lru_cache(maxsize=1)
+def _process_tool() -> str:
+    """Tool name of this process: SF_TOOL_NAME, else derived from the script path.
+
+    ``cover-letters/app/dashboard.py`` -> "cover-letters";
+    ``shared/sf_mirror.py`` -> "sf_mirror".
+    """
+    import sys
+
+    if os.environ.get("SF_TOOL_NAME"):
+        return os.environ["SF_TOOL_NAME"]
+    script = Path(sys.argv[0] if sys.argv and sys.argv[0] else ".").resolve()
+    if script.parent.name == "app":
+        return script.parent.parent.name
+    if script.suffix == ".py":
+        return script.stem
+    return Path.cwd().name or "unknown"
+
+
+def current_tool() -> str:
+    """The tool a Salesforce call is made for (the caller's, inside the gateway)."""
+    return getattr(_gateway_local, "tool", "") or _process_tool()
+
+
+def _operation_of(url: str) -> str:
+    """Short label for a REST URL: "query", "sobjects", "composite", "jobs"..."""
+    path = url.split("?", 1)[0]
+    match = re.search(r"/services/data/v[\d.]+/([^/]+)", path)
+    if match:
+        return match.group(1)
+    return "auth" if "/oauth2/" in path else "other"
+
+
+def _note_api_usage(header: str) -> None:
+    global _limit_recorded_at
+    match = re.search(r"api-usage=(\d+)/(\d+)", header or "")
+    if not match or time.time() - _limit_recorded_at < _LIMIT_RECORD_INTERVAL:
+        return
+    _limit_recorded_at = time.time()
+    from shared.usage_tracker import record_api_limit
+
+    record_api_limit("salesforce", int(match.group(1)), int(match.group(2)))
+
+
+def _on_sf_response(resp, *args, **kwargs) -> None:
+    """requests response hook: count the call and note the reported API usage."""
     try:
-        _SF_SESSION_PATH.unlink(missing_ok=True)
+        from shared.usage_tracker import record_salesforce_call
+
+        record_salesforce_call(current_tool(), _operation_of(resp.url))
+        _note_api_usage(resp.headers.get("Sforce-Limit-Info", ""))
+    except Exception:
+        pass  # telemetry must never break a Salesforce call
+
+
+def _instrument(sf) -> None:
+    try:
+        hooks = sf.session.hooks.setdefault("response", [])
+        if _on_sf_response not in hooks:
+            hooks.append(_on_sf_response)
     except Exception:
         pass
 
 
+@_via_gateway
+def get_api_limits(refresh: bool = False) -> dict:
+    """Daily REST API usage: ``{"used", "limit", "fraction", "checked_at"}``.
+
+    Uses the figures recorded from recent responses unless they are older
+    than LIMITS_MAX_AGE (or *refresh*), in which case /limits is asked.
+    """
+    from shared.usage_tracker import get_api_limit, record_api_limit
+
+    recorded = get_api_limit("salesforce")
+    if not refresh and recorded and time.time() - recorded["checked_at"] < LIMITS_MAX_AGE:
+        return recorded
+    daily = _sf_conn().restful("limits").get("DailyApiRequests", {})
+    limit = int(daily.get("Max") or 0)
+    used = limit - int(daily.get("Remaining") or 0)
+    record_api_limit("salesforce", used, limit)
+    return {"used": used, "limit": limit, "fraction": used / limit if limit else 0.0,
+            "checked_at": time.time()}
+
+
+def background_threshold() -> float:
+    """Share of the daily API allowance at which background jobs pause."""
+    try:
+        from shared.config_store import load_config
+
+        cfg = load_config("sf-api-limits") or {}
+        return float(cfg.get("background_max_fraction", BACKGROUND_MAX_FRACTION))
+    except Exception:
+        return BACKGROUND_MAX_FRACTION
+
+
+def background_throttled() -> bool:
+    """Whether background jobs should skip work now to spare the API allowance.
+
+    Errors reading the limits count as "not throttled", so a broken
+    /limits call never stops the jobs for good.
+    """
+    try:
+        limits = get_api_limits()
+    except Exception as e:
+        print(f"[SF] could not read API limits: {e}")
+        return False
+    threshold = background_threshold()
+    if limits["limit"] and limits["fraction"] >= threshold:
+        print(
+            f"[SF] API usage {limits['used']}/{limits['limit']} is past "
+            f"{threshold:.0%}; background job backing off"
+        )
+        return True
+    return False
+
+
+# ── Record cache ─────────────────────────────────────────────────────────
+# The banner, client-info, cover letters and forms sync all look up the
+# same contact within seconds of each other. Reads of a contact, its legal
+# cases, tasks and case beneficiaries are kept for RECORD_CACHE_TTL seconds,
+# keyed by object + lookup value. Each entry also remembers the record Ids
+# it contains, so a write through this module to any of them drops it.
+
+RECORD_CACHE_TTL = 120  # seconds
+
+# (object_name, lookup) -> (stored_at, value, record_ids)
+_record_cache: dict[tuple, tuple[float, object, frozenset]] = {}
+_record_cache_lock = threading.Lock()
+
+
+def _cache_read(object_name: str, lookup) -> tuple[bool, object]:
+    """Return ``(hit, value)``; value is a copy the caller may modify."""
+    with _record_cache_lock:
+        entry = _record_cache.get((object_name, lookup))
+        if entry is None:
+            return False, None
+        stored_at, value, _ = entry
+        if time.time() - stored_at > RECORD_CACHE_TTL:
+            del _record_cache[(object_name, lookup)]
+            return False, None
+        return True, copy.deepcopy(value)
+
+
+def _cache_write(object_name: str, lookup, value, record_ids=()) -> None:
+    ids = frozenset(i for i in record_ids if i)
+    with _record_cache_lock:
+        _record_cache[(object_name, lookup)] = (time.time(), copy.deepcopy(value), ids)
+
+
+def _ids_of(records) -> list[str]:
+    if isinstance(records, dict):
+        records = [records]
+    return [r.get("Id", "") for r in records or []]
+
+
+@_via_gateway
+def invalidate_record(record_id: str, objects: tuple[str, ...] | None = None) -> None:
+    """Drop every cached lookup containing or keyed by *record_id*.
+
+    *objects* limits this to lookups of those cache object names.
+    """
+    with _record_cache_lock:
+        for key in [
+            k for k, (_, _, ids) in _record_cache.items()
+            if (record_id in ids or k[1] == record_id)
+            and (objects is None or k[0] in objects)
+        ]:
+            del _record_cache[key]
+
+
+@_via_gateway
+def clear_record_cache() -> None:
+    """Forget all cached Salesforce reads (e.g. after a bulk change)."""
+    with _record_cache_lock:
+        _record_cache.clear()
+
+
+# ── Describe metadata ────────────────────────────────────────────────────
+# Describe results live in the shared disk cache (shared/sf_describe_cache),
+# trusted for REVALIDATE_AFTER seconds and then revalidated with
+# If-Modified-Since, so an unchanged schema costs a 304 instead of a full
+# describe — once for all tool processes, not once per process.
+
+_GLOBAL_DESCRIBE = "_sobjects"
+
+
+def _describe(object_name: str | None = None, refresh: bool = False) -> dict:
+    """Raw describe for *object_name* (None: the global sobject list)."""
+    from email.utils import formatdate
+
+    from shared import sf_describe_cache
+
+    name = object_name or _GLOBAL_DESCRIBE
+    entry = None if refresh else sf_describe_cache.load(name)
+    if entry is not None and sf_describe_cache.is_fresh(entry):
+        return entry["describe"]
+
+    sf = _sf_conn()
+    path = f"sobjects/{object_name}/describe" if object_name else "sobjects/"
+    headers = dict(getattr(sf, "headers", {}) or {})
+    if entry is not None and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    try:
+        resp = sf.session.get(f"{sf.base_url}{path}", headers=headers, timeout=60)
+        status = resp.status_code
+    except Exception as e:
+        print(f"[SF] describe {name} request failed: {e}")
+        status = None
+
+    if status == 304 and entry is not None:
+        sf_describe_cache.mark_checked(name)
+        return entry["describe"]
+    if status == 200:
+        desc = resp.json()
+        last_modified = resp.headers.get("Last-Modified") or formatdate(usegmt=True)
+    elif entry is not None and status is None:
+        # Salesforce unreachable: a stale describe beats none
+        return entry["describe"]
+    else:
+        # Let the SDK make the plain call and raise its usual errors
+        desc = getattr(sf, object_name).describe() if object_name else sf.describe()
+        last_modified = formatdate(usegmt=True)
+    sf_describe_cache.store(name, desc, last_modified)
+    return desc
+
+
+@_via_gateway
+def refresh_describe_cache() -> int:
+    """Forget all cached describe metadata (Admin Panel button).
+
+    Every process refetches on its next describe. Returns files removed.
+    """
+    from shared import sf_describe_cache
+
+    return sf_describe_cache.clear()
+
+
 # Target SF objects for the forms assistant
 FORM_SF_OBJECTS = ["Contact", "Contact_Plus__c", "Contact_Plus_1__c"]
 
 
+@_via_gateway
 def describe_object_fields(object_name: str) -> list[dict]:
     """Return all fields on any SF object.
 
     Each dict has: name, label, type, length, updateable, nillable, custom.
     Sorted alphabetically by label.
     """
-    sf = _sf_conn()
-    desc = getattr(sf, object_name).describe()
+    desc = _describe(object_name)
     fields = [
         {
             "name": f["name"],
@@ -141,10 +461,10 @@ def describe_object_fields(object_name: str) -> list[dict]:
     return fields
 
 
+@_via_gateway
 def list_sf_objects() -> list[dict]:
     """Return all queryable SF objects: [{name, label, custom}], sorted by label."""
-    sf = _sf_conn()
-    result = sf.describe()
+    result = _describe()
     return sorted(
         [{"name": o["name"], "label": o["label"], "custom": o["custom"]}
          for o in result["sobjects"] if o["queryable"]],
@@ -152,6 +472,7 @@ def list_sf_objects() -> list[dict]:
     )
 
 
+@_via_gateway
 def describe_contact_fields() -> list[dict]:
     """Return all fields on the Contact object.
 
@@ -161,6 +482,7 @@ def describe_contact_fields() -> list[dict]:
     return describe_object_fields("Contact")
 
 
+@_via_gateway
 def create_custom_field(
     object_name: str,
     field_label: str,
@@ -217,9 +539,13 @@ def create_custom_field(
         method="POST",
         data={"FullName": full_name, "Metadata": metadata},
     )
+    from shared import sf_describe_cache
+
+    sf_describe_cache.clear(object_name)  # the new field must show up everywhere
     return {"id": result.get("id", ""), "fullName": full_name, "apiName": f"{api_name}__c"}
 
 
+@_via_gateway
 def get_related_record(
     contact_id: str,
     object_name: str,
@@ -243,22 +569,33 @@ def get_related_record(
     return {"Id": result.get("id", "")}
 
 
-def get_client(customer_id: str, fields: list[str] | None = None) -> dict | None:
+@_via_gateway
+def get_client(
+    customer_id: str,
+    fields: list[str] | None = None,
+    refresh: bool = False,
+) -> dict | None:
     """Fetch a single Contact by Customer_ID__c.
 
     Args:
         customer_id: The 4-5 digit client number.
         fields: List of Salesforce API field names to return.
                 If None, returns a default set of common fields.
+        refresh: Bypass the record cache and re-query Salesforce.
 
     Returns:
         A dict of field values, or None if no match found.
     """
-    sf = _sf_conn()
-
     if fields is None:
         fields = DEFAULT_FIELDS
 
+    lookup = (customer_id, tuple(fields))
+    if not refresh:
+        hit, cached = _cache_read("Contact", lookup)
+        if hit:
+            return cached
+
+    sf = _sf_conn()
     field_list = ", ".join(fields)
     query = f"SELECT {field_list} FROM Contact WHERE Customer_ID__c = '{customer_id}' LIMIT 1"
 
@@ -269,29 +606,52 @@ def get_client(customer_id: str, fields: list[str] | None = None) -> dict | None
 
     record = records[0]
     # Strip Salesforce metadata
-    return {k: v for k, v in record.items() if k != "attributes"}
+    record = {k: v for k, v in record.items() if k != "attributes"}
+    _cache_write("Contact", lookup, record, [record.get("Id", ""), customer_id])
+    return record
+
+
+def search_clients(query: str, limit: int = 10) -> list[dict]:
+    """Typeahead search for clients by name, customer ID or A-number.
+
+    Answered from the local mirror (shared/sf_mirror, kept current by the
+    background sync job), so it costs no Salesforce call. Matches are
+    by prefix ("garc mar"), with a typo-tolerant fallback ("gracia").
+    Returns Contact dicts with ``DEFAULT_FIELDS``, best match first;
+    empty if the mirror has not synced yet.
+    """
+    from shared import sf_mirror
 
+    return sf_mirror.search(query, limit=limit)
 
-def get_lc_tasks(contact_sf_id: str) -> list[dict]:
+
+@_via_gateway
+def get_lc_tasks(contact_sf_id: str, refresh: bool = False) -> list[dict]:
     """Fetch LC_Task__c records related to a Contact.
 
     Args:
         contact_sf_id: The Salesforce record Id of the Contact.
+        refresh: Bypass the record cache and re-query Salesforce.
 
     Returns:
         List of dicts with 'Id', 'Name', and 'For__c' fields.
     """
+    if not refresh:
+        hit, cached = _cache_read("LC_Task__c", contact_sf_id)
+        if hit:
+            return cached
     sf = _sf_conn()
     query = (
         f"SELECT Id, Name, For__c FROM LC_Task__c "
         f"WHERE Contact__c = '{contact_sf_id}' ORDER BY Name"
     )
     result = sf.query(query)
-    records = result.get("records", [])
-    return [
+    records = [
         {k: v for k, v in r.items() if k != "attributes"}
-        for r in records
+        for r in result.get("records", [])
     ]
+    _cache_write("LC_Task__c", contact_sf_id, records, _ids_of(records))
+    return records
 
 
 LEGAL_CASE_FIELDS = [
@@ -338,8 +698,16 @@ def _flatten_lc_record(record: dict) -> dict:
     return flat
 
 
-def get_legal_cases(contact_sf_id: str) -> list[dict]:
-    """Fetch Legal_Case__c records related to a Contact."""
+@_via_gateway
+def get_legal_cases(contact_sf_id: str, refresh: bool = False) -> list[dict]:
+    """Fetch Legal_Case__c records related to a Contact.
+
+    Cached per contact; *refresh* bypasses the cache.
+    """
+    if not refresh:
+        hit, cached = _cache_read("Legal_Case__c", contact_sf_id)
+        if hit:
+            return cached
     sf = _sf_conn()
     all_fields = LEGAL_CASE_FIELDS + _LC_RELATIONSHIP_FIELDS
     field_list = ", ".join(all_fields)
@@ -356,10 +724,151 @@ def get_legal_cases(contact_sf_id: str) -> list[dict]:
             f"SELECT Id, Name FROM Legal_Case__c "
             f"WHERE Primary_Applicant__c = '{contact_sf_id}' ORDER BY Name"
         )
-    records = result.get("records", [])
-    return [_flatten_lc_record(r) for r in records]
+    cases = [_flatten_lc_record(r) for r in result.get("records", [])]
+    _cache_write("Legal_Case__c", contact_sf_id, cases, _ids_of(cases))
+    return cases
+
+
+# Related 1:1 objects included in a client snapshot (lookup field is Contact__c)
+_SNAPSHOT_RELATED_OBJECTS = ["Contact_Plus__c", "Contact_Plus_1__c"]
+
+
+def _snapshot_sequential(customer_id: str, refresh: bool) -> dict | None:
+    """``get_client_snapshot`` via separate queries (Composite unavailable)."""
+    record = get_client(customer_id, refresh=refresh)
+    if not record:
+        return None
+    contact_id = record.get("Id", "")
+    sf = _sf_conn()
+    related = {}
+    for obj in _SNAPSHOT_RELATED_OBJECTS:
+        try:
+            rows = sf.query(
+                f"SELECT Id FROM {obj} WHERE Contact__c = '{contact_id}' LIMIT 1"
+            ).get("records", [])
+            related[obj] = {"Id": rows[0]["Id"]} if rows else None
+        except Exception:
+            related[obj] = None
+    return {
+        "client": record,
+        "legal_cases": get_legal_cases(contact_id, refresh=refresh),
+        "tasks": get_lc_tasks(contact_id, refresh=refresh),
+        "related": related,
+    }
+
 
+@_via_gateway
+def get_client_snapshot(customer_id: str, refresh: bool = False) -> dict | None:
+    """Load a client with its legal cases, tasks and related records in one request.
 
+    Uses the Composite API, so the Contact query and every dependent query
+    (referencing the Contact Id as ``@{contact.records[0].Id}``) share a
+    single round trip. Returns None if no Contact matches, otherwise::
+
+        {"client": {...},                # as get_client
+         "legal_cases": [...],           # as get_legal_cases
+         "tasks": [...],                 # as get_lc_tasks
+         "related": {"Contact_Plus__c": {"Id": ...} | None,
+                     "Contact_Plus_1__c": {"Id": ...} | None}}
+
+    The parts are also stored in the record cache, so follow-up
+    ``get_legal_cases``/``get_lc_tasks`` calls cost nothing. Related
+    records are not created here (see ``get_related_record``).
+    """
+    from urllib.parse import quote
+
+    if not refresh:
+        hit, cached = _cache_read("Snapshot", customer_id)
+        if hit:
+            return cached
+
+    sf = _sf_conn()
+    contact_ref = "@{contact.records[0].Id}"
+    queries = {
+        "contact": (
+            f"SELECT {', '.join(DEFAULT_FIELDS)} FROM Contact "
+            f"WHERE Customer_ID__c = '{customer_id}' LIMIT 1"
+        ),
+        "cases": (
+            f"SELECT {', '.join(LEGAL_CASE_FIELDS + _LC_RELATIONSHIP_FIELDS)} "
+            f"FROM Legal_Case__c WHERE Primary_Applicant__c = '{contact_ref}' "
+            f"ORDER BY CreatedDate DESC"
+        ),
+        "tasks": (
+            f"SELECT Id, Name, For__c FROM LC_Task__c "
+            f"WHERE Contact__c = '{contact_ref}' ORDER BY Name"
+        ),
+    }
+    for obj in _SNAPSHOT_RELATED_OBJECTS:
+        queries[obj] = f"SELECT Id FROM {obj} WHERE Contact__c = '{contact_ref}' LIMIT 1"
+
+    version = getattr(sf, "sf_version", "59.0")
+    payload = {
+        "allOrNone": False,
+        "compositeRequest": [
+            {
+                "method": "GET",
+                "url": f"/services/data/v{version}/query?q={quote(soql, safe='@{}[].')}",
+                "referenceId": ref,
+            }
+            for ref, soql in queries.items()
+        ],
+    }
+    try:
+        response = sf.restful("composite", method="POST", json=payload)
+    except Exception as e:
+        print(f"[SF] composite snapshot failed, loading sequentially: {e}")
+        return _snapshot_sequential(customer_id, refresh)
+
+    parts = {
+        r.get("referenceId"): r
+        for r in response.get("compositeResponse", [])
+    }
+
+    def _records(ref: str) -> list[dict] | None:
+        part = parts.get(ref) or {}
+        if part.get("httpStatusCode", 500) >= 400:
+            return None
+        return [
+            {k: v for k, v in rec.items() if k != "attributes"}
+            for rec in (part.get("body") or {}).get("records", [])
+        ]
+
+    contacts = _records("contact")
+    if contacts is None:
+        return _snapshot_sequential(customer_id, refresh)
+    if not contacts:
+        return None
+    record = contacts[0]
+    contact_id = record.get("Id", "")
+
+    cases = _records("cases")
+    if cases is None:
+        # Field list doesn't match this org; get_legal_cases has the fallback
+        cases = get_legal_cases(contact_id, refresh=True)
+    else:
+        cases = [_flatten_lc_record(c) for c in cases]
+    tasks = _records("tasks")
+    if tasks is None:
+        tasks = get_lc_tasks(contact_id, refresh=True)
+    related = {}
+    for obj in _SNAPSHOT_RELATED_OBJECTS:
+        rows = _records(obj)
+        related[obj] = {"Id": rows[0]["Id"]} if rows else None
+
+    _cache_write("Contact", (customer_id, tuple(DEFAULT_FIELDS)), record,
+                 [contact_id, customer_id])
+    _cache_write("Legal_Case__c", contact_id, cases, _ids_of(cases))
+    _cache_write("LC_Task__c", contact_id, tasks, _ids_of(tasks))
+    snapshot = {"client": record, "legal_cases": cases, "tasks": tasks, "related": related}
+    _cache_write(
+        "Snapshot", customer_id, snapshot,
+        [contact_id, customer_id, *_ids_of(cases), *_ids_of(tasks)],
+    )
+    return snapshot
+
+
+@_via_gateway
 def get_beneficiaries(legal_case_sf_id: str) -> list[dict]:
     """Fetch LC_Contact__c records for a Legal Case (beneficiaries/derivatives)."""
     sf = _sf_conn()
@@ -381,14 +890,14 @@ def get_beneficiaries(legal_case_sf_id: str) -> list[dict]:
     return out
 
 
+@_via_gateway
 def describe_case_contact_relationships() -> list[dict]:
     """Describe Case_Contact__c to find its lookup fields to Legal_Case__c.
 
     Returns list of field dicts that reference Legal_Case__c.
     Useful for debugging child relationship configuration.
     """
-    sf = _sf_conn()
-    desc = sf.Case_Contact__c.describe()
+    desc = _describe("Case_Contact__c")
     refs = []
     for f in desc.get("fields", []):
         for ref in (f.get("referenceTo") or []):
@@ -402,12 +911,18 @@ def describe_case_contact_relationships() -> list[dict]:
     return refs
 
 
-def get_case_beneficiaries(legal_case_sf_id: str) -> list[dict]:
+@_via_gateway
+def get_case_beneficiaries(legal_case_sf_id: str, refresh: bool = False) -> list[dict]:
     """Fetch Case_Contact__c records (derivatives/beneficiaries) for a Legal Case.
 
     Returns list of flattened dicts with Id, Contact_Name, Role__c,
-    Alien_Number_Dashed__c, DOB__c.
+    Alien_Number_Dashed__c, DOB__c. Cached per case; *refresh* bypasses
+    the cache.
     """
+    if not refresh:
+        hit, cached = _cache_read("Case_Contact__c", legal_case_sf_id)
+        if hit:
+            return cached
     sf = _sf_conn()
     fields = (
         "Id, Contact__r.Name, Role__c, "
@@ -431,26 +946,25 @@ def get_case_beneficiaries(legal_case_sf_id: str) -> list[dict]:
             "DOB__c": r.get("DOB__c", ""),
         })
     print(f"[SF] get_case_beneficiaries result: {len(records)} records")
+    _cache_write("Case_Contact__c", legal_case_sf_id, records, _ids_of(records))
     return records
 
 
+@_via_gateway
 def update_case_beneficiary(record_id: str, updates: dict) -> None:
     """Push field updates to a Case_Contact__c record."""
     sf = _sf_conn()
     sf.Case_Contact__c.update(record_id, updates)
+    invalidate_record(record_id)
 
 
+@_via_gateway
 def get_legal_case_field_metadata() -> dict:
     """Return metadata for Legal_Case__c fields including picklist values.
 
     Returns a dict keyed by API name with type, label, updateable, picklistValues.
     """
-    global _lc_field_meta_cache
-    if _lc_field_meta_cache is not None:
-        return _lc_field_meta_cache
-
-    sf = _sf_conn()
-    desc = sf.Legal_Case__c.describe()
+    desc = _describe("Legal_Case__c")
     meta = {}
     for f in desc["fields"]:
         meta[f["name"]] = {
@@ -464,19 +978,19 @@ def get_legal_case_field_metadata() -> dict:
                 if pv.get("active", True)
             ],
         }
-    _lc_field_meta_cache = meta
     return meta
 
 
-_lc_field_meta_cache = None
-
-
+@_via_gateway
 def update_legal_case(case_sf_id: str, updates: dict) -> int:
     """Push field updates to a Legal_Case__c record. Returns HTTP status code."""
     sf = _sf_conn()
-    return sf.Legal_Case__c.update(case_sf_id, updates)
+    status = sf.Legal_Case__c.update(case_sf_id, updates)
+    invalidate_record(case_sf_id)
+    return status
 
 
+@_via_gateway
 def create_lc_task(contact_sf_id: str, description: str) -> str:
     """Create a new LC_Task__c record linked to a Contact.
 
@@ -492,21 +1006,27 @@ def create_lc_task(contact_sf_id: str, description: str) -> str:
         "Contact__c": contact_sf_id,
         "For__c": description,
     })
+    invalidate_record(contact_sf_id, objects=("LC_Task__c", "Snapshot"))
     return result["id"]
 
 
+@_via_gateway
 def update_lc_task(task_sf_id: str, description: str) -> None:
     """Update the For__c field on an existing LC_Task__c record."""
     sf = _sf_conn()
     sf.LC_Task__c.update(task_sf_id, {"For__c": description})
+    invalidate_record(task_sf_id)
 
 
+@_via_gateway
 def delete_lc_task(task_sf_id: str) -> None:
     """Delete an LC_Task__c record from Salesforce."""
     sf = _sf_conn()
     sf.LC_Task__c.delete(task_sf_id)
+    invalidate_record(task_sf_id)
 
 
+@_via_gateway
 def update_client(sf_id: str, updates: dict) -> None:
     """Push field updates back to Salesforce for a Contact.
 
@@ -516,8 +1036,10 @@ def update_client(sf_id: str, updates: dict) -> None:
     """
     sf = _sf_conn()
     sf.Contact.update(sf_id, updates)
+    invalidate_record(sf_id)
 
 
+@_via_gateway
 def create_google_doc_record(
     name: str,
     google_doc_link: str,
@@ -549,6 +1071,7 @@ def create_google_doc_record(
     return {"id": record_id, "url": record_url}
 
 
+@_via_gateway
 def upload_file_to_contact(
     contact_sf_id: str,
     file_bytes: bytes,
@@ -580,6 +1103,33 @@ def upload_file_to_contact(
     return result["id"]
 
 
+@_via_gateway
+def get_record(object_name: str, record_id: str, fields: list[str]) -> dict | None:
+    """Fetch *fields* (plus Id) of one record by Id, or None if it doesn't exist."""
+    field_list = ", ".join(dict.fromkeys(["Id", *fields]))
+    records = _sf_conn().query(
+        f"SELECT {field_list} FROM {object_name} WHERE Id = '{record_id}' LIMIT 1"
+    ).get("records", [])
+    if not records:
+        return None
+    return {k: v for k, v in records[0].items() if k != "attributes"}
+
+
+@_via_gateway
+def send_contact_email(
+    contact_id: str,
+    to_email: str,
+    subject: str,
+    body: str,
+    sender_name: str,
+) -> dict:
+    """Send an email logged on a Contact; see ``email_service.send_email``."""
+    from shared.email_service import send_email
+
+    return send_email(_sf_conn(), contact_id, to_email, subject, body, sender_name)
+
+
+@_via_gateway
 def get_sf_users() -> list[dict]:
     """Fetch active Salesforce users (standard + custom bar number)."""
     sf = _sf_conn()
@@ -601,20 +1151,14 @@ def get_sf_users() -> list[dict]:
     return [{k: v for k, v in r.items() if k != "attributes"} for r in records]
 
 
+@_via_gateway
 def get_field_metadata(field_names: list[str] | None = None) -> dict:
     """Return metadata for Contact fields including picklist values.
 
     Returns a dict keyed by API name: {type, label, picklistValues, updateable}.
-    Cached after first call.
+    Backed by the shared describe cache.
     """
-    global _field_meta_cache
-    if _field_meta_cache is not None:
-        if field_names:
-            return {k: v for k, v in _field_meta_cache.items() if k in field_names}
-        return _field_meta_cache
-
-    sf = _sf_conn()
-    desc = sf.Contact.describe()
+    desc = _describe("Contact")
     meta = {}
     for f in desc["fields"]:
         meta[f["name"]] = {
@@ -627,13 +1171,408 @@ def get_field_metadata(field_names: list[str] | None = None) -> dict:
                 if pv.get("active", True)
             ],
         }
-    _field_meta_cache = meta
     if field_names:
         return {k: v for k, v in meta.items() if k in field_names}
     return meta
 
 
-_field_meta_cache = None
+# ── Collection writes ────────────────────────────────────────────────────
+# sObject Collections create/update/delete up to 200 records per request.
+# Records may mix object types: each one's "attributes" type wins over the
+# object_name argument. Results come back per record, in input order, as
+# {"id": str | None, "success": bool, "errors": [{"statusCode", "message",
+# "fields"}]} so callers can report exactly which rows failed.
+
+COLLECTION_BATCH_SIZE = 200
+
+
+def _collection_records(object_name: str, records: list[dict]) -> list[dict]:
+    out = []
+    for record in records:
+        attributes = record.get("attributes") or {"type": object_name}
+        if not attributes.get("type"):
+            raise ValueError("record without an object type (pass object_name)")
+        out.append({**record, "attributes": attributes})
+    return out
+
+
+def _collection_call(method: str, chunk: list, all_or_none: bool, **kwargs) -> list[dict]:
+    """One sObject Collections request; a failed request fails each record."""
+    sf = _sf_conn()
+    try:
+        results = sf.restful("composite/sobjects", method=method, **kwargs)
+    except Exception as e:
+        if all_or_none:
+            raise
+        print(f"[SF] collection {method} of {len(chunk)} records failed: {e}")
+        error = {"statusCode": "REQUEST_FAILED", "message": str(e), "fields": []}
+        return [{"id": None, "success": False, "errors": [error]} for _ in chunk]
+    return [
+        {"id": r.get("id"), "success": bool(r.get("success")), "errors": r.get("errors") or []}
+        for r in results or []
+    ]
+
+
+def _collection_write(method: str, object_name: str, records: list[dict],
+                      all_or_none: bool) -> list[dict]:
+    records = _collection_records(object_name, records)
+    results = []
+    for start in range(0, len(records), COLLECTION_BATCH_SIZE):
+        chunk = records[start:start + COLLECTION_BATCH_SIZE]
+        results.extend(_collection_call(
+            method, chunk, all_or_none,
+            json={"allOrNone": all_or_none, "records": chunk},
+        ))
+    return results
+
+
+@_via_gateway
+def create_records(object_name: str, records: list[dict],
+                   all_or_none: bool = False) -> list[dict]:
+    """Create records, 200 per request. Returns per-record results (see above)."""
+    results = _collection_write("POST", object_name, records, all_or_none)
+    for record in records:
+        # New children change their parent's cached lookups
+        for field in ("Contact__c", "Primary_Applicant__c", "Legal_Case__c"):
+            if record.get(field):
+                invalidate_record(record[field])
+    return results
+
+
+@_via_gateway
+def update_records(object_name: str, records: list[dict],
+                   all_or_none: bool = False) -> list[dict]:
+    """Update records (each with an "Id"), 200 per request.
+
+    Returns per-record results (see above). Cached reads containing any
+    of the records are dropped.
+    """
+    if any(not r.get("Id") for r in records):
+        raise ValueError("update_records: every record needs an Id")
+    results = _collection_write("PATCH", object_name, records, all_or_none)
+    for record in records:
+        invalidate_record(record["Id"])
+    return results
+
+
+@_via_gateway
+def delete_records(record_ids: list[str], all_or_none: bool = False) -> list[dict]:
+    """Delete records by Id, 200 per request. Returns per-record results (see above)."""
+    results = []
+    for start in range(0, len(record_ids), COLLECTION_BATCH_SIZE):
+        chunk = list(record_ids[start:start + COLLECTION_BATCH_SIZE])
+        results.extend(_collection_call(
+            "DELETE", chunk, all_or_none,
+            params={"ids": ",".join(chunk), "allOrNone": str(all_or_none).lower()},
+        ))
+    for record_id in record_ids:
+        invalidate_record(record_id)
+    return results
+
+
+@_via_gateway
+def get_related_records(
+    contact_id: str,
+    object_names: list[str],
+    lookup_field: str = "Contact__c",
+) -> dict[str, dict | None]:
+    """``get_related_record`` for several objects in one or two requests.
+
+    Looks up all of them in a single Composite request and creates the
+    missing ones in a single collection call. Returns ``{object_name:
+    {"Id": ...} | None}`` (None if it could not be found or created).
+    """
+    from urllib.parse import quote
+
+    sf = _sf_conn()
+    version = getattr(sf, "sf_version", "59.0")
+    payload = {
+        "allOrNone": False,
+        "compositeRequest": [
+            {
+                "method": "GET",
+                "url": f"/services/data/v{version}/query?q=" + quote(
+                    f"SELECT Id FROM {obj} WHERE {lookup_field} = '{contact_id}' LIMIT 1"
+                ),
+                "referenceId": obj,
+            }
+            for obj in object_names
+        ],
+    }
+    try:
+        response = sf.restful("composite", method="POST", json=payload)
+    except Exception as e:
+        print(f"[SF] composite related lookup failed, querying one by one: {e}")
+        return {obj: get_related_record(contact_id, obj, lookup_field) for obj in object_names}
+
+    related: dict[str, dict | None] = {}
+    missing = []
+    for part in response.get("compositeResponse", []):
+        obj = part.get("referenceId")
+        if part.get("httpStatusCode", 500) >= 400:
+            related[obj] = None
+            continue
+        rows = (part.get("body") or {}).get("records", [])
+        if rows:
+            related[obj] = {"Id": rows[0]["Id"]}
+        else:
+            missing.append(obj)
+    if missing:
+        created = create_records("", [
+            {"attributes": {"type": obj}, lookup_field: contact_id} for obj in missing
+        ])
+        for obj, result in zip(missing, created):
+            related[obj] = {"Id": result["id"]} if result["success"] else None
+    return {obj: related.get(obj) for obj in object_names}
+
+
+# ── Bulk API 2.0 ─────────────────────────────────────────────────────────
+# For firm-wide extracts and backfills. A query job runs asynchronously in
+# Salesforce and its CSV result is streamed back page by page, and an
+# ingest job takes one CSV upload for up to ~100 MB of rows. Either way a
+# job costs a handful of API calls instead of one per 2000 records or one
+# per 200 rows, and nothing needs to fit in memory.
+#
+# These run in the calling process (not through the gateway) because they
+# stream: rows are consumed and produced as generators.
+
+BULK_POLL_INTERVAL = 2.0  # seconds before the first status check
+BULK_POLL_MAX_INTERVAL = 30.0  # poll backs off up to this
+BULK_TIMEOUT = 3 * 3600  # seconds to wait for a job to finish
+BULK_MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # one CSV upload (Salesforce allows 150 MB)
+_BULK_SPOOL_BYTES = 8 * 1024 * 1024  # CSV kept in memory before spilling to disk
+_BULK_DONE_STATES = {"JobComplete", "Failed", "Aborted"}
+
+
+class BulkJobError(RuntimeError):
+    """A Bulk API 2.0 job failed or was aborted; ``job`` holds its last status."""
+
+    def __init__(self, message: str, job: dict | None = None) -> None:
+        super().__init__(message)
+        self.job = job or {}
+
+
+def _bulk_request(method: str, path: str, *, json_body=None, data=None,
+                  content_type: str = "application/json", params=None, stream=False):
+    """Send a request to ``jobs/<path>``; raises with Salesforce's message on errors.
+
+    A 401 means the (possibly restored) session has expired: the
+    connection is dropped and the request sent once more after logging in.
+    """
+    if json_body is not None:
+        data = json.dumps(json_body)
+    start = data.tell() if hasattr(data, "seek") else None
+    for attempt in range(2):
+        sf = _sf_conn()
+        headers = dict(getattr(sf, "headers", {}) or {})
+        headers["Content-Type"] = content_type
+        resp = sf.session.request(
+            method, f"{sf.base_url}jobs/{path}",
+            headers=headers, data=data, params=params, stream=stream, timeout=300,
+        )
+        if resp.status_code != 401 or attempt:
+            break
+        resp.close()
+        print(f"[SF] session expired during bulk {method} jobs/{path}; logging in again")
+        _drop_connection()
+        if start is not None:
+            data.seek(start)
+    if resp.status_code >= 400:
+        try:
+            detail = "; ".join(e.get("message", "") for e in resp.json())
+        except Exception:
+            detail = resp.text[:500]
+        raise RuntimeError(f"Bulk API {method} jobs/{path} failed ({resp.status_code}): {detail}")
+    return resp
+
+
+def bulk_wait(job_id: str, kind: str = "query", timeout: float = BULK_TIMEOUT) -> dict:
+    """Poll a job (*kind* "query" or "ingest") until it finishes; returns its status.
+
+    Raises BulkJobError if it failed or was aborted, TimeoutError after *timeout*.
+    """
+    interval = BULK_POLL_INTERVAL
+    deadline = time.time() + timeout
+    while True:
+        job = _bulk_request("GET", f"{kind}/{job_id}").json()
+        state = job.get("state", "")
+        if state == "JobComplete":
+            return job
+        if state in _BULK_DONE_STATES:
+            raise BulkJobError(
+                f"Bulk {kind} job {job_id} {state.lower()}: {job.get('errorMessage', '')}", job
+            )
+        if time.time() + interval > deadline:
+            raise TimeoutError(f"Bulk {kind} job {job_id} still {state} after {timeout:.0f}s")
+        time.sleep(interval)
+        interval = min(interval * 1.5, BULK_POLL_MAX_INTERVAL)
+
+
+def _iter_csv(resp):
+    """Rows of a streamed CSV response as dicts, decoded incrementally."""
+    import csv
+    import io
+
+    resp.raw.decode_content = True
+    text = io.TextIOWrapper(resp.raw, encoding="utf-8", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        resp.close()
+
+
+def bulk_create_query_job(soql: str, include_deleted: bool = False) -> str:
+    """Start a Bulk API 2.0 query job; returns its Id."""
+    job = _bulk_request("POST", "query", json_body={
+        "operation": "queryAll" if include_deleted else "query",
+        "query": soql,
+        "contentType": "CSV",
+        "lineEnding": "LF",
+    }).json()
+    return job["id"]
+
+
+def bulk_query_results(job_id: str, page_size: int = 50000):
+    """Stream the rows of a finished query job, one page request at a time.
+
+    Yields dicts of column -> string. Nulls come back as ``""`` and
+    relationship columns are named like ``"Primary_Attorney__r.Name"``.
+    """
+    locator = ""
+    while True:
+        params = {"maxRecords": page_size}
+        if locator:
+            params["locator"] = locator
+        resp = _bulk_request("GET", f"query/{job_id}/results", params=params, stream=True)
+        locator = resp.headers.get("Sforce-Locator", "null")
+        yield from _iter_csv(resp)
+        if not locator or locator == "null":
+            return
+
+
+def bulk_query(soql: str, include_deleted: bool = False, page_size: int = 50000):
+    """Run *soql* as a Bulk API 2.0 job and stream its rows (see bulk_query_results).
+
+    Example: every active client's A-number for a report, without paging
+    through the REST API 2000 records at a time::
+
+        for row in bulk_query("SELECT Id, Customer_ID__c, A_Number__c FROM Contact"):
+            ...
+    """
+    job_id = bulk_create_query_job(soql, include_deleted)
+    print(f"[SF] bulk query job {job_id} started")
+    bulk_wait(job_id, "query")
+    yield from bulk_query_results(job_id, page_size)
+
+
+def _bulk_upload_job(object_name: str, operation: str, csv_file,
+                     external_id_field: str) -> str:
+    """Create an ingest job, upload one CSV file to it and close it; returns its Id."""
+    spec = {"object": object_name, "operation": operation,
+            "contentType": "CSV", "lineEnding": "LF"}
+    if external_id_field:
+        spec["externalIdFieldName"] = external_id_field
+    job_id = _bulk_request("POST", "ingest", json_body=spec).json()["id"]
+    csv_file.seek(0)
+    try:
+        _bulk_request("PUT", f"ingest/{job_id}/batches", data=csv_file, content_type="text/csv")
+        _bulk_request("PATCH", f"ingest/{job_id}", json_body={"state": "UploadComplete"})
+    except Exception:
+        try:
+            _bulk_request("PATCH", f"ingest/{job_id}", json_body={"state": "Aborted"})
+        except Exception:
+            pass
+        raise
+    print(f"[SF] bulk {operation} job {job_id} uploaded ({object_name})")
+    return job_id
+
+
+def bulk_ingest(
+    object_name: str,
+    operation: str,
+    rows,
+    fields: list[str] | None = None,
+    external_id_field: str = "",
+    wait: bool = True,
+) -> dict:
+    """Write *rows* (an iterable of dicts) with Bulk API 2.0 ingest jobs.
+
+    *operation* is "insert", "update", "upsert" (needs *external_id_field*)
+    or "delete"/"hardDelete" (rows only need "Id"). Columns are *fields*, or
+    the keys of the first row. Rows are written to a temporary CSV that
+    spills to disk, and a new job is started whenever an upload would
+    exceed BULK_MAX_UPLOAD_BYTES.
+
+    Returns ``{"jobs": [job ids], "processed": int, "failed": int}``; with
+    *wait* False the jobs are left running and only "jobs" is filled in.
+    Failed rows can be read with ``bulk_ingest_results(job_id)``. The
+    record cache is cleared afterwards, since any cached record may have
+    changed.
+
+    Example, backfilling a new custom field::
+
+        bulk_ingest("Contact", "update",
+                    ({"Id": r["Id"], "Intake_Year__c": r["CreatedDate"][:4]}
+                     for r in bulk_query("SELECT Id, CreatedDate FROM Contact")))
+    """
+    import csv
+    import io
+    import tempfile
+
+    job_ids: list[str] = []
+
+    def _new_spool():
+        spool = tempfile.SpooledTemporaryFile(max_size=_BULK_SPOOL_BYTES, mode="w+b")
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="", write_through=True)
+        writer = csv.DictWriter(text, fieldnames=columns, lineterminator="\n",
+                                extrasaction="ignore")
+        writer.writeheader()
+        return spool, text, writer
+
+    def _flush(spool, text) -> None:
+        text.flush()
+        job_ids.append(_bulk_upload_job(object_name, operation, spool, external_id_field))
+        text.close()
+
+    columns = list(fields or [])
+    spool = text = writer = None
+    pending = 0
+    try:
+        for row in rows:
+            if writer is None:
+                columns = columns or list(row)
+                spool, text, writer = _new_spool()
+            writer.writerow({k: "" if v is None else v for k, v in row.items()})
+            pending += 1
+            if spool.tell() >= BULK_MAX_UPLOAD_BYTES:
+                _flush(spool, text)
+                spool, text, writer = _new_spool()
+                pending = 0
+        if pending:
+            _flush(spool, text)
+        elif text is not None:
+            text.close()
+    finally:
+        clear_record_cache()
+
+    result = {"jobs": job_ids, "processed": 0, "failed": 0}
+    if wait:
+        for job_id in job_ids:
+            job = bulk_wait(job_id, "ingest")
+            result["processed"] += int(job.get("numberRecordsProcessed") or 0)
+            result["failed"] += int(job.get("numberRecordsFailed") or 0)
+        clear_record_cache()
+    return result
+
+
+def bulk_ingest_results(job_id: str, failed: bool = True):
+    """Stream an ingest job's failed (or successful) rows as dicts.
+
+    Failed rows carry ``sf__Id`` and ``sf__Error`` plus the uploaded columns.
+    """
+    kind = "failedResults" if failed else "successfulResults"
+    resp = _bulk_request("GET", f"ingest/{job_id}/{kind}/", stream=True)
+    yield from _iter_csv(resp)
 
 
 # ---------------------------------------------------------------------------
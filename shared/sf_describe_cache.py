@@ -0,0 +1,117 @@
+"""Shared on-disk cache of Salesforce describe results.
+
+Describe calls return hundreds of kilobytes and every tool process used to
+repeat them after each restart. Results are kept as one JSON file per
+object in data/config/sf-describe/, so all processes share them. Each
+entry remembers the response's ``Last-Modified`` value, which
+``salesforce_client`` sends back as ``If-Modified-Since`` when revalidating.
+An unchanged object then costs a bodiless 304 instead of a full describe.
+
+Within a process, a parsed file is reused until its mtime changes, so a
+refresh written by another process is picked up on the next read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "config" / "sf-describe"
+
+# Seconds a cached describe is trusted before it is revalidated
+REVALIDATE_AFTER = 3600
+
+# path -> (mtime_ns, entry)
+_memo: dict[Path, tuple[int, dict]] = {}
+_memo_lock = threading.Lock()
+
+
+def _path(name: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_]", "_", name)
+    return _CACHE_DIR / f"{safe}.json"
+
+
+def load(name: str) -> dict | None:
+    """Return the cached entry for *name*, or None.
+
+    An entry is ``{"describe": {...}, "last_modified": str, "checked_at": float}``.
+    Callers must not modify it.
+    """
+    path = _path(name)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _memo_lock:
+        memo = _memo.get(path)
+        if memo is not None and memo[0] == mtime:
+            return memo[1]
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    with _memo_lock:
+        _memo[path] = (mtime, entry)
+    return entry
+
+
+def store(name: str, describe: dict, last_modified: str) -> dict:
+    """Write a fresh describe result for *name* (atomically); returns the entry."""
+    entry = {"describe": describe, "last_modified": last_modified, "checked_at": time.time()}
+    _write(_path(name), entry)
+    return entry
+
+
+def mark_checked(name: str) -> None:
+    """Record a successful revalidation (304) so the next one waits again."""
+    entry = load(name)
+    if entry is not None:
+        _write(_path(name), {**entry, "checked_at": time.time()})
+
+
+def is_fresh(entry: dict) -> bool:
+    return time.time() - entry.get("checked_at", 0) < REVALIDATE_AFTER
+
+
+def _write(path: Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def clear(name: str | None = None) -> int:
+    """Delete the cached describe for *name*, or all of them. Returns files removed."""
+    paths = [_path(name)] if name else list(_CACHE_DIR.glob("*.json"))
+    removed = 0
+    for path in paths:
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    with _memo_lock:
+        for path in paths:
+            _memo.pop(path, None)
+    return removed
+
+
+def get_cache_info() -> dict:
+    """Return ``{"objects": int, "bytes": int, "oldest_check": float | None}``."""
+    paths = list(_CACHE_DIR.glob("*.json"))
+    checks = [e["checked_at"] for p in paths if (e := load(p.stem))]
+    return {
+        "objects": len(paths),
+        "bytes": sum(p.stat().st_size for p in paths if p.exists()),
+        "oldest_check": min(checks) if checks else None,
+    }
@@ -0,0 +1,308 @@
+"""Local Salesforce gateway shared by all tool processes.
+
+Without it, each of the Streamlit apps keeps its own Salesforce session,
+record cache and describe memo, and they all race to restore or re-auth the
+session after a restart. The gateway is one small process that holds the
+single authenticated session, the single record cache and a rate limiter.
+It serves the ``shared.salesforce_client`` functions over localhost HTTP.
+
+``salesforce_client`` uses the gateway transparently whenever it is
+running. Functions marked with ``@_via_gateway`` forward their call here.
+If the gateway is not running, or cannot be reached before a call is
+sent, they run in-process exactly as before (direct mode).
+
+Discovery: on start the gateway writes data/.sf_gateway.json with its
+port and a random token; clients read that file and must send the token.
+Only registered salesforce_client functions can be called.
+
+Run it with (start.sh does this)::
+
+    python shared/sf_gateway.py
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import json
+import os
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_DISCOVERY_PATH = Path(__file__).resolve().parent.parent / "data" / ".sf_gateway.json"
+
+CALL_TIMEOUT = 120  # seconds a forwarded call may take
+_RETRY_DOWN_AFTER = 30  # seconds before retrying an unreachable gateway
+RATE_PER_SECOND = 20.0  # Salesforce calls the gateway starts per second (burst = same)
+
+_down_until = 0.0
+_state_lock = threading.Lock()
+
+
+class GatewayError(RuntimeError):
+    """A forwarded call failed in transit, or with an error type that can't be rebuilt."""
+
+    def __init__(self, message: str, error_type: str = "") -> None:
+        super().__init__(message)
+        self.error_type = error_type
+
+
+# ── Wire format ──────────────────────────────────────────────────────────
+
+
+def _encode(value):
+    """JSON-safe form of call arguments/results (bytes become base64)."""
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+# ── Client side ──────────────────────────────────────────────────────────
+
+
+def _discover() -> dict | None:
+    try:
+        info = json.loads(_DISCOVERY_PATH.read_text())
+        return info if info.get("port") and info.get("token") else None
+    except (OSError, ValueError):
+        return None
+
+
+def _mark_down() -> None:
+    global _down_until
+    with _state_lock:
+        _down_until = time.time() + _RETRY_DOWN_AFTER
+
+
+def try_call(name: str, args: tuple, kwargs: dict) -> tuple[bool, object]:
+    """Forward ``name(*args, **kwargs)`` to the gateway.
+
+    Returns ``(True, result)`` when the gateway ran it, ``(False, None)``
+    when there is no reachable gateway (the caller then runs it directly).
+    Errors raised inside the gateway are re-raised as their original
+    class (see ``_rebuild_error``). A transport failure after the request
+    was sent raises GatewayError, rather than risk running a write twice.
+    """
+    if time.time() < _down_until:
+        return False, None
+    info = _discover()
+    if info is None:
+        return False, None
+    conn = http.client.HTTPConnection("127.0.0.1", info["port"], timeout=CALL_TIMEOUT)
+    try:
+        conn.connect()
+    except OSError:
+        _mark_down()
+        return False, None
+    try:
+        from shared.salesforce_client import current_tool
+
+        body = json.dumps({
+            "fn": name,
+            "args": _encode(args),
+            "kwargs": _encode(kwargs),
+            "tool": current_tool(),  # calls are counted for the caller, not the gateway
+        })
+        conn.request("POST", "/call", body=body, headers={
+            "Content-Type": "application/json",
+            "X-Gateway-Token": info["token"],
+        })
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        raise GatewayError(f"Salesforce gateway call {name} failed: {e}") from e
+    finally:
+        conn.close()
+    if response.status == 403:
+        # Stale discovery file from an earlier gateway; ignore it for a while
+        _mark_down()
+        return False, None
+    if not payload.get("ok"):
+        raise _rebuild_error(payload)
+    return True, _decode(payload.get("result"))
+
+
+# Modules whose exception classes are re-raised as themselves on the client
+_ERROR_MODULES = ("builtins", "simple_salesforce.exceptions", "requests.exceptions")
+_ERROR_PACKAGES = ("shared.",)
+
+
+def _rebuild_error(payload: dict) -> BaseException:
+    """The exception raised inside the gateway, as its original class if possible.
+
+    Callers then catch the same types (e.g. SalesforceMalformedRequest)
+    whether or not the gateway is running. Unknown or unbuildable types
+    come back as GatewayError.
+    """
+    import importlib
+
+    message = payload.get("error", "unknown gateway error")
+    name, module = payload.get("type", ""), payload.get("module", "")
+    if name and (module in _ERROR_MODULES or module.startswith(_ERROR_PACKAGES)):
+        try:
+            cls = getattr(importlib.import_module(module), name)
+            if isinstance(cls, type) and issubclass(cls, Exception):
+                error = cls(*_decode(payload.get("args", [])))
+                str(error)  # some classes format attributes lazily; make sure it works
+                return error
+        except Exception:
+            pass
+    return GatewayError(message, name)
+
+
+def is_running() -> bool:
+    """Whether a gateway answers its health check."""
+    info = _discover()
+    if info is None:
+        return False
+    conn = http.client.HTTPConnection("127.0.0.1", info["port"], timeout=2)
+    try:
+        conn.request("GET", "/health", headers={"X-Gateway-Token": info["token"]})
+        return conn.getresponse().status == 200
+    except OSError:
+        return False
+    finally:
+        conn.close()
+
+
+# ── Server side ──────────────────────────────────────────────────────────
+
+
+class _RateLimiter:
+    """Token bucket: at most *rate* calls per second, bursts up to *rate*."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _make_handler(token: str, limiter: _RateLimiter):
+    from shared import salesforce_client
+
+    class _Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self) -> bool:
+            if secrets.compare_digest(self.headers.get("X-Gateway-Token", ""), token):
+                return True
+            self._reply(403, {"ok": False, "error": "bad gateway token"})
+            return False
+
+        def do_GET(self):  # noqa: N802 (http.server naming)
+            if self._authorized():
+                self._reply(200 if self.path == "/health" else 404, {"ok": self.path == "/health"})
+
+        def do_POST(self):  # noqa: N802
+            if not self._authorized():
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                fn = salesforce_client.GATEWAY_FUNCTIONS.get(request.get("fn", ""))
+                if fn is None:
+                    self._reply(404, {"ok": False, "error": f"unknown function {request.get('fn')!r}"})
+                    return
+                limiter.acquire()
+                salesforce_client._gateway_local.direct = True
+                salesforce_client._gateway_local.tool = request.get("tool", "")
+                result = fn(*_decode(request.get("args", [])), **_decode(request.get("kwargs", {})))
+                self._reply(200, {"ok": True, "result": _encode(result)})
+            except Exception as e:
+                self._reply(200, {
+                    "ok": False,
+                    "error": str(e),
+                    "type": type(e).__name__,
+                    "module": type(e).__module__,
+                    "args": _encode(list(e.args)),
+                })
+
+        def log_message(self, format, *args):  # keep the console quiet
+            pass
+
+    return _Handler
+
+
+def make_server(port: int = 0, rate: float = RATE_PER_SECOND) -> tuple[ThreadingHTTPServer, str]:
+    """Build a gateway server on 127.0.0.1 (port 0 picks a free one).
+
+    Calls it serves run salesforce_client in direct mode, so nested calls
+    execute here rather than being forwarded again. Returns ``(server, token)``.
+    """
+    token = secrets.token_urlsafe(24)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(token, _RateLimiter(rate)))
+    server.daemon_threads = True
+    return server, token
+
+
+def _write_discovery(port: int, token: str) -> None:
+    _DISCOVERY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _DISCOVERY_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"port": port, "token": token, "pid": os.getpid()}))
+    os.chmod(tmp, 0o600)
+    os.replace(tmp, _DISCOVERY_PATH)
+
+
+def serve(port: int = 0) -> None:
+    """Run the gateway until interrupted, advertising it via the discovery file."""
+    server, token = make_server(port)
+    _write_discovery(server.server_address[1], token)
+    print(f"[SF gateway] listening on 127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        try:
+            info = _discover()
+            if info and info.get("pid") == os.getpid():
+                _DISCOVERY_PATH.unlink()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    import argparse
+    import signal
+    import sys
+
+    # stop.sh sends SIGTERM; exit through serve()'s cleanup of the discovery file
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    parser = argparse.ArgumentParser(description="Shared Salesforce gateway.")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("SF_GATEWAY_PORT", 0)))
+    serve(parser.parse_args().port)
@@ -0,0 +1,474 @@
+"""Local SQLite mirror of Salesforce clients for instant search.
+
+Contacts (``DEFAULT_FIELDS``, clients only, i.e. with a Customer_ID__c),
+their ``Legal_Case__c`` and ``LC_Task__c`` records are copied into
+data/config/sf-mirror/mirror.db. Each sync only asks Salesforce for rows
+whose ``SystemModstamp`` is at or after the last one seen for that object
+(its watermark). Deleted rows come back through queryAll with
+``IsDeleted = true`` and are removed locally, as are contacts whose
+Customer_ID__c has been cleared.
+
+Sync failures are recorded per object in ``sync_state.error`` (see
+``get_sync_status``) and cleared by the next successful sync.
+
+Name words, the customer ID and A-number digits are also stored in an
+indexed term table. That lets ``search`` answer prefix and typo-tolerant
+queries ("garc mar", "A 123-45", "1234", "gracia") from local data in a
+few milliseconds.
+
+Runs as a background job started by start.sh::
+
+    python shared/sf_mirror.py --loop 300     # sync every 5 minutes
+    python shared/sf_mirror.py --full         # one complete re-sync
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+
+_MIRROR_DIR = Path(__file__).resolve().parent.parent / "data" / "config" / "sf-mirror"
+
+DEFAULT_SYNC_INTERVAL = 300  # seconds
+MAX_BACKOFF = 3600  # longest wait between syncs while API usage is high
+_BATCH_COMMIT = 500
+_FUZZY_MIN_RATIO = 0.75
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id          TEXT PRIMARY KEY,
+    customer_id TEXT NOT NULL DEFAULT '',
+    name        TEXT NOT NULL DEFAULT '',
+    a_number    TEXT NOT NULL DEFAULT '',
+    data        TEXT NOT NULL,
+    modstamp    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS contacts_customer_id ON contacts (customer_id);
+CREATE TABLE IF NOT EXISTS legal_cases (
+    id         TEXT PRIMARY KEY,
+    contact_id TEXT NOT NULL DEFAULT '',
+    data       TEXT NOT NULL,
+    modstamp   TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS legal_cases_contact ON legal_cases (contact_id);
+CREATE TABLE IF NOT EXISTS lc_tasks (
+    id         TEXT PRIMARY KEY,
+    contact_id TEXT NOT NULL DEFAULT '',
+    data       TEXT NOT NULL,
+    modstamp   TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS lc_tasks_contact ON lc_tasks (contact_id);
+CREATE TABLE IF NOT EXISTS search_terms (
+    term       TEXT NOT NULL,
+    contact_id TEXT NOT NULL,
+    PRIMARY KEY (term, contact_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS search_terms_contact ON search_terms (contact_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    object    TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL DEFAULT '',
+    synced_at REAL NOT NULL DEFAULT 0,
+    rows      INTEGER NOT NULL DEFAULT 0,
+    error     TEXT NOT NULL DEFAULT ''
+);
+"""
+_local = threading.local()
+
+
+def _conn() -> sqlite3.Connection:
+    """Per-thread connection to the mirror database for the current _MIRROR_DIR."""
+    db_path = _MIRROR_DIR / "mirror.db"
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        _MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conns[db_path] = conn
+    return conn
+
+
+# ── Normalization ────────────────────────────────────────────────────────
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents: "Muñoz" -> "munoz"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _digits(text: str) -> str:
+    return re.sub(r"\D", "", text or "")
+
+
+def _terms_for(record: dict) -> set[str]:
+    """Searchable terms for a Contact: name words, customer ID, A-number digits."""
+    terms = set()
+    for field in ("FirstName", "LastName", "Name"):
+        terms.update(w for w in re.split(r"[^a-z0-9]+", _fold(record.get(field) or "")) if w)
+    if record.get("Customer_ID__c"):
+        terms.add(str(record["Customer_ID__c"]).strip().lower())
+    a_digits = _digits(record.get("A_Number__c") or "")
+    if a_digits:
+        terms.add(a_digits)
+    return terms
+
+
+def _query_words(query: str) -> list[str]:
+    """Split a search query into terms; "A123-456-789" becomes "123456789"."""
+    folded = _fold(query).strip()
+    compact = re.sub(r"[\s-]", "", folded)
+    if re.fullmatch(r"a?\d+", compact):
+        return [_digits(compact)]
+    return [w for w in re.split(r"[^a-z0-9]+", folded) if w]
+
+
+# ── Sync ─────────────────────────────────────────────────────────────────
+
+
+def _mirrored_objects() -> dict[str, dict]:
+    """What to mirror: object -> table, fields, parent lookup, required field.
+
+    Rows whose *required* field is empty are not mirrored (and removed if
+    they were). This is checked locally rather than in the query, so a row
+    that loses the value is seen by the incremental sync.
+    """
+    from shared.salesforce_client import (
+        _LC_RELATIONSHIP_FIELDS,
+        DEFAULT_FIELDS,
+        LEGAL_CASE_FIELDS,
+    )
+
+    return {
+        "Contact": {
+            "table": "contacts",
+            "fields": DEFAULT_FIELDS,
+            "parent": None,
+            "required": "Customer_ID__c",
+        },
+        "Legal_Case__c": {
+            "table": "legal_cases",
+            "fields": LEGAL_CASE_FIELDS + _LC_RELATIONSHIP_FIELDS,
+            "parent": "Primary_Applicant__c",
+            "required": None,
+        },
+        "LC_Task__c": {
+            "table": "lc_tasks",
+            "fields": ["Id", "Name", "For__c", "Contact__c"],
+            "parent": "Contact__c",
+            "required": None,
+        },
+    }
+
+
+def _soql_datetime(modstamp: str) -> str:
+    """Salesforce's "2026-10-05T10:00:00.000+0000" as a SOQL literal (UTC, seconds)."""
+    parsed = datetime.strptime(modstamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _sync_query(object_name: str, spec: dict, watermark: str) -> str:
+    fields = list(dict.fromkeys(
+        ["Id", *spec["fields"], *filter(None, [spec["required"]]), "SystemModstamp", "IsDeleted"]
+    ))
+    where = ""
+    if watermark:
+        # ">=" because the literal drops milliseconds; re-applying a row is harmless
+        where = f" WHERE SystemModstamp >= {_soql_datetime(watermark)}"
+    return f"SELECT {', '.join(fields)} FROM {object_name}{where} ORDER BY SystemModstamp"
+
+
+def _apply(conn: sqlite3.Connection, object_name: str, spec: dict, record: dict) -> None:
+    """Upsert (or delete) one queried record in the mirror."""
+    from shared.salesforce_client import _flatten_lc_record
+
+    record_id = record["Id"]
+    table = spec["table"]
+    if record.get("IsDeleted") or (spec["required"] and not record.get(spec["required"])):
+        conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+        if table == "contacts":
+            conn.execute("DELETE FROM search_terms WHERE contact_id = ?", (record_id,))
+        return
+
+    modstamp = record.get("SystemModstamp") or ""
+    if table == "legal_cases":
+        data = _flatten_lc_record(record)
+    else:
+        data = {k: v for k, v in record.items() if k != "attributes"}
+    data.pop("IsDeleted", None)
+    data.pop("SystemModstamp", None)
+    if table == "contacts":
+        conn.execute(
+            "INSERT OR REPLACE INTO contacts (id, customer_id, name, a_number, data, modstamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (record_id, str(data.get("Customer_ID__c") or ""), data.get("Name") or "",
+             data.get("A_Number__c") or "", json.dumps(data), modstamp),
+        )
+        conn.execute("DELETE FROM search_terms WHERE contact_id = ?", (record_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO search_terms (term, contact_id) VALUES (?, ?)",
+            [(t, record_id) for t in _terms_for(data)],
+        )
+    else:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} (id, contact_id, data, modstamp) VALUES (?, ?, ?, ?)",
+            (record_id, data.get(spec["parent"]) or "", json.dumps(data), modstamp),
+        )
+
+
+def _sync_object(object_name: str, spec: dict) -> int:
+    from shared.salesforce_client import _sf_conn
+
+    sf = _sf_conn()
+    conn = _conn()
+    row = conn.execute(
+        "SELECT watermark FROM sync_state WHERE object = ?", (object_name,)
+    ).fetchone()
+    watermark = row[0] if row else ""
+    query = _sync_query(object_name, spec, watermark)
+
+    applied = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for record in sf.query_all_iter(query, include_deleted=True):
+            _apply(conn, object_name, spec, record)
+            watermark = max(watermark, record.get("SystemModstamp") or "")
+            applied += 1
+            if applied % _BATCH_COMMIT == 0:
+                _save_state(conn, object_name, watermark, applied, "")
+                conn.execute("COMMIT")
+                conn.execute("BEGIN IMMEDIATE")
+        _save_state(conn, object_name, watermark, applied, "")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return applied
+
+
+def _save_state(conn, object_name: str, watermark: str, rows: int, error: str) -> None:
+    conn.execute(
+        "INSERT INTO sync_state (object, watermark, synced_at, rows, error) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(object) DO UPDATE SET "
+        "watermark = excluded.watermark, synced_at = excluded.synced_at, "
+        "rows = excluded.rows, error = excluded.error",
+        (object_name, watermark, time.time(), rows, error),
+    )
+
+
+def sync(full: bool = False) -> dict[str, int]:
+    """Pull changes for every mirrored object. Returns rows applied per object.
+
+    *full* forgets the watermarks first, re-reading everything. An object
+    that fails (e.g. a field missing in this org) is recorded in
+    ``sync_state.error`` and the others still sync; if Salesforce can't be
+    reached at all, every object records that error.
+
+    This deliberately uses its own connection instead of the gateway: the
+    sync streams queryAll pages through ``query_all_iter`` (a generator
+    the gateway can't carry), and it runs in one long-lived process.
+    ``_sf_conn`` restores the session the gateway saved to
+    data/.sf_session.json without a probe call, so no extra login occurs;
+    if that session has expired, ``_run_direct`` drops it, logs in and
+    syncs the object again from its watermark. The job's calls are still
+    counted and throttled (see ``background_throttled``).
+    """
+    from shared.salesforce_client import _run_direct, _sf_conn
+
+    conn = _conn()
+    objects = _mirrored_objects()
+    try:
+        _sf_conn()
+    except Exception as e:
+        for object_name in objects:
+            _save_error(conn, object_name, e)
+        return dict.fromkeys(objects, 0)
+    if full:
+        conn.execute("UPDATE sync_state SET watermark = ''")
+    results = {}
+    for object_name, spec in objects.items():
+        try:
+            results[object_name] = _run_direct(_sync_object, (object_name, spec), {})
+        except Exception as e:
+            _save_error(conn, object_name, e)
+            results[object_name] = 0
+    return results
+
+
+def _save_error(conn, object_name: str, error: Exception) -> None:
+    """Record a failed sync of *object_name*, keeping its watermark."""
+    conn.execute(
+        "INSERT INTO sync_state (object, error, synced_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(object) DO UPDATE SET error = excluded.error",
+        (object_name, f"{type(error).__name__}: {error}", time.time()),
+    )
+
+
+def run_forever(interval: float = DEFAULT_SYNC_INTERVAL) -> None:
+    """Sync every *interval* seconds until the process is stopped.
+
+    While the org's daily API usage is past the configured share (see
+    ``salesforce_client.background_throttled``), syncs are skipped and the
+    wait doubles each time, up to MAX_BACKOFF.
+    """
+    from shared.salesforce_client import background_throttled
+
+    delay = interval
+    while True:
+        if background_throttled():
+            delay = min(delay * 2, max(MAX_BACKOFF, interval))
+        else:
+            delay = interval
+            try:
+                sync()
+            except Exception:
+                pass  # per-object failures are in sync_state; keep the loop alive
+        time.sleep(delay)
+
+
+def get_sync_status() -> list[dict]:
+    """Per-object ``{object, watermark, synced_at, rows, error}`` plus mirrored row counts."""
+    conn = _conn()
+    counts = {
+        "Contact": conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0],
+        "Legal_Case__c": conn.execute("SELECT COUNT(*) FROM legal_cases").fetchone()[0],
+        "LC_Task__c": conn.execute("SELECT COUNT(*) FROM lc_tasks").fetchone()[0],
+    }
+    rows = conn.execute(
+        "SELECT object, watermark, synced_at, rows, error FROM sync_state"
+    ).fetchall()
+    state = {r[0]: r for r in rows}
+    return [
+        {
+            "object": obj,
+            "watermark": state[obj][1] if obj in state else "",
+            "synced_at": state[obj][2] if obj in state else 0.0,
+            "rows": state[obj][3] if obj in state else 0,
+            "error": state[obj][4] if obj in state else "",
+            "mirrored": count,
+        }
+        for obj, count in counts.items()
+    ]
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────
+
+
+def _prefix_matches(conn, word: str) -> dict[str, float]:
+    """contact_id -> best score for one query word (2 exact, 1 prefix)."""
+    scores: dict[str, float] = {}
+    for term, contact_id in conn.execute(
+        "SELECT term, contact_id FROM search_terms WHERE term >= ? AND term < ?",
+        (word, word + "\uffff"),
+    ):
+        scores[contact_id] = max(scores.get(contact_id, 0), 2.0 if term == word else 1.0)
+    return scores
+
+
+def _fuzzy_matches(conn, word: str) -> dict[str, float]:
+    """Typo-tolerant matches among terms sharing the word's first letter."""
+    if len(word) < 3 or word.isdigit():
+        return {}
+    terms = [r[0] for r in conn.execute(
+        "SELECT DISTINCT term FROM search_terms WHERE term >= ? AND term < ?",
+        (word[0], word[0] + "\uffff"),
+    )]
+    close = difflib.get_close_matches(word, terms, n=20, cutoff=_FUZZY_MIN_RATIO)
+    scores: dict[str, float] = {}
+    for term in close:
+        ratio = difflib.SequenceMatcher(None, word, term).ratio()
+        for (contact_id,) in conn.execute(
+            "SELECT contact_id FROM search_terms WHERE term = ?", (term,)
+        ):
+            scores[contact_id] = max(scores.get(contact_id, 0), ratio * 0.9)
+    return scores
+
+
+def search(query: str, limit: int = 10) -> list[dict]:
+    """Typeahead search over name, customer ID and A-number.
+
+    Every word of *query* must match (as a prefix, or failing that
+    approximately) some term of the contact. Results are mirrored Contact
+    dicts (``DEFAULT_FIELDS``), best match first.
+    """
+    words = _query_words(query)
+    if not words:
+        return []
+    conn = _conn()
+    totals: dict[str, float] | None = None
+    for word in words:
+        scores = _prefix_matches(conn, word)
+        if not scores:
+            scores = _fuzzy_matches(conn, word)
+        if totals is None:
+            totals = scores
+        else:
+            totals = {cid: totals[cid] + s for cid, s in scores.items() if cid in totals}
+        if not totals:
+            return []
+
+    ranked = sorted(totals.items(), key=lambda item: -item[1])
+    ids = [cid for cid, _ in ranked]
+    rows = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        placeholders = ", ".join("?" * len(chunk))
+        for contact_id, name, data in conn.execute(
+            f"SELECT id, name, data FROM contacts WHERE id IN ({placeholders})", chunk
+        ):
+            rows[contact_id] = (name, data)
+    ranked.sort(key=lambda item: (-item[1], _fold(rows.get(item[0], ("",))[0])))
+    return [json.loads(rows[cid][1]) for cid, _ in ranked if cid in rows][:limit]
+
+
+def get_client(customer_id: str) -> dict | None:
+    """Mirrored Contact for *customer_id*, or None."""
+    row = _conn().execute(
+        "SELECT data FROM contacts WHERE customer_id = ? LIMIT 1", (str(customer_id),)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_legal_cases(contact_sf_id: str) -> list[dict]:
+    """Mirrored Legal_Case__c records of a Contact (flattened like get_legal_cases)."""
+    rows = _conn().execute(
+        "SELECT data FROM legal_cases WHERE contact_id = ? ORDER BY id", (contact_sf_id,)
+    ).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+def get_lc_tasks(contact_sf_id: str) -> list[dict]:
+    """Mirrored LC_Task__c records of a Contact."""
+    rows = _conn().execute(
+        "SELECT data FROM lc_tasks WHERE contact_id = ?", (contact_sf_id,)
+    ).fetchall()
+    tasks = [json.loads(r[0]) for r in rows]
+    return sorted(tasks, key=lambda t: t.get("Name") or "")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    parser = argparse.ArgumentParser(description="Mirror Salesforce clients into SQLite.")
+    parser.add_argument("--loop", type=float, metavar="SECONDS",
+                        help="keep syncing at this interval")
+    parser.add_argument("--full", action="store_true", help="ignore watermarks and re-sync all")
+    args = parser.parse_args()
+    if args.full:
+        print(sync(full=True))
+    if args.loop:
+        run_forever(args.loop)
+    elif not args.full:
+        print(sync())
@@ -187,7 +187,11 @@ def render_nav_bar(
     tool_title: str,
     firm_name: str = "O\u2019Brien Immigration Law",
 ) -> None:
-    """Render the shared navigation bar with a back link and centered title."""
+    """Render the shared navigation bar with a back link and centered title.
+
+    Any API budget already spent this month (under "warn" enforcement) is
+    shown as a warning below it.
+    """
     import html as html_mod
 
     st.markdown(
@@ -199,3 +203,15 @@ def render_nav_bar(
         f'</div>',
         unsafe_allow_html=True,
     )
+    _render_budget_warnings()
+
+
+def _render_budget_warnings() -> None:
+    try:
+        from shared.usage_tracker import get_budget_warnings
+
+        warnings = get_budget_warnings()
+    except Exception:
+        return  # usage data unavailable; never block the page over it
+    for message in warnings:
+        st.warning(message)
@@ -3,47 +3,697 @@
 Logs every API call (Anthropic, Google, etc.) with token counts and
 estimated costs. Provides aggregation functions for the Admin Panel.
 
-Data stored in data/config/api-usage.json (list of entries).
+Entries are appended as JSON lines to one file per day in
+data/config/api-usage/ (e.g. ``2026-02-17.jsonl``), so logging a call is
+a single append no matter how much history exists, and concurrent
+writers from different apps never drop each other's entries. Entries
+older than 90 days are dropped a whole day-file at a time.
 Budget settings in data/config/api-budgets.json.
-Entries older than 90 days are trimmed on write.
+
+The old single-file log (data/config/api-usage.json) is migrated into
+day files automatically the first time it is seen.
+
+Each write also bumps per day × service × tool × model totals in a
+small SQLite table (data/config/api-usage/rollups.db), so the Admin
+Panel summaries don't rescan raw entries. ``rebuild_rollups()``
+regenerates them from the day files.
+
+``log_api_call`` never touches disk itself: entries are queued in memory
+and a background thread writes them in batches (every couple of seconds,
+once enough are queued, and at interpreter exit). Reads in this process
+flush the queue first; call ``flush()`` to force a write.
+
+``check_budget()`` is a cheap pre-flight check against the monthly
+budgets in api-budgets.json. Month-to-date spend per service is kept in
+memory — seeded from the rollups, bumped on every ``log_api_call`` and
+re-seeded every few minutes to pick up other apps' spend.
+
+Response-cache hits and misses (see shared/response_cache.py) are counted
+per day × tool in the same rollup database, with the cost each hit saved.
+So are Salesforce REST calls (per day × tool × operation; they cost no
+money but count against the org's daily API allowance), next to the last
+usage/limit figures Salesforce reported, so every process sees them.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
 _CONFIG_DIR = Path(__file__).resolve().parent.parent / "data" / "config"
-_USAGE_FILE = _CONFIG_DIR / "api-usage.json"
+_USAGE_DIR = _CONFIG_DIR / "api-usage"
+_USAGE_FILE = _CONFIG_DIR / "api-usage.json"  # legacy single-file log
 _BUDGETS_FILE = _CONFIG_DIR / "api-budgets.json"
 
+_RETENTION_DAYS = 90
+_last_retention_day = ""
+
+_ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_rollups (
+    day           TEXT NOT NULL,
+    service       TEXT NOT NULL,
+    tool          TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    calls         INTEGER NOT NULL DEFAULT 0,
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd      REAL NOT NULL DEFAULT 0,
+    cache_write_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_read_tokens  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, service, tool, model)
+);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    day       TEXT NOT NULL,
+    tool      TEXT NOT NULL,
+    hits      INTEGER NOT NULL DEFAULT 0,
+    misses    INTEGER NOT NULL DEFAULT 0,
+    saved_usd REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, tool)
+);
+CREATE TABLE IF NOT EXISTS sf_calls (
+    day       TEXT NOT NULL,
+    tool      TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    calls     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, tool, operation)
+);
+CREATE TABLE IF NOT EXISTS api_limits (
+    service    TEXT PRIMARY KEY,
+    used       INTEGER NOT NULL,
+    max        INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+_rollup_local = threading.local()
+
+# Background writer tuning
+_FLUSH_INTERVAL = 2.0   # seconds between timed flushes
+_FLUSH_BATCH = 50       # flush early once this many entries are queued
+_MAX_QUEUE = 10_000     # entries beyond this are dropped (and counted)
+
+# Budget guard
+_BUDGET_KEYS = {
+    "anthropic": "anthropic_monthly_usd",
+    "google_translate": "google_monthly_usd",
+    "google_docs": "google_monthly_usd",
+}
+_BUDGET_RESEED_SECONDS = 300
+_BUDGET_MODES = ("off", "warn", "block")
+
 # Pricing per million tokens (USD) — updated Feb 2026
 PRICING = {
     "claude-sonnet-4-5-20250929": {"input": 3.00, "output": 15.00},
     "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00},
 }
 
+# Message Batches API calls are billed at this fraction of the normal price
+BATCH_DISCOUNT = 0.5
+
+# Prompt caching: writing a cached prefix costs 1.25× the input price,
+# reading it back costs 0.1×
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
+
 # Google Translate v2: $20 per 1M characters
 GOOGLE_TRANSLATE_PRICE_PER_M_CHARS = 20.00
 
 
-def _load_entries() -> list[dict]:
-    if not _USAGE_FILE.exists():
+def _retention_cutoff() -> str:
+    return (datetime.now() - timedelta(days=_RETENTION_DAYS)).isoformat()
+
+
+def _partition_path(day: str) -> Path:
+    return _USAGE_DIR / f"{day}.jsonl"
+
+
+def _partitions() -> list[Path]:
+    """Day files, oldest first."""
+    if not _USAGE_DIR.exists():
         return []
+    return sorted(_USAGE_DIR.glob("????-??-??.jsonl"))
+
+
+def _read_partition(path: Path) -> list[dict]:
     try:
-        return json.loads(_USAGE_FILE.read_text())
-    except (json.JSONDecodeError, OSError):
+        lines = path.read_text().splitlines()
+    except OSError:
         return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # e.g. a torn line from a crash mid-append
+    return entries
+
+
+def _write_partition(day: str, entries: list[dict]) -> None:
+    """Replace a day file atomically (temp file + rename)."""
+    _USAGE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=_USAGE_DIR, prefix=f".{day}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        for e in entries:
+            fh.write(json.dumps(e, ensure_ascii=False) + "\n")
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, _partition_path(day))
+
+
+def _append_entries(entries: list[dict]) -> list[dict]:
+    """Append entries to their day files, one O_APPEND write per day.
+
+    Returns the entries whose day file could not be written.
+    """
+    try:
+        _USAGE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return list(entries)
+    by_day: dict[str, list[dict]] = defaultdict(list)
+    for e in entries:
+        by_day[e["timestamp"][:10]].append(e)
+    failed: list[dict] = []
+    for day, day_entries in by_day.items():
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in day_entries)
+        try:
+            fd = os.open(_partition_path(day), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, data.encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            failed.extend(day_entries)
+    return failed
+
+
+def _drop_expired_partitions() -> None:
+    """Delete whole day files that are entirely past the retention window."""
+    cutoff_day = _retention_cutoff()[:10]
+    for path in _partitions():
+        if path.stem < cutoff_day:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    try:
+        conn = _rollup_conn()
+        conn.execute("DELETE FROM usage_rollups WHERE day < ?", (cutoff_day,))
+        conn.execute("DELETE FROM cache_stats WHERE day < ?", (cutoff_day,))
+        conn.execute("DELETE FROM sf_calls WHERE day < ?", (cutoff_day,))
+    except sqlite3.Error:
+        pass
+
+
+def _maybe_drop_expired_partitions() -> None:
+    """Run retention at most once per day per process."""
+    global _last_retention_day
+    today = datetime.now().strftime("%Y-%m-%d")
+    if _last_retention_day != today:
+        _last_retention_day = today
+        _drop_expired_partitions()
+
+
+def migrate_legacy_usage_file() -> int:
+    """Move entries from the old api-usage.json into day files.
+
+    Safe to call from several processes at once: the legacy file is first
+    renamed out of the way, so only one of them imports it, and its
+    entries are appended to the day files like any other write, so
+    entries other processes are logging meanwhile are kept. Returns the
+    number of entries migrated.
+    """
+    if not _USAGE_FILE.exists():
+        return 0
+    claimed = _USAGE_FILE.with_name(f"{_USAGE_FILE.name}.migrating.{os.getpid()}")
+    try:
+        os.rename(_USAGE_FILE, claimed)
+    except OSError:
+        return 0  # another process got there first
+    try:
+        legacy = json.loads(claimed.read_text())
+        if not isinstance(legacy, list):
+            legacy = []
+    except (json.JSONDecodeError, OSError):
+        legacy = []
+
+    cutoff = _retention_cutoff()
+    entries = [e for e in legacy if e.get("timestamp", "") >= cutoff]
+    failed = _append_entries(entries)
+    if failed:
+        # Put back only what wasn't written, for the next call to retry
+        claimed.write_text(json.dumps(failed))
+        os.replace(claimed, _USAGE_FILE)
+    else:
+        os.replace(claimed, _USAGE_FILE.with_name(f"{_USAGE_FILE.name}.migrated"))
+    rebuild_rollups()
+    return len(entries) - len(failed)
+
+
+def _load_entries(since: str = "") -> list[dict]:
+    """Retained entries, oldest day first, in logging order within a day.
+
+    Pass *since* (an ISO timestamp) to read only the day files it covers.
+    """
+    flush()
+    migrate_legacy_usage_file()
+    return _read_entries(since)
+
+
+def _read_entries(since: str = "") -> list[dict]:
+    """Like _load_entries, without writing queued entries or migrating first."""
+    cutoff = max(_retention_cutoff(), since)
+    cutoff_day = cutoff[:10]
+    entries: list[dict] = []
+    for path in _partitions():
+        if path.stem < cutoff_day:
+            continue
+        entries.extend(e for e in _read_partition(path) if e.get("timestamp", "") >= cutoff)
+    return entries
 
 
 def _save_entries(entries: list[dict]) -> None:
-    _CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    # Trim entries older than 90 days
-    cutoff = (datetime.now() - timedelta(days=90)).isoformat()
-    entries = [e for e in entries if e.get("timestamp", "") >= cutoff]
-    _USAGE_FILE.write_text(json.dumps(entries, indent=2, ensure_ascii=False))
+    """Replace the whole log with *entries* (trimmed to the retention window)."""
+    cutoff = _retention_cutoff()
+    by_day: dict[str, list[dict]] = defaultdict(list)
+    for e in entries:
+        ts = e.get("timestamp", "")
+        if ts >= cutoff:
+            by_day[ts[:10]].append(e)
+    for path in _partitions():
+        if path.stem not in by_day:
+            path.unlink()
+    for day, day_entries in by_day.items():
+        _write_partition(day, day_entries)
+    rebuild_rollups()
+
+
+# ── Rollups ──────────────────────────────────────────────────────────────
+
+
+def _rollup_conn() -> sqlite3.Connection:
+    """Per-thread connection to the rollup database for the current _USAGE_DIR.
+
+    A freshly created database is filled from the day files, so upgrading
+    installs get correct totals without running anything by hand.
+    """
+    db_path = _USAGE_DIR / "rollups.db"
+    conns = getattr(_rollup_local, "conns", None)
+    if conns is None:
+        conns = _rollup_local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        _USAGE_DIR.mkdir(parents=True, exist_ok=True)
+        is_new = not db_path.exists()
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_ROLLUP_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(usage_rollups)")}
+        for column in ("cache_write_tokens", "cache_read_tokens"):
+            if column not in columns:  # databases created before prompt caching
+                conn.execute(
+                    f"ALTER TABLE usage_rollups ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+        conns[db_path] = conn
+        if is_new:
+            _rebuild_rollups(conn)
+    return conn
+
+
+def _rollup_key(e: dict) -> tuple[str, str, str, str]:
+    return (
+        e.get("timestamp", "")[:10],
+        e.get("service", ""),
+        e.get("tool", "unknown"),
+        e.get("model", ""),
+    )
+
+
+def _rollup_add(conn: sqlite3.Connection, entries: list[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO usage_rollups "
+        "(day, service, tool, model, calls, input_tokens, output_tokens, cost_usd, "
+        "cache_write_tokens, cache_read_tokens) "
+        "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(day, service, tool, model) DO UPDATE SET "
+        "calls = calls + 1, "
+        "input_tokens = input_tokens + excluded.input_tokens, "
+        "output_tokens = output_tokens + excluded.output_tokens, "
+        "cost_usd = cost_usd + excluded.cost_usd, "
+        "cache_write_tokens = cache_write_tokens + excluded.cache_write_tokens, "
+        "cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens",
+        [
+            (*_rollup_key(e), e.get("input_tokens", 0), e.get("output_tokens", 0),
+             e.get("estimated_cost_usd", 0.0), e.get("cache_write_tokens", 0),
+             e.get("cache_read_tokens", 0))
+            for e in entries
+        ],
+    )
+
+
+def _rebuild_rollups(conn: sqlite3.Connection) -> None:
+    # The day files are read under the write lock: _write_batch appends
+    # while holding it, so each entry is counted here or by its writer,
+    # never both
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM usage_rollups")
+        _rollup_add(conn, _read_entries())
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def rebuild_rollups() -> None:
+    """Regenerate all rollups from the raw day files.
+
+    Run this if the rollup totals ever look off (e.g. after restoring day
+    files from a backup). The Admin Panel has a button for it.
+    """
+    flush()
+    _rebuild_rollups(_rollup_conn())
+
+
+# Counter tables the writer accumulates in memory: table -> upsert adding
+# the flushed amounts to the row for their key
+_COUNTER_UPSERTS = {
+    "cache_stats": (
+        "INSERT INTO cache_stats (day, tool, hits, misses, saved_usd) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(day, tool) DO UPDATE SET "
+        "hits = hits + excluded.hits, misses = misses + excluded.misses, "
+        "saved_usd = saved_usd + excluded.saved_usd"
+    ),
+    "sf_calls": (
+        "INSERT INTO sf_calls (day, tool, operation, calls) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(day, tool, operation) DO UPDATE SET calls = calls + excluded.calls"
+    ),
+}
+
+
+def _record_counts(counts: dict[tuple, list]) -> bool:
+    """Add accumulated counters to their tables in one transaction.
+
+    *counts* maps ``(table, key)`` to the amounts for that row. Returns
+    False (nothing written) if the database couldn't be written.
+    """
+    try:
+        conn = _rollup_conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for (table, key), amounts in counts.items():
+                conn.execute(_COUNTER_UPSERTS[table], (*key, *amounts))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def _query_rollups(sql: str, params: tuple = ()) -> list[tuple]:
+    flush()
+    migrate_legacy_usage_file()
+    return _rollup_conn().execute(sql, params).fetchall()
+
+
+# ── Background writer ────────────────────────────────────────────────────
+
+
+def _write_batch(entries: list[dict]) -> list[dict]:
+    """Write entries to their day files and rollups. Returns the ones not written.
+
+    The rollup write lock is held while appending, so a concurrent
+    rebuild sees each entry in both places or in neither.
+    """
+    try:
+        conn = _rollup_conn()  # create/backfill first, so these entries aren't counted twice
+        conn.execute("BEGIN IMMEDIATE")
+    except sqlite3.Error:
+        conn = None
+    try:
+        failed = _append_entries(entries)
+        if conn is not None:
+            unwritten = {id(e) for e in failed}
+            _rollup_add(conn, [e for e in entries if id(e) not in unwritten])
+            conn.execute("COMMIT")
+    except sqlite3.Error:
+        pass  # raw entries are safe on disk; rebuild_rollups() will catch up
+    finally:
+        if conn is not None and conn.in_transaction:
+            conn.execute("ROLLBACK")
+    if len(failed) < len(entries):
+        _maybe_drop_expired_partitions()
+    return failed
+
+
+class _UsageWriter:
+    """Bounded in-memory queue drained to disk by a daemon thread.
+
+    Entries whose write fails are kept and written first on the next
+    flush; only overflow beyond ``_MAX_QUEUE`` is dropped (and counted).
+    Counters (see ``_COUNTER_UPSERTS``) are summed in memory per row and
+    written on the same flushes, so counting stays off the caller's path.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=_MAX_QUEUE)
+        self._retry: list[dict] = []  # failed writes, oldest first
+        self._flush_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._counts: dict[tuple, list] = {}  # (table, key) -> amounts not yet written
+        self._counts_lock = threading.Lock()
+        self.dropped = 0
+        self.failed_writes = 0
+
+    def submit(self, entry: dict) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self._ensure_thread()
+        if self._queue.qsize() >= _FLUSH_BATCH:
+            self._wake.set()
+
+    def add(self, table: str, key: tuple, *amounts) -> None:
+        """Add *amounts* to the *table* row for *key* on the next flush."""
+        with self._counts_lock:
+            row = self._counts.setdefault((table, key), [0] * len(amounts))
+            for i, amount in enumerate(amounts):
+                row[i] += amount
+        self._ensure_thread()
+
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+    def _flush_counts(self) -> None:
+        with self._counts_lock:
+            counts, self._counts = self._counts, {}
+        if counts and not _record_counts(counts):
+            self.failed_writes += 1
+            with self._counts_lock:  # keep them for the next flush
+                for (table, key), amounts in counts.items():
+                    row = self._counts.setdefault((table, key), [0] * len(amounts))
+                    for i, amount in enumerate(amounts):
+                        row[i] += amount
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            self._flush_counts()
+            batch, self._retry = self._retry, []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            try:
+                failed = _write_batch(batch)
+            except Exception:
+                # Not a disk failure (those come back in *failed*), so a
+                # retry would fail the same way
+                self.dropped += len(batch)
+                self.failed_writes += 1
+                return
+            if failed:
+                self.failed_writes += 1
+                overflow = len(failed) - _MAX_QUEUE
+                if overflow > 0:
+                    self.dropped += overflow
+                    failed = failed[overflow:]
+                self._retry = failed
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="usage-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(_FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # never let logging kill the writer; failed entries are retried next flush
+
+
+_writer = _UsageWriter()
+atexit.register(lambda: _writer.flush())
+
+
+def flush() -> None:
+    """Write all queued usage entries now (used by reads, tests and shutdown)."""
+    _writer.flush()
+
+
+def get_writer_stats() -> dict:
+    """Queue depth (including entries awaiting a retried write), entries
+    dropped because the queue was full, and the number of failed writes."""
+    return {
+        "pending": _writer.pending(),
+        "dropped": _writer.dropped,
+        "failed_writes": _writer.failed_writes,
+    }
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised by ``check_budget`` when a budget is spent and enforcement is 'block'."""
+
+
+# budget key -> month-to-date USD, for _spend_month; seeded from rollups
+_spend: dict[str, float] = {}
+_spend_month = ""
+_spend_seeded_at = 0.0
+_spend_lock = threading.Lock()
+_budgets_cache: tuple[int, dict] | None = None
+
+
+def _budget_settings() -> dict:
+    """``load_budgets()`` re-read only when the file changes."""
+    global _budgets_cache
+    try:
+        mtime = _BUDGETS_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime = 0
+    if _budgets_cache is None or _budgets_cache[0] != mtime:
+        _budgets_cache = (mtime, load_budgets())
+    return _budgets_cache[1]
+
+
+def _seed_spend(month: str) -> None:
+    """Reload month-to-date totals from rollups. Caller holds _spend_lock."""
+    global _spend_month, _spend_seeded_at
+    rows = _query_rollups(
+        "SELECT service, SUM(cost_usd) FROM usage_rollups WHERE day LIKE ? GROUP BY service",
+        (f"{month}-%",),
+    )
+    totals: dict[str, float] = defaultdict(float)
+    for service, cost in rows:
+        key = _BUDGET_KEYS.get(service)
+        if key:
+            totals[key] += cost or 0.0
+    _spend.clear()
+    _spend.update(totals)
+    _spend_month = month
+    _spend_seeded_at = time.monotonic()
+
+
+def _add_spend(service: str, cost: float) -> None:
+    key = _BUDGET_KEYS.get(service)
+    if not key or not cost:
+        return
+    with _spend_lock:
+        if _spend_month == datetime.now().strftime("%Y-%m"):
+            _spend[key] = _spend.get(key, 0.0) + cost
+
+
+def get_month_to_date_spend(service: str) -> float:
+    """Month-to-date USD for the budget that *service* counts against."""
+    key = _BUDGET_KEYS.get(service, service)
+    month = datetime.now().strftime("%Y-%m")
+    with _spend_lock:
+        if (
+            _spend_month != month
+            or time.monotonic() - _spend_seeded_at > _BUDGET_RESEED_SECONDS
+        ):
+            _seed_spend(month)
+        return _spend.get(key, 0.0)
+
+
+def check_budget(service: str, estimated_cost_usd: float = 0.0, tool: str = "") -> dict:
+    """Pre-flight check before a paid API call.
+
+    Returns ``{"service", "spent_usd", "budget_usd", "fraction", "exceeded",
+    "mode", "warning"}``. When the call would push the month over budget,
+    behaviour follows ``enforcement`` in api-budgets.json: ``"block"``
+    raises ``BudgetExceededError``, ``"warn"`` (default) allows the call and
+    sets ``warning`` to a message for the UI, ``"off"`` does nothing.
+    Tool pages show current warnings via ``get_budget_warnings``.
+    """
+    budgets = _budget_settings()
+    mode = budgets.get("enforcement", "warn")
+    key = _BUDGET_KEYS.get(service)
+    budget = float(budgets.get(key, 0.0)) if key else 0.0
+    if mode == "off" or not key or budget <= 0:
+        return {"service": service, "spent_usd": 0.0, "budget_usd": budget,
+                "fraction": 0.0, "exceeded": False, "mode": mode, "warning": ""}
+
+    spent = get_month_to_date_spend(service)
+    exceeded = spent + estimated_cost_usd > budget
+    status = {
+        "service": service,
+        "spent_usd": spent,
+        "budget_usd": budget,
+        "fraction": spent / budget,
+        "exceeded": exceeded,
+        "mode": mode,
+        "warning": "",
+    }
+    if exceeded:
+        msg = _budget_message(key, budget, spent)
+        if mode == "block":
+            raise BudgetExceededError(f"{msg}. Raise the budget in the Admin Panel to continue.")
+        status["warning"] = f"{msg}{f' — {tool}' if tool else ''}"
+    return status
+
+
+def _budget_message(key: str, budget: float, spent: float) -> str:
+    return (
+        f"Monthly {key.replace('_monthly_usd', '').title()} budget of ${budget:.2f} "
+        f"reached (${spent:.2f} spent this month)"
+    )
+
+
+def get_budget_warnings() -> list[str]:
+    """Messages for budgets already spent this month under ``"warn"`` enforcement.
+
+    ``theme.render_nav_bar`` shows them on every tool page.
+    """
+    budgets = _budget_settings()
+    if budgets.get("enforcement", "warn") != "warn":
+        return []
+    warnings = []
+    for key in dict.fromkeys(_BUDGET_KEYS.values()):
+        budget = float(budgets.get(key, 0.0))
+        spent = get_month_to_date_spend(key)
+        if budget > 0 and spent >= budget:
+            warnings.append(_budget_message(key, budget, spent))
+    return warnings
 
 
 def load_budgets() -> dict:
@@ -60,10 +710,29 @@ def save_budgets(budgets: dict) -> None:
     _BUDGETS_FILE.write_text(json.dumps(budgets, indent=2))
 
 
-def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
-    """Estimate USD cost for a Claude API call."""
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    batch: bool = False,
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
+) -> float:
+    """Estimate USD cost for a Claude API call.
+
+    *input_tokens* are the uncached input tokens (as the API reports them);
+    prompt-cache writes and reads are priced separately at
+    CACHE_WRITE_MULTIPLIER / CACHE_READ_MULTIPLIER × the input price.
+    *batch* applies the Message Batches discount (half the normal price).
+    """
     prices = PRICING.get(model, PRICING["claude-sonnet-4-5-20250929"])
-    return (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+    input_equiv = (
+        input_tokens
+        + cache_write_tokens * CACHE_WRITE_MULTIPLIER
+        + cache_read_tokens * CACHE_READ_MULTIPLIER
+    )
+    cost = (input_equiv * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
 
 
 def log_api_call(
@@ -76,10 +745,14 @@ def log_api_call(
     output_tokens: int = 0,
     estimated_cost_usd: float = 0.0,
     details: str = "",
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
 ) -> None:
-    """Log a single API call."""
-    entries = _load_entries()
-    entries.append({
+    """Queue a single API call for logging (written by the background writer).
+
+    The prompt-cache token counts are only stored when non-zero.
+    """
+    entry = {
         "timestamp": datetime.now().isoformat(timespec="seconds"),
         "service": service,
         "tool": tool,
@@ -89,19 +762,19 @@ def log_api_call(
         "output_tokens": output_tokens,
         "estimated_cost_usd": round(estimated_cost_usd, 6),
         "details": details,
-    })
-    _save_entries(entries)
+    }
+    if cache_write_tokens:
+        entry["cache_write_tokens"] = cache_write_tokens
+    if cache_read_tokens:
+        entry["cache_read_tokens"] = cache_read_tokens
+    _writer.submit(entry)
+    _add_spend(service, estimated_cost_usd)
 
 
 def get_entries_since(days: int = 30) -> list[dict]:
     """Return entries from the last N days, newest first."""
     cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    entries = _load_entries()
-    return sorted(
-        [e for e in entries if e.get("timestamp", "") >= cutoff],
-        key=lambda e: e["timestamp"],
-        reverse=True,
-    )
+    return sorted(_load_entries(since=cutoff), key=lambda e: e["timestamp"], reverse=True)
 
 
 def get_month_entries(year: int | None = None, month: int | None = None) -> list[dict]:
@@ -110,52 +783,164 @@ def get_month_entries(year: int | None = None, month: int | None = None) -> list
     y = year or now.year
     m = month or now.month
     prefix = f"{y}-{m:02d}"
-    return [e for e in _load_entries() if e.get("timestamp", "").startswith(prefix)]
+    return [e for e in _load_entries(since=prefix) if e.get("timestamp", "").startswith(prefix)]
 
 
 def get_monthly_summary() -> dict:
-    """Aggregate current month's usage by service."""
-    entries = get_month_entries()
+    """Aggregate current month's usage by service (from rollups)."""
+    rows = _query_rollups(
+        "SELECT service, SUM(calls), SUM(input_tokens), SUM(output_tokens), SUM(cost_usd), "
+        "SUM(cache_write_tokens), SUM(cache_read_tokens) "
+        "FROM usage_rollups WHERE day LIKE ? GROUP BY service",
+        (f"{datetime.now():%Y-%m}-%",),
+    )
     summary: dict = {
-        "anthropic": {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0},
+        "anthropic": {
+            "calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            "cache_write_tokens": 0, "cache_read_tokens": 0,
+        },
         "google_docs": {"calls": 0, "cost_usd": 0.0},
         "google_translate": {"calls": 0, "characters": 0, "cost_usd": 0.0},
     }
-    for e in entries:
-        svc = e.get("service", "")
+    for svc, calls, inp, out, cost, cache_write, cache_read in rows:
         if svc == "anthropic":
-            summary["anthropic"]["calls"] += 1
-            summary["anthropic"]["input_tokens"] += e.get("input_tokens", 0)
-            summary["anthropic"]["output_tokens"] += e.get("output_tokens", 0)
-            summary["anthropic"]["cost_usd"] += e.get("estimated_cost_usd", 0.0)
+            summary["anthropic"]["calls"] += calls
+            summary["anthropic"]["input_tokens"] += inp
+            summary["anthropic"]["output_tokens"] += out
+            summary["anthropic"]["cost_usd"] += cost
+            summary["anthropic"]["cache_write_tokens"] += cache_write
+            summary["anthropic"]["cache_read_tokens"] += cache_read
         elif svc == "google_docs":
-            summary["google_docs"]["calls"] += 1
+            summary["google_docs"]["calls"] += calls
         elif svc == "google_translate":
-            summary["google_translate"]["calls"] += 1
-            summary["google_translate"]["characters"] += e.get("input_tokens", 0)
-            summary["google_translate"]["cost_usd"] += e.get("estimated_cost_usd", 0.0)
+            summary["google_translate"]["calls"] += calls
+            summary["google_translate"]["characters"] += inp
+            summary["google_translate"]["cost_usd"] += cost
     return summary
 
 
 def get_per_tool_breakdown() -> list[dict]:
-    """Return current month's usage grouped by tool."""
-    entries = get_month_entries()
-    tools: dict[str, dict] = defaultdict(lambda: {"calls": 0, "tokens": 0, "cost_usd": 0.0})
-    for e in entries:
-        tool = e.get("tool", "unknown")
-        tools[tool]["calls"] += 1
-        tools[tool]["tokens"] += e.get("input_tokens", 0) + e.get("output_tokens", 0)
-        tools[tool]["cost_usd"] += e.get("estimated_cost_usd", 0.0)
-    return [{"tool": k, **v} for k, v in sorted(tools.items(), key=lambda x: -x[1]["cost_usd"])]
+    """Return current month's usage grouped by tool (from rollups)."""
+    rows = _query_rollups(
+        "SELECT tool, SUM(calls), SUM(input_tokens + output_tokens), SUM(cost_usd) "
+        "FROM usage_rollups WHERE day LIKE ? GROUP BY tool ORDER BY MIN(rowid)",
+        (f"{datetime.now():%Y-%m}-%",),
+    )
+    tools = [{"tool": t, "calls": c, "tokens": tok, "cost_usd": cost} for t, c, tok, cost in rows]
+    return sorted(tools, key=lambda r: -r["cost_usd"])
+
+
+def record_cache_lookup(tool: str, hit: bool, saved_usd: float = 0.0) -> None:
+    """Count a response-cache lookup for *tool*; a hit records what it saved.
+
+    Counted in memory and written by the background writer.
+    """
+    key = (datetime.now().strftime("%Y-%m-%d"), tool or "unknown")
+    _writer.add("cache_stats", key, int(hit), int(not hit), saved_usd if hit else 0.0)
+
+
+def get_cache_summary() -> dict:
+    """Current month's response-cache hits, misses and savings, overall and per tool."""
+    rows = _query_rollups(
+        "SELECT tool, SUM(hits), SUM(misses), SUM(saved_usd) FROM cache_stats "
+        "WHERE day LIKE ? GROUP BY tool ORDER BY SUM(saved_usd) DESC, tool",
+        (f"{datetime.now():%Y-%m}-%",),
+    )
+    tools = [{"tool": t, "hits": h, "misses": m, "saved_usd": s} for t, h, m, s in rows]
+    hits = sum(r["hits"] for r in tools)
+    misses = sum(r["misses"] for r in tools)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "saved_usd": sum(r["saved_usd"] for r in tools),
+        "tools": tools,
+    }
 
 
 def get_daily_breakdown(days: int = 30) -> list[dict]:
-    """Return per-day totals for the last N days."""
-    entries = get_entries_since(days)
+    """Return per-day totals for the last N days.
+
+    Whole days come from rollups; only the partial first day (the cutoff
+    falls mid-day) is summed from its raw day file.
+    """
+    flush()  # queued entries must reach the day file before it is read
+    migrate_legacy_usage_file()
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    cutoff_day = cutoff[:10]
     by_day: dict[str, dict] = defaultdict(lambda: {"calls": 0, "cost_usd": 0.0, "tokens": 0})
-    for e in entries:
-        day = e.get("timestamp", "")[:10]
-        by_day[day]["calls"] += 1
-        by_day[day]["cost_usd"] += e.get("estimated_cost_usd", 0.0)
-        by_day[day]["tokens"] += e.get("input_tokens", 0) + e.get("output_tokens", 0)
+    for e in _read_partition(_partition_path(cutoff_day)):
+        if e.get("timestamp", "") >= cutoff:
+            by_day[cutoff_day]["calls"] += 1
+            by_day[cutoff_day]["cost_usd"] += e.get("estimated_cost_usd", 0.0)
+            by_day[cutoff_day]["tokens"] += e.get("input_tokens", 0) + e.get("output_tokens", 0)
+    rows = _query_rollups(
+        "SELECT day, SUM(calls), SUM(cost_usd), SUM(input_tokens + output_tokens) "
+        "FROM usage_rollups WHERE day > ? GROUP BY day",
+        (cutoff_day,),
+    )
+    for day, calls, cost, tokens in rows:
+        by_day[day] = {"calls": calls, "cost_usd": cost, "tokens": tokens}
     return [{"date": k, **v} for k, v in sorted(by_day.items())]
+
+
+# ── Salesforce API calls ─────────────────────────────────────────────────
+
+
+def record_salesforce_call(tool: str, operation: str) -> None:
+    """Count one Salesforce REST call made on behalf of *tool* (written by the background writer)."""
+    key = (datetime.now().strftime("%Y-%m-%d"), tool or "unknown", operation or "other")
+    _writer.add("sf_calls", key, 1)
+
+
+def record_api_limit(service: str, used: int, limit: int) -> None:
+    """Store the latest API usage/limit figures a service reported."""
+    try:
+        _rollup_conn().execute(
+            "INSERT OR REPLACE INTO api_limits (service, used, max, checked_at) "
+            "VALUES (?, ?, ?, ?)",
+            (service, used, limit, time.time()),
+        )
+    except sqlite3.Error:
+        pass
+
+
+def get_api_limit(service: str) -> dict | None:
+    """Return ``{"used", "limit", "fraction", "checked_at"}`` last recorded, or None."""
+    try:
+        row = _rollup_conn().execute(
+            "SELECT used, max, checked_at FROM api_limits WHERE service = ?", (service,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    used, limit, checked_at = row
+    return {
+        "used": used,
+        "limit": limit,
+        "fraction": used / limit if limit else 0.0,
+        "checked_at": checked_at,
+    }
+
+
+def get_salesforce_summary() -> dict:
+    """Salesforce calls today and this month, overall and per tool (busiest first)."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    rows = _query_rollups(
+        "SELECT tool, SUM(calls), SUM(CASE WHEN day = ? THEN calls ELSE 0 END) "
+        "FROM sf_calls WHERE day LIKE ? GROUP BY tool ORDER BY SUM(calls) DESC, tool",
+        (today, f"{datetime.now():%Y-%m}-%"),
+    )
+    operations = _query_rollups(
+        "SELECT operation, SUM(calls) FROM sf_calls WHERE day = ? "
+        "GROUP BY operation ORDER BY SUM(calls) DESC",
+        (today,),
+    )
+    tools = [{"tool": t, "month": m, "today": d} for t, m, d in rows]
+    return {
+        "today": sum(r["today"] for r in tools),
+        "month": sum(r["month"] for r in tools),
+        "tools": tools,
+        "operations_today": dict(operations),
+    }
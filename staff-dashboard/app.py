@@ -10,7 +10,12 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 _sf_available = True
 try:
-    from shared.salesforce_client import get_client, load_active_client, save_active_client
+    from shared.salesforce_client import (
+        get_client_snapshot,
+        load_active_client,
+        save_active_client,
+        search_clients,
+    )
 except Exception:
     _sf_available = False
     import json as _json
@@ -19,7 +24,8 @@ except Exception:
         try: return _json.loads(_FB.read_text()) if _FB.exists() else None
         except Exception: return None
     def save_active_client(r): pass
-    def get_client(c): return None
+    def get_client_snapshot(c, refresh=False): return None
+    def search_clients(q, limit=10): return []
 
 try:
     from shared.feedback_button import render_feedback_button
@@ -339,7 +345,7 @@ with _cl_center:
         customer_id = st.text_input(
             "Client #",
             key="inp_customer_id",
-            placeholder="Enter client number",
+            placeholder="Client #, name or A-number",
             label_visibility="collapsed",
         )
     with cl_cols[1]:
@@ -354,9 +360,28 @@ with _cl_center:
                 use_container_width=True,
             )
 
+    # Name / A-number lookups are answered from the local Salesforce mirror
+    _query = customer_id.strip()
+    if _query and _sf_available and not _query.isdigit():
+        try:
+            _matches = search_clients(_query, limit=8)
+        except Exception:
+            _matches = []
+        if not _matches:
+            st.caption("No matching clients in the local directory.")
+        for _m in _matches:
+            _label = f"{_m.get('Name', '')} — #{_m.get('Customer_ID__c', '')}"
+            if _m.get("A_Number__c"):
+                _label += f" · A# {_m['A_Number__c']}"
+            if st.button(_label, key=f"_client_match_{_m.get('Id', '')}", use_container_width=True):
+                customer_id = str(_m.get("Customer_ID__c", ""))
+                sf_pull = True
+
     if sf_pull and customer_id and _sf_available:
         try:
-            record = get_client(customer_id.strip())
+            # Contact, cases and tasks in a single Composite round trip
+            snapshot = get_client_snapshot(customer_id.strip(), refresh=True)
+            record = snapshot["client"] if snapshot else None
             if record:
                 st.session_state.sf_client = record
                 st.session_state.sf_customer_id = customer_id.strip()
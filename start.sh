@@ -51,6 +51,11 @@ start_app "Country Reports API    :8000" \
     "$BASE/country-reports-tool" \
     "uv run uvicorn app.api:app --port 8000"
 
+# --- Salesforce gateway (one shared SF session; tools fall back to direct mode without it) ---
+start_app "Salesforce gateway" \
+    "$BASE/country-reports-tool" \
+    "uv run python $BASE/shared/sf_gateway.py"
+
 sleep 1
 
 # --- Staff Dashboard Hub ---
@@ -120,6 +125,13 @@ start_app "Document Assembler     :8515" \
     "$BASE/evidence-indexer" \
     "uv run streamlit run app/assembler.py --server.port 8515 --server.headless true"
 
+# --- Background jobs ---
+echo ""
+echo -e "${BOLD}Starting background jobs...${RESET}"
+start_app "Salesforce mirror sync (every 5 min)" \
+    "$BASE/country-reports-tool" \
+    "uv run python $BASE/shared/sf_mirror.py --loop 300"
+
 # --- Summary ---
 echo ""
 echo "================================================"
@@ -30,6 +30,10 @@ done
 # Also kill any straggler uv run processes for our project
 pkill -f "uv run.*my-new-website" 2>/dev/null
 
+# Background jobs (not bound to a port)
+pkill -f "my-new-website/shared/sf_mirror.py" 2>/dev/null
+pkill -f "my-new-website/shared/sf_gateway.py" 2>/dev/null
+
 # Wait and retry if anything survived
 for attempt in 1 2 3; do
     sleep 1
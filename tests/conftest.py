@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -50,3 +51,23 @@ def sample_client_record():
         "Marital_status__c": "Married",
         "CaseNumber__c": "A-12345",
     }
+
+
+@pytest.fixture()
+def claude_replay():
+    """Answer Claude calls from recorded fixtures instead of the live API.
+
+    Replays from tests/fixtures/claude/ (or CLAUDE_REPLAY_DIR) with no
+    simulated latency; tests can set ``harness.latency`` or
+    ``harness.fixture_dir``. Run with CLAUDE_REPLAY=record and a real key
+    in .env to capture fresh fixtures.
+    """
+    from shared import claude_replay as replay
+
+    mode = os.environ.get("CLAUDE_REPLAY", "replay")
+    if mode == "record":
+        harness = replay.enable("record", os.environ.get("CLAUDE_REPLAY_DIR") or None)
+    else:
+        harness = replay.enable("replay", os.environ.get("CLAUDE_REPLAY_DIR") or None, latency=0.0)
+    yield harness
+    replay.disable()
@@ -98,3 +98,22 @@ class TestNewAttorneyId:
     def test_uniqueness(self):
         ids = {attorney_mod.new_attorney_id() for _ in range(100)}
         assert len(ids) == 100
+
+
+# ── SQLite config backend ────────────────────────────────────────────────
+
+
+class TestSqliteBackend:
+    def test_round_trip_through_config_store(self, tmp_path, monkeypatch):
+        import shared.config_store as config_mod
+
+        monkeypatch.setenv("CONFIG_BACKEND", "sqlite")
+        monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path / "config")
+        try:
+            attorney_mod.save_attorneys([{"id": "a1", "name": "Jane"}])
+            assert attorney_mod.load_attorneys() == [{"id": "a1", "name": "Jane"}]
+            assert not attorney_mod.ATTORNEYS_FILE.exists()
+        finally:
+            config_mod._sqlite_db.close()
+            config_mod._sqlite_db = None
+            config_mod.clear_cache()
@@ -0,0 +1,102 @@
+"""Tests for shared/chunker.py — token estimates and budgeted batch packing."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from shared.chunker import estimate_tokens, pack, total_cost
+from shared.usage_tracker import estimate_cost
+
+
+class TestEstimateTokens:
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_latin_about_four_chars_per_token(self):
+        assert estimate_tokens("a" * 400) == 100
+
+    def test_cjk_one_token_per_char(self):
+        assert estimate_tokens("日本語" * 100) == 300
+
+    def test_cjk_denser_than_latin_of_same_length(self):
+        assert estimate_tokens("中" * 200) > estimate_tokens("x" * 200) * 3
+
+    def test_other_scripts_in_between(self):
+        cyrillic = estimate_tokens("д" * 200)
+        assert estimate_tokens("x" * 200) < cyrillic < estimate_tokens("中" * 200)
+
+
+class TestPack:
+    def test_never_splits_and_keeps_order(self):
+        items = [f"paragraph {i} " + "word " * 50 for i in range(30)]
+        chunks = pack(items, max_input_tokens=1000, max_output_tokens=10_000, item_overhead_tokens=0)
+        assert [p for c in chunks for p in c.items] == items
+        assert len(chunks) > 1
+        for c in chunks:
+            assert c.input_tokens <= 1000
+            assert items[c.start:c.end] == c.items
+
+    def test_output_budget_limits_batches(self):
+        items = ["x" * 400] * 10  # 100 tokens each
+        by_input = pack(items, max_input_tokens=10_000, max_output_tokens=10_000,
+                        item_overhead_tokens=0)
+        by_output = pack(items, max_input_tokens=10_000, max_output_tokens=300,
+                         output_ratio=1.0, item_overhead_tokens=0)
+        assert len(by_input) == 1
+        assert [len(c.items) for c in by_output] == [3, 3, 3, 1]
+        assert all(c.output_tokens <= 300 for c in by_output)
+
+    def test_dense_text_gets_smaller_batches(self):
+        latin = ["x" * 800] * 20
+        cjk = ["中" * 800] * 20
+        kwargs = dict(max_input_tokens=4000, max_output_tokens=100_000)
+        assert len(pack(cjk, **kwargs)) > len(pack(latin, **kwargs))
+
+    def test_prompt_tokens_count_against_input_budget(self):
+        items = ["x" * 400] * 4
+        without = pack(items, max_input_tokens=450, max_output_tokens=10_000, item_overhead_tokens=0)
+        with_prompt = pack(items, max_input_tokens=450, max_output_tokens=10_000,
+                           prompt_tokens=200, item_overhead_tokens=0)
+        assert [len(c.items) for c in without] == [4]
+        assert [len(c.items) for c in with_prompt] == [2, 2]
+        assert with_prompt[0].input_tokens == 400
+
+    def test_oversized_item_gets_own_chunk(self):
+        items = ["short", "x" * 8000, "short"]
+        chunks = pack(items, max_input_tokens=500, max_output_tokens=10_000)
+        assert [c.items for c in chunks] == [["short"], ["x" * 8000], ["short"]]
+        assert [c.oversized for c in chunks] == [False, True, False]
+
+    def test_cost_estimated_per_chunk(self):
+        chunks = pack(["x" * 4000], max_input_tokens=10_000, max_output_tokens=10_000,
+                      output_ratio=0.5, prompt_tokens=100, item_overhead_tokens=0)
+        chunk = chunks[0]
+        assert chunk.input_tokens == 1100
+        assert chunk.output_tokens == 500
+        assert chunk.estimated_cost_usd == pytest.approx(
+            estimate_cost("claude-sonnet-4-5-20250929", 1100, 500)
+        )
+        assert total_cost(chunks) == pytest.approx(chunk.estimated_cost_usd)
+
+    def test_cost_uses_routed_model(self):
+        route = {"model": "auto", "small_below_tokens": 1000}
+        with patch("shared.claude_client._route_for", return_value=route) as route_for:
+            chunks = pack(["x" * 400, "y" * 8000], max_input_tokens=1500,
+                          max_output_tokens=10_000, item_overhead_tokens=0,
+                          tool_name="document-assembler", operation="translate")
+        route_for.assert_called_with("document-assembler", "translate")
+        assert [c.model for c in chunks] == ["claude-haiku-4-5-20251001",
+                                             "claude-sonnet-4-5-20250929"]
+        assert chunks[0].estimated_cost_usd == pytest.approx(
+            estimate_cost("claude-haiku-4-5-20251001", 100, 100)
+        )
+
+    def test_explicit_model(self):
+        chunks = pack(["x" * 400], max_input_tokens=1000, max_output_tokens=1000,
+                      item_overhead_tokens=0, model="claude-haiku-4-5-20251001")
+        assert chunks[0].model == "claude-haiku-4-5-20251001"
+
+    def test_empty_input(self):
+        assert pack([], max_input_tokens=100, max_output_tokens=100) == []
@@ -0,0 +1,448 @@
+"""Tests for shared/claude_client.py — client reuse and request plumbing.
+
+The Anthropic SDK and python-dotenv are replaced with small fakes in
+sys.modules so no network calls or real credentials are involved.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import shared.claude_client as cc_mod
+import shared.response_cache as rc_mod
+from shared.usage_tracker import estimate_cost
+
+
+def _parse_env(path) -> dict:
+    env = {}
+    for line in Path(path).read_text().splitlines():
+        if "=" in line:
+            k, v = line.split("=", 1)
+            env[k.strip()] = v.strip()
+    return env
+
+
+class _FakeAnthropic:
+    instances: list["_FakeAnthropic"] = []
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.max_retries = 2
+        self.messages = MagicMock()
+        reply = MagicMock()
+        reply.content = [MagicMock(text="drafted text")]
+        reply.usage.input_tokens = 100
+        reply.usage.output_tokens = 20
+        self.messages.create.return_value = reply
+        self.messages.stream.side_effect = lambda **kw: _FakeStream(["Dear ", "Officer", ","], reply)
+        self.messages.batches = _FakeBatchEndpoint()
+        _FakeAnthropic.instances.append(self)
+
+    def with_options(self, max_retries: int):
+        copy = types.SimpleNamespace(**vars(self))
+        copy.max_retries = max_retries
+        return copy
+
+
+class _FakeBatchEndpoint:
+    """In-memory stand-in for the Message Batches API (messages.batches)."""
+
+    def __init__(self) -> None:
+        self.batches: dict[str, dict] = {}
+
+    def _view(self, batch_id: str):
+        b = self.batches[batch_id]
+        done = b["status"] == "ended"
+        counts = types.SimpleNamespace(
+            processing=0 if done else len(b["requests"]),
+            succeeded=len(b["requests"]) - len(b["fail"]) if done else 0,
+            errored=len(b["fail"]) if done else 0,
+            canceled=0,
+            expired=0,
+        )
+        return types.SimpleNamespace(id=batch_id, processing_status=b["status"], request_counts=counts)
+
+    def create(self, requests):
+        batch_id = f"msgbatch_{len(self.batches) + 1}"
+        self.batches[batch_id] = {"requests": requests, "status": "in_progress", "fail": set()}
+        return self._view(batch_id)
+
+    def retrieve(self, batch_id):
+        return self._view(batch_id)
+
+    def finish(self, batch_id, fail=()):
+        self.batches[batch_id]["status"] = "ended"
+        self.batches[batch_id]["fail"] = set(fail)
+
+    def results(self, batch_id):
+        b = self.batches[batch_id]
+        # The real API returns results in no particular order
+        for req in reversed(b["requests"]):
+            cid = req["custom_id"]
+            if cid in b["fail"]:
+                yield types.SimpleNamespace(custom_id=cid, result=types.SimpleNamespace(type="errored"))
+                continue
+            text = "echo: " + req["params"]["messages"][0]["content"]
+            message = types.SimpleNamespace(
+                content=[types.SimpleNamespace(text=text)],
+                usage=types.SimpleNamespace(input_tokens=1000, output_tokens=100),
+            )
+            yield types.SimpleNamespace(
+                custom_id=cid, result=types.SimpleNamespace(type="succeeded", message=message)
+            )
+
+
+class _FakeStream:
+    """Stand-in for the SDK's MessageStream context manager."""
+
+    def __init__(self, chunks: list[str], final) -> None:
+        self.chunks = chunks
+        self.final = final
+        self.exited = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.exited = True
+        return False
+
+    @property
+    def text_stream(self):
+        yield from self.chunks
+
+    def get_final_message(self):
+        return self.final
+
+    @property
+    def current_message_snapshot(self):
+        return self.final
+
+
+@pytest.fixture()
+def fake_sdk(tmp_path, monkeypatch):
+    """Point the client at a temp .env and install fake SDK modules."""
+    env_path = tmp_path / ".env"
+    env_path.write_text("ANTHROPIC_API_KEY=key-one\n")
+    dotenv_calls = []
+
+    def dotenv_values(path):
+        dotenv_calls.append(path)
+        return _parse_env(path)
+
+    monkeypatch.setitem(sys.modules, "dotenv", types.SimpleNamespace(dotenv_values=dotenv_values))
+    monkeypatch.setitem(sys.modules, "anthropic", types.SimpleNamespace(Anthropic=_FakeAnthropic))
+    monkeypatch.setattr(cc_mod, "_ENV_PATH", env_path)
+    _FakeAnthropic.instances = []
+    cc_mod.reset_client()
+    cache_settings = {"tools": {}, "ttl_hours": 72.0, "max_mb": 100.0}
+    routing: dict = {}
+    with patch("shared.usage_tracker.check_budget"), \
+         patch("shared.config_store.load_config",
+               lambda name: routing if name == "model-routing" else None), \
+         patch("shared.usage_tracker.log_api_call") as log_call, \
+         patch("shared.usage_tracker.record_cache_lookup") as cache_lookup, \
+         patch.object(rc_mod, "_CACHE_DIR", tmp_path / "response-cache"), \
+         patch.object(cc_mod, "_BATCH_DIR", tmp_path / "claude-batches"), \
+         patch.object(rc_mod, "load_settings", lambda: cache_settings):
+        yield types.SimpleNamespace(
+            env_path=env_path,
+            dotenv_calls=dotenv_calls,
+            log_call=log_call,
+            cache_lookup=cache_lookup,
+            cache_settings=cache_settings,
+            routing=routing,
+        )
+    cc_mod.reset_client()
+
+
+def _touch_env(path: Path, text: str) -> None:
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestGetClient:
+    def test_reuses_one_client(self, fake_sdk):
+        first = cc_mod.get_client()
+        second = cc_mod.get_client()
+        assert first is second
+        assert len(_FakeAnthropic.instances) == 1
+        assert len(fake_sdk.dotenv_calls) == 1
+
+    def test_reloads_when_env_changes(self, fake_sdk):
+        first = cc_mod.get_client()
+        _touch_env(fake_sdk.env_path, "ANTHROPIC_API_KEY=key-two\n")
+        second = cc_mod.get_client()
+        assert second is not first
+        assert second.api_key == "key-two"
+
+    def test_env_rewrite_with_same_key_keeps_client(self, fake_sdk):
+        first = cc_mod.get_client()
+        _touch_env(fake_sdk.env_path, "ANTHROPIC_API_KEY=key-one\nOTHER=x\n")
+        assert cc_mod.get_client() is first
+        assert len(fake_sdk.dotenv_calls) == 2
+
+    def test_missing_key_raises(self, fake_sdk):
+        _touch_env(fake_sdk.env_path, "OTHER=x\n")
+        with pytest.raises(RuntimeError, match="ANTHROPIC_API_KEY"):
+            cc_mod.get_client()
+
+    def test_missing_env_file_raises(self, fake_sdk):
+        fake_sdk.env_path.unlink()
+        with pytest.raises(RuntimeError, match="ANTHROPIC_API_KEY"):
+            cc_mod.get_client()
+
+    def test_executor_calls_skip_sdk_retries(self, fake_sdk):
+        from shared.claude_executor import run_batches
+
+        seen = run_batches(lambda _item: cc_mod.get_client(), [1, 2, 3])
+        assert {c.max_retries for c in seen} == {0}
+        assert len({id(c) for c in seen}) == 1  # one copy, reused
+        assert cc_mod.get_client().max_retries == 2
+        assert len(_FakeAnthropic.instances) == 1
+
+
+class TestDraftAndChat:
+    def test_draft_uses_shared_client(self, fake_sdk):
+        assert cc_mod.draft_with_claude("sys", "hello", tool_name="t") == "drafted text"
+        assert cc_mod.draft_with_claude("sys", "again", tool_name="t") == "drafted text"
+        assert len(_FakeAnthropic.instances) == 1
+        create = _FakeAnthropic.instances[0].messages.create
+        assert create.call_count == 2
+        assert create.call_args.kwargs["messages"] == [{"role": "user", "content": "again"}]
+
+    def test_chat_sends_full_history_and_logs(self, fake_sdk):
+        history = [
+            {"role": "user", "content": "q1"},
+            {"role": "assistant", "content": "a1"},
+            {"role": "user", "content": "q2"},
+        ]
+        cc_mod.chat_with_claude("sys", history, max_tokens=2048,
+                                tool_name="hearing-prep", operation="evaluate")
+        kwargs = _FakeAnthropic.instances[0].messages.create.call_args.kwargs
+        assert kwargs["messages"] == history
+        assert kwargs["max_tokens"] == 2048
+        logged = fake_sdk.log_call.call_args.kwargs
+        assert logged["tool"] == "hearing-prep"
+        assert logged["operation"] == "evaluate"
+        assert logged["input_tokens"] == 100
+
+
+class TestResponseCache:
+    def _calls(self):
+        return sum(c.messages.create.call_count for c in _FakeAnthropic.instances)
+
+    def test_disabled_tool_always_calls_api(self, fake_sdk):
+        cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        assert self._calls() == 2
+        fake_sdk.cache_lookup.assert_not_called()
+
+    def test_enabled_tool_hits_cache(self, fake_sdk):
+        fake_sdk.cache_settings["tools"]["brief-builder"] = True
+        first = cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        second = cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        assert first == second == "drafted text"
+        assert self._calls() == 1
+        hits = [c.kwargs["hit"] for c in fake_sdk.cache_lookup.call_args_list]
+        assert hits == [False, True]
+        assert fake_sdk.cache_lookup.call_args.kwargs["saved_usd"] > 0
+
+    def test_different_message_misses(self, fake_sdk):
+        fake_sdk.cache_settings["tools"]["brief-builder"] = True
+        cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        cc_mod.draft_with_claude("sys", "hello!", tool_name="brief-builder")
+        assert self._calls() == 2
+
+    def test_use_cache_false_bypasses_lookup(self, fake_sdk):
+        fake_sdk.cache_settings["tools"]["brief-builder"] = True
+        cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder")
+        cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder", use_cache=False)
+        assert self._calls() == 2
+
+
+class TestStreaming:
+    def test_yields_deltas_and_logs_usage_at_end(self, fake_sdk):
+        chunks = []
+        for chunk in cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder"):
+            chunks.append(chunk)
+            assert fake_sdk.log_call.call_count == 0  # usage only known at the end
+        assert chunks == ["Dear ", "Officer", ","]
+        assert fake_sdk.log_call.call_count == 1
+        assert fake_sdk.log_call.call_args.kwargs["output_tokens"] == 20
+
+    def test_abandoned_stream_still_logs_usage(self, fake_sdk):
+        gen = cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder")
+        assert next(gen) == "Dear "
+        gen.close()
+        assert fake_sdk.log_call.call_count == 1
+
+    def test_completed_stream_fills_cache(self, fake_sdk):
+        fake_sdk.cache_settings["tools"]["brief-builder"] = True
+        streamed = "".join(cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder"))
+        again = list(cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder"))
+        assert again == [streamed]
+        assert _FakeAnthropic.instances[0].messages.stream.call_count == 1
+        # the blocking call shares the same cache entry
+        assert cc_mod.draft_with_claude("sys", "hello", tool_name="brief-builder") == streamed
+
+    def test_abandoned_stream_is_not_cached(self, fake_sdk):
+        fake_sdk.cache_settings["tools"]["brief-builder"] = True
+        gen = cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder")
+        next(gen)
+        gen.close()
+        list(cc_mod.stream_with_claude("sys", "hello", tool_name="brief-builder"))
+        assert _FakeAnthropic.instances[0].messages.stream.call_count == 2
+
+
+class TestMessageBatches:
+    def _requests(self, *messages):
+        return [{"system_prompt": "sys", "user_message": m} for m in messages]
+
+    def test_submit_persists_record(self, fake_sdk):
+        batch_id = cc_mod.submit_batch(self._requests("a", "b"), tool_name="timeline-builder",
+                                       label="Client folder", context={"doc_names": ["x", "y"]})
+        record = cc_mod.load_batch(batch_id)
+        assert record["status"] == "in_progress"
+        assert record["request_count"] == 2
+        assert record["context"] == {"doc_names": ["x", "y"]}
+        assert [r["id"] for r in cc_mod.list_batches("timeline-builder")] == [batch_id]
+        assert cc_mod.list_batches("brief-builder") == []
+
+    def test_collect_before_end_raises(self, fake_sdk):
+        batch_id = cc_mod.submit_batch(self._requests("a"))
+        with pytest.raises(RuntimeError, match="in_progress"):
+            cc_mod.collect_batch(batch_id)
+
+    def test_collect_returns_results_in_submission_order(self, fake_sdk):
+        batch_id = cc_mod.submit_batch(self._requests("a", "b", "c"), tool_name="t")
+        _FakeAnthropic.instances[0].messages.batches.finish(batch_id, fail={"req-1"})
+        assert cc_mod.poll_batch(batch_id)["counts"]["errored"] == 1
+        assert cc_mod.collect_batch(batch_id) == ["echo: a", None, "echo: c"]
+
+    def test_usage_logged_once_at_batch_price(self, fake_sdk):
+        batch_id = cc_mod.submit_batch(self._requests("a", "b"), tool_name="t")
+        _FakeAnthropic.instances[0].messages.batches.finish(batch_id)
+        first = cc_mod.collect_batch(batch_id)
+        second = cc_mod.collect_batch(batch_id)
+        assert first == second
+        assert fake_sdk.log_call.call_count == 2
+        logged = fake_sdk.log_call.call_args.kwargs
+        assert logged["operation"] == "batch"
+        assert logged["estimated_cost_usd"] == pytest.approx(
+            estimate_cost(cc_mod._MODEL, 1000, 100) / 2
+        )
+
+    def test_forget_removes_record(self, fake_sdk):
+        batch_id = cc_mod.submit_batch(self._requests("a"))
+        cc_mod.forget_batch(batch_id)
+        assert cc_mod.load_batch(batch_id) is None
+
+    def test_empty_batch_rejected(self, fake_sdk):
+        with pytest.raises(ValueError):
+            cc_mod.submit_batch([])
+
+
+class TestPromptCaching:
+    def test_off_by_default(self, fake_sdk):
+        cc_mod.draft_with_claude("sys", "hello", tool_name="t")
+        kwargs = _FakeAnthropic.instances[0].messages.create.call_args.kwargs
+        assert kwargs["system"] == "sys"
+
+    def test_draft_marks_only_system_prompt(self, fake_sdk):
+        cc_mod.draft_with_claude("sys", "hello", tool_name="t", cache_prompt=True)
+        kwargs = _FakeAnthropic.instances[0].messages.create.call_args.kwargs
+        assert kwargs["system"] == [
+            {"type": "text", "text": "sys", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert kwargs["messages"] == [{"role": "user", "content": "hello"}]
+
+    def test_chat_marks_end_of_conversation(self, fake_sdk):
+        history = [
+            {"role": "user", "content": "q1"},
+            {"role": "assistant", "content": "a1"},
+            {"role": "user", "content": "q2"},
+        ]
+        cc_mod.chat_with_claude("sys", history, cache_prompt=True)
+        sent = _FakeAnthropic.instances[0].messages.create.call_args.kwargs["messages"]
+        assert sent[:2] == history[:2]
+        assert sent[2]["content"] == [
+            {"type": "text", "text": "q2", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert history[2]["content"] == "q2"  # caller's list is not modified
+
+    def test_cache_tokens_logged_and_priced(self, fake_sdk):
+        client = cc_mod.get_client()
+        usage = client.messages.create.return_value.usage
+        usage.cache_creation_input_tokens = 0
+        usage.cache_read_input_tokens = 5000
+        cc_mod.chat_with_claude("sys", [{"role": "user", "content": "q"}], cache_prompt=True)
+        logged = fake_sdk.log_call.call_args.kwargs
+        assert logged["cache_read_tokens"] == 5000
+        assert logged["cache_write_tokens"] == 0
+        assert logged["estimated_cost_usd"] == pytest.approx(
+            estimate_cost(cc_mod._MODEL, 100, 20, cache_read_tokens=5000)
+        )
+
+
+class TestModelRouting:
+    def test_sonnet_without_config(self, fake_sdk):
+        assert cc_mod.choose_model("t", "draft", input_tokens=10) == cc_mod._MODEL
+        cc_mod.draft_with_claude("sys", "hello", tool_name="t")
+        kwargs = _FakeAnthropic.instances[0].messages.create.call_args.kwargs
+        assert kwargs["model"] == cc_mod._MODEL
+
+    def test_tier_wins_over_config(self, fake_sdk):
+        fake_sdk.routing["default"] = {"model": "haiku"}
+        assert cc_mod.choose_model("t", tier="best") == cc_mod._MODEL
+        assert cc_mod.choose_model("t", tier="fast") == cc_mod._SMALL_MODEL
+
+    def test_operation_route_overrides_tool_route(self, fake_sdk):
+        fake_sdk.routing["routes"] = {
+            "t": {"model": "haiku"},
+            "t:evaluate": {"model": "sonnet"},
+        }
+        assert cc_mod.choose_model("t", "draft") == cc_mod._SMALL_MODEL
+        assert cc_mod.choose_model("t", "evaluate") == cc_mod._MODEL
+        assert cc_mod.choose_model("other", "draft") == cc_mod._MODEL
+
+    def test_auto_routes_by_input_size(self, fake_sdk):
+        fake_sdk.routing["routes"] = {"t": {"model": "auto", "small_below_tokens": 500}}
+        cc_mod.draft_with_claude("sys", "short", tool_name="t")
+        cc_mod.draft_with_claude("sys", "x" * 4000, tool_name="t")
+        calls = _FakeAnthropic.instances[0].messages.create.call_args_list
+        assert [c.kwargs["model"] for c in calls] == [cc_mod._SMALL_MODEL, cc_mod._MODEL]
+        assert fake_sdk.log_call.call_args_list[0].kwargs["model"] == cc_mod._SMALL_MODEL
+
+    def test_failed_validation_falls_back_to_sonnet(self, fake_sdk):
+        fake_sdk.routing["routes"] = {"t": {"model": "haiku"}}
+        text = cc_mod.draft_with_claude("sys", "hello", tool_name="t",
+                                        validate=lambda reply: reply.startswith("{"))
+        assert text == "drafted text"
+        calls = _FakeAnthropic.instances[0].messages.create.call_args_list
+        assert [c.kwargs["model"] for c in calls] == [cc_mod._SMALL_MODEL, cc_mod._MODEL]
+        retry = fake_sdk.log_call.call_args_list[1].kwargs
+        assert retry["details"] == f"fallback from {cc_mod._SMALL_MODEL}"
+
+    def test_valid_answer_is_kept(self, fake_sdk):
+        fake_sdk.routing["routes"] = {"t": {"model": "haiku"}}
+        cc_mod.draft_with_claude("sys", "hello", tool_name="t", validate=lambda reply: True)
+        assert _FakeAnthropic.instances[0].messages.create.call_count == 1
+
+    def test_batch_requests_are_routed(self, fake_sdk):
+        fake_sdk.routing["routes"] = {"t:extract": {"model": "haiku"}}
+        cc_mod.submit_batch([
+            {"system_prompt": "s", "user_message": "a", "operation": "extract"},
+            {"system_prompt": "s", "user_message": "b"},
+        ], tool_name="t")
+        batch = next(iter(_FakeAnthropic.instances[0].messages.batches.batches.values()))
+        assert [r["params"]["model"] for r in batch["requests"]] == [
+            cc_mod._SMALL_MODEL, cc_mod._MODEL,
+        ]
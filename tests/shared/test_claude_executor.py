@@ -0,0 +1,151 @@
+"""Tests for shared/claude_executor.py — concurrent, rate-limit-aware batches."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import shared.claude_executor as ex_mod
+
+
+class _ApiError(Exception):
+    """Mimics anthropic.APIStatusError: carries status_code and response headers."""
+
+    def __init__(self, status_code: int, retry_after: str | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = type("R", (), {"headers": headers})()
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep():
+    with patch.object(ex_mod.time, "sleep") as sleep:
+        yield sleep
+
+
+class TestRunBatches:
+    def test_preserves_order(self):
+        first_done = threading.Event()
+
+        def fn(n):
+            if n == 0:
+                first_done.wait(2)  # item 0 finishes last
+            elif n == 3:
+                first_done.set()
+            return n * 10
+
+        assert ex_mod.run_batches(fn, list(range(4))) == [0, 10, 20, 30]
+
+    def test_empty(self):
+        assert ex_mod.run_batches(lambda x: x, []) == []
+
+    def test_runs_concurrently_up_to_limit(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+        release = threading.Event()
+
+        def work(n):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+                if in_flight[1] >= 3:
+                    release.set()
+            release.wait(2)
+            with lock:
+                in_flight[0] -= 1
+            return n
+
+        ex_mod.run_batches(work, list(range(6)), max_workers=3)
+        assert in_flight[1] == 3
+
+    def test_progress_reported(self):
+        seen = []
+        ex_mod.run_batches(lambda x: x, [1, 2, 3], on_done=lambda d, t: seen.append((d, t)))
+        assert seen == [(1, 3), (2, 3), (3, 3)]
+
+
+class TestRetries:
+    def test_retries_throttled_then_succeeds(self, _no_sleep):
+        attempts = {"n": 0}
+
+        def flaky(x):
+            attempts["n"] += 1
+            if attempts["n"] < 3:
+                raise _ApiError(429)
+            return x
+
+        assert ex_mod.run_batches(flaky, ["a"]) == ["a"]
+        assert attempts["n"] == 3
+        assert _no_sleep.call_count == 2
+
+    def test_honours_retry_after(self, _no_sleep):
+        calls = iter([_ApiError(529, retry_after="7"), "ok"])
+
+        def fn(_):
+            result = next(calls)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert ex_mod.run_batches(fn, [0]) == ["ok"]
+        assert _no_sleep.call_args.args[0] >= 7
+
+    def test_non_retryable_error_raises_immediately(self, _no_sleep):
+        def bad(_):
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            ex_mod.run_batches(bad, [1])
+        _no_sleep.assert_not_called()
+
+    def test_gives_up_after_max_retries(self):
+        def always_overloaded(_):
+            raise _ApiError(529)
+
+        with pytest.raises(_ApiError):
+            ex_mod.run_batches(always_overloaded, [1], max_retries=2)
+
+    def test_return_exceptions_keeps_other_results(self):
+        def fn(x):
+            if x == 2:
+                raise ValueError("nope")
+            return x
+
+        results = ex_mod.run_batches(fn, [1, 2, 3], return_exceptions=True)
+        assert results[0] == 1 and results[2] == 3
+        assert isinstance(results[1], ValueError)
+
+    def test_backoff_is_jittered_and_capped(self):
+        exc = _ApiError(503)
+        delays = {ex_mod._backoff(10, exc) for _ in range(20)}
+        assert len(delays) > 1
+        assert max(delays) <= ex_mod._MAX_DELAY
+
+
+class TestAdaptiveLimit:
+    def test_throttle_halves_and_successes_recover(self):
+        limit = ex_mod._AdaptiveLimit(8)
+        limit.acquire()
+        limit.release(throttled=True)
+        assert limit.limit == 4
+        for _ in range(4):
+            limit.acquire()
+            limit.release()
+        assert limit.limit == 5
+
+    def test_never_below_one(self):
+        limit = ex_mod._AdaptiveLimit(2)
+        for _ in range(3):
+            limit.acquire()
+            limit.release(throttled=True)
+        assert limit.limit == 1
+
+    def test_classify(self):
+        assert ex_mod._classify(_ApiError(429)) == "throttle"
+        assert ex_mod._classify(_ApiError(529)) == "throttle"
+        assert ex_mod._classify(_ApiError(502)) == "retry"
+        assert ex_mod._classify(_ApiError(400)) is None
+        assert ex_mod._classify(RuntimeError("budget")) is None
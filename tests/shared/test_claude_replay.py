@@ -0,0 +1,182 @@
+"""Tests for shared/claude_replay.py — recording and offline replay of Claude calls."""
+
+from __future__ import annotations
+
+import sys
+import time
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import shared.claude_client as cc_mod
+import shared.claude_replay as replay_mod
+from shared.claude_executor import run_batches
+
+
+class _FakeAnthropic:
+    calls = 0
+
+    def __init__(self, api_key: str) -> None:
+        self.messages = MagicMock()
+        self.messages.create.side_effect = self._create
+
+    @staticmethod
+    def _create(**kwargs):
+        _FakeAnthropic.calls += 1
+        return types.SimpleNamespace(
+            content=[types.SimpleNamespace(text="reply to " + kwargs["messages"][-1]["content"])],
+            model=kwargs["model"],
+            stop_reason="end_turn",
+            usage=types.SimpleNamespace(input_tokens=50, output_tokens=10),
+        )
+
+
+@pytest.fixture()
+def live_sdk(tmp_path, monkeypatch):
+    """A fake Anthropic SDK behind a temp .env, for record mode."""
+    env_path = tmp_path / ".env"
+    env_path.write_text("ANTHROPIC_API_KEY=key\n")
+    monkeypatch.setitem(sys.modules, "dotenv", types.SimpleNamespace(
+        dotenv_values=lambda path: {"ANTHROPIC_API_KEY": "key"}))
+    monkeypatch.setitem(sys.modules, "anthropic", types.SimpleNamespace(Anthropic=_FakeAnthropic))
+    monkeypatch.setattr(cc_mod, "_ENV_PATH", env_path)
+    _FakeAnthropic.calls = 0
+    cc_mod.reset_client()
+    yield
+    cc_mod.reset_client()
+
+
+@pytest.fixture()
+def tracker():
+    """Patch out budget checks, usage logging and the response cache settings."""
+    with patch("shared.usage_tracker.check_budget") as check_budget, \
+         patch("shared.usage_tracker.log_api_call") as log_call, \
+         patch("shared.config_store.load_config", return_value=None), \
+         patch("shared.response_cache.load_settings",
+               return_value={"tools": {}, "ttl_hours": 72.0, "max_mb": 100.0}):
+        yield types.SimpleNamespace(check_budget=check_budget, log_call=log_call)
+
+
+def _record(fixture_dir, *questions):
+    replay_mod.enable("record", fixture_dir)
+    try:
+        return [cc_mod.draft_with_claude("sys", q, tool_name="t") for q in questions]
+    finally:
+        replay_mod.disable()
+
+
+class TestRecordAndReplay:
+    def test_record_writes_one_fixture_per_request(self, tmp_path, live_sdk, tracker):
+        assert _record(tmp_path / "fx", "a", "b") == ["reply to a", "reply to b"]
+        assert len(list((tmp_path / "fx").glob("*.json"))) == 2
+        assert tracker.log_call.call_count == 2  # recording still spends and logs
+
+    def test_replay_serves_recorded_responses_offline(self, tmp_path, live_sdk, tracker,
+                                                      monkeypatch):
+        recorded = _record(tmp_path / "fx", "a")
+        monkeypatch.setitem(sys.modules, "anthropic", None)  # no SDK, no network
+        tracker.check_budget.reset_mock()
+        tracker.log_call.reset_mock()
+        harness = replay_mod.enable("replay", tmp_path / "fx", latency=0.0)
+        try:
+            assert cc_mod.draft_with_claude("sys", "a", tool_name="t") == recorded[0]
+        finally:
+            replay_mod.disable()
+        assert harness.calls == 1
+        assert _FakeAnthropic.calls == 1  # only the recording call
+        tracker.check_budget.assert_not_called()
+        tracker.log_call.assert_not_called()
+
+    def test_record_bypasses_response_cache(self, tmp_path, live_sdk, tracker):
+        cached = {"text": "cached", "model": "m", "input_tokens": 0, "output_tokens": 0,
+                  "cost_usd": 0.01}
+        with patch("shared.response_cache.load_settings",
+                   return_value={"tools": {"t": True}, "ttl_hours": 72.0, "max_mb": 100.0}), \
+             patch("shared.response_cache.get", return_value=cached) as cache_get, \
+             patch("shared.response_cache.put") as cache_put, \
+             patch("shared.usage_tracker.record_cache_lookup"):
+            assert cc_mod.draft_with_claude("sys", "a", tool_name="t") == "cached"
+            assert _record(tmp_path / "fx", "a") == ["reply to a"]
+        assert cache_get.call_count == 1  # only the call made outside the harness
+        cache_put.assert_not_called()
+        assert len(list((tmp_path / "fx").glob("*.json"))) == 1
+
+    def test_missing_fixture_raises(self, tmp_path, claude_replay, tracker):
+        claude_replay.fixture_dir = tmp_path
+        with pytest.raises(replay_mod.FixtureMissing, match="CLAUDE_REPLAY=record"):
+            cc_mod.draft_with_claude("sys", "never recorded")
+
+    def test_key_ignores_unrelated_arguments(self):
+        base = {"model": "m", "system": "s", "messages": [], "max_tokens": 10}
+        assert replay_mod.request_key(base) == replay_mod.request_key({**base, "extra": 1})
+        assert replay_mod.request_key(base) != replay_mod.request_key({**base, "model": "n"})
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            replay_mod.Harness("live")
+
+    def test_env_var_enables_replay(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_REPLAY", "replay")
+        monkeypatch.setenv("CLAUDE_REPLAY_DIR", str(tmp_path))
+        monkeypatch.setenv("CLAUDE_REPLAY_LATENCY", "0.25")
+        try:
+            harness = replay_mod.current()
+            assert harness.mode == "replay"
+            assert harness.fixture_dir == tmp_path
+            assert harness.latency == 0.25
+        finally:
+            replay_mod.disable()
+
+
+class TestSimulatedLatency:
+    def test_fixed_latency(self, tmp_path, live_sdk, tracker):
+        _record(tmp_path, "a")
+        replay_mod.enable("replay", tmp_path, latency=1.5)
+        try:
+            with patch.object(replay_mod.time, "sleep") as sleep:
+                cc_mod.draft_with_claude("sys", "a", tool_name="t")
+            sleep.assert_called_once_with(1.5)
+        finally:
+            replay_mod.disable()
+
+    def test_recorded_latency_by_default(self, tmp_path, claude_replay):
+        claude_replay.fixture_dir = tmp_path
+        request = {"model": cc_mod._MODEL, "system": "s",
+                   "messages": [{"role": "user", "content": "q"}], "max_tokens": 5}
+        message = types.SimpleNamespace(content=[types.SimpleNamespace(text="r")],
+                                        usage=types.SimpleNamespace(input_tokens=1, output_tokens=1))
+        claude_replay.save(request, message, elapsed_s=2.0)
+        claude_replay.latency = None
+        assert claude_replay.delay(claude_replay.load(request)) == 2.0
+
+    def test_concurrent_replay_overlaps_latency(self, tmp_path, live_sdk, tracker):
+        questions = [f"q{i}" for i in range(8)]
+        _record(tmp_path, *questions)
+        replay_mod.enable("replay", tmp_path, latency=0.1)
+        try:
+            started = time.monotonic()
+            results = run_batches(
+                lambda q: cc_mod.draft_with_claude("sys", q, tool_name="t"),
+                questions, max_workers=4,
+            )
+            elapsed = time.monotonic() - started
+        finally:
+            replay_mod.disable()
+        assert results == [f"reply to {q}" for q in questions]
+        assert elapsed < 0.6  # serial would take 0.8s
+
+
+class TestStreamingReplay:
+    def test_stream_replays_full_text_in_chunks(self, tmp_path, claude_replay, tracker):
+        claude_replay.fixture_dir = tmp_path
+        text = "Dear Officer, " * 10
+        request = {"model": cc_mod._MODEL, "system": "sys",
+                   "messages": [{"role": "user", "content": "hi"}], "max_tokens": 4096}
+        message = types.SimpleNamespace(content=[types.SimpleNamespace(text=text)],
+                                        usage=types.SimpleNamespace(input_tokens=5, output_tokens=30))
+        claude_replay.save(request, message, elapsed_s=0.0)
+        chunks = list(cc_mod.stream_with_claude("sys", "hi", tool_name="t"))
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+        tracker.log_call.assert_not_called()
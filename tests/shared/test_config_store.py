@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -102,3 +102,298 @@ class TestIsComponentEnabled:
             "component_toggles": {"feedback": {}}
         })
         assert config_mod.is_component_enabled("feedback", "missing-tool", default=False) is False
+
+
+# ── In-process cache ─────────────────────────────────────────────────────
+
+
+class TestConfigCache:
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        config_mod.clear_cache()
+        yield
+        config_mod.clear_cache()
+
+    def test_does_not_reparse_unchanged_file(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"v": 1})
+        config_mod.clear_cache()
+        with patch.object(config_mod.json, "loads", wraps=json.loads) as loads:
+            config_mod.load_config("tool")
+            config_mod.load_config("tool")
+            config_mod.get_config_value("tool", "v", 0)
+        assert loads.call_count == 1
+
+    def test_mutating_result_does_not_corrupt_cache(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"items": [1, 2], "nested": {"a": 1}})
+        first = config_mod.load_config("tool")
+        first["items"].append(3)
+        first["nested"]["a"] = 99
+        config_mod.get_config_value("tool", "items", []).append(4)
+        assert config_mod.load_config("tool") == {"items": [1, 2], "nested": {"a": 1}}
+
+    def test_mutating_saved_dict_does_not_corrupt_cache(self, _isolate_config_dir):
+        cfg = {"items": [1]}
+        config_mod.save_config("tool", cfg)
+        cfg["items"].append(2)
+        assert config_mod.load_config("tool") == {"items": [1]}
+
+    def test_picks_up_external_write(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"v": 1})
+        assert config_mod.get_config_value("tool", "v", 0) == 1
+        # Simulate another process rewriting the file
+        (_isolate_config_dir / "tool.json").write_text(json.dumps({"v": 22}))
+        assert config_mod.get_config_value("tool", "v", 0) == 22
+
+    def test_picks_up_external_delete(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"v": 1})
+        assert config_mod.load_config("tool") is not None
+        (_isolate_config_dir / "tool.json").unlink()
+        assert config_mod.load_config("tool") is None
+
+
+# ── transaction ──────────────────────────────────────────────────────────
+
+
+class TestTransaction:
+    def test_applies_all_updates_in_one_write(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"keep": 1, "drop": 2})
+        with patch.object(config_mod, "_write_atomic", wraps=config_mod._write_atomic) as write:
+            with config_mod.transaction("tool") as txn:
+                txn["a"] = 1
+                txn.set("b", [1, 2])
+                txn.update({"c": "three"})
+                del txn["drop"]
+        assert write.call_count == 1
+        assert config_mod.load_config("tool") == {"keep": 1, "a": 1, "b": [1, 2], "c": "three"}
+
+    def test_reads_see_pending_writes(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"v": 1})
+        with config_mod.transaction("tool") as txn:
+            assert txn["v"] == 1
+            txn["v"] = 2
+            assert txn.get("v") == 2
+            txn.delete("v")
+            assert "v" not in txn
+
+    def test_creates_missing_file(self, _isolate_config_dir):
+        with config_mod.transaction("fresh") as txn:
+            txn["x"] = True
+        assert config_mod.load_config("fresh") == {"x": True}
+
+    def test_nothing_written_on_exception(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"v": 1})
+        with pytest.raises(ValueError):
+            with config_mod.transaction("tool") as txn:
+                txn["v"] = 2
+                raise ValueError("boom")
+        assert config_mod.load_config("tool") == {"v": 1}
+
+    def test_no_temp_files_left_behind(self, _isolate_config_dir):
+        with config_mod.transaction("tool") as txn:
+            txn["v"] = 1
+        assert not list(_isolate_config_dir.glob("*.tmp"))
+
+    def test_blind_writes_merge_with_concurrent_writer(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"a": 1, "b": 1})
+        with config_mod.transaction("tool") as txn:
+            txn["a"] = 2
+            # Another process rewrites the file before we commit
+            (_isolate_config_dir / "tool.json").write_text(json.dumps({"a": 1, "b": 99, "c": 3}))
+        assert config_mod.load_config("tool") == {"a": 2, "b": 99, "c": 3}
+
+    def test_conflict_on_changed_read_key(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"count": 1})
+        with pytest.raises(config_mod.ConfigConflictError):
+            with config_mod.transaction("tool") as txn:
+                txn["count"] = txn["count"] + 1
+                (_isolate_config_dir / "tool.json").write_text(json.dumps({"count": 10}))
+        assert config_mod.load_config("tool") == {"count": 10}
+
+    def test_set_config_value_preserves_other_keys(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"a": 1})
+        config_mod.set_config_value("tool", "b", 2)
+        assert config_mod.load_config("tool") == {"a": 1, "b": 2}
+
+
+# ── SQLite backend ───────────────────────────────────────────────────────
+
+
+class TestSqliteBackend:
+    @pytest.fixture(autouse=True)
+    def _use_sqlite(self, monkeypatch):
+        monkeypatch.setenv("CONFIG_BACKEND", "sqlite")
+        config_mod.clear_cache()
+        yield
+        if config_mod._sqlite_db is not None:
+            config_mod._sqlite_db.close()
+        config_mod._sqlite_db = None
+        config_mod.clear_cache()
+
+    def test_round_trip_preserves_key_order(self, _isolate_config_dir):
+        config_mod.save_config("tool", {"z": 1, "a": [1, 2], "m": {"x": None}})
+        loaded = config_mod.load_config("tool")
+        assert loaded == {"z": 1, "a": [1, 2], "m": {"x": None}}
+        assert list(loaded) == ["z", "a", "m"]
+        assert (_isolate_config_dir / "config.db").exists()
+        assert not (_isolate_config_dir / "tool.json").exists()
+
+    def test_missing_config(self):
+        assert config_mod.load_config("nope") is None
+        assert config_mod.get_config_value("nope", "k", "d") == "d"
+
+    def test_get_and_set_single_key(self):
+        config_mod.save_config("tool", {"a": 1})
+        config_mod.set_config_value("tool", "b", {"nested": True})
+        assert config_mod.get_config_value("tool", "b", None) == {"nested": True}
+        assert config_mod.get_config_value("tool", "missing", 7) == 7
+        assert list(config_mod.load_config("tool")) == ["a", "b"]
+
+    def test_list_documents(self):
+        config_mod.save_config("staff-directory", [{"name": "A"}, {"name": "B"}])
+        assert config_mod.load_config("staff-directory") == [{"name": "A"}, {"name": "B"}]
+        assert config_mod.get_config_value("staff-directory", "name", "d") == "d"
+
+    def test_transaction_and_delete(self):
+        config_mod.save_config("tool", {"a": 1, "b": 2})
+        with config_mod.transaction("tool") as txn:
+            txn["c"] = 3
+            del txn["a"]
+        assert config_mod.load_config("tool") == {"b": 2, "c": 3}
+
+    def test_transaction_conflict(self):
+        config_mod.save_config("tool", {"count": 1})
+        with pytest.raises(config_mod.ConfigConflictError):
+            with config_mod.transaction("tool") as txn:
+                txn["count"] = txn["count"] + 1
+                config_mod.set_config_value("tool", "count", 10)
+        assert config_mod.get_config_value("tool", "count", 0) == 10
+
+    def test_transaction_reads_keys_without_loading_document(self):
+        config_mod.save_config("tool", {"a": 1, "big": list(range(1000))})
+        config_mod.clear_cache()
+        db = config_mod._sqlite_backend()
+        with patch.object(db, "load", wraps=db.load) as load:
+            config_mod.set_config_value("tool", "b", 2)
+            with config_mod.transaction("tool") as txn:
+                txn["a"] = txn["a"] + 1
+        load.assert_not_called()
+        assert config_mod.get_config_value("tool", "a", 0) == 2
+        assert config_mod.get_config_value("tool", "b", 0) == 2
+
+    def test_component_toggle(self):
+        config_mod.save_config("global-settings", {
+            "component_toggles": {"feedback": {"brief-builder": False}}
+        })
+        assert config_mod.is_component_enabled("feedback", "brief-builder") is False
+
+    def test_import_json_configs(self, _isolate_config_dir, monkeypatch):
+        (_isolate_config_dir / "tool.json").write_text(json.dumps({"v": 1}))
+        (_isolate_config_dir / "staff-directory.json").write_text(json.dumps([{"n": 1}]))
+        (_isolate_config_dir / "api-usage.json").write_text("[]")
+        (_isolate_config_dir / "broken.json").write_text("NOT JSON")
+        config_mod.save_config("existing", {"kept": True})
+        (_isolate_config_dir / "existing.json").write_text(json.dumps({"kept": False}))
+
+        imported = config_mod.import_json_configs()
+        assert sorted(imported) == ["staff-directory", "tool"]
+        assert config_mod.load_config("tool") == {"v": 1}
+        assert config_mod.load_config("staff-directory") == [{"n": 1}]
+        assert config_mod.load_config("existing") == {"kept": True}
+
+        assert "existing" in config_mod.import_json_configs(overwrite=True)
+        assert config_mod.load_config("existing") == {"kept": False}
+
+    def test_import_skips_auth_files(self, _isolate_config_dir, monkeypatch):
+        (_isolate_config_dir / "auth.json").write_text(json.dumps({"password_hash": "x"}))
+        (_isolate_config_dir / "sessions.json").write_text(json.dumps({"tok": {}}))
+        (_isolate_config_dir / "tool.json").write_text(json.dumps({"v": 1}))
+
+        assert config_mod.import_json_configs() == ["tool"]
+        assert config_mod.load_config("auth") is None
+        assert config_mod.load_config("sessions") is None
+
+
+# ── Change notifications ─────────────────────────────────────────────────
+
+
+class TestChangeNotifications:
+    @pytest.fixture(autouse=True)
+    def _reset_subscribers(self):
+        with patch.object(config_mod, "_subscribers", {}), \
+             patch.object(config_mod, "_changes_pos", None):
+            yield
+
+    def test_subscriber_called_once_per_change(self):
+        seen = []
+        config_mod.subscribe("tool", seen.append)
+        config_mod.save_config("tool", {"v": 1})
+        config_mod.set_config_value("other", "v", 1)
+        config_mod.poll_changes()
+        config_mod.poll_changes()
+        assert seen == ["tool"]
+
+    def test_poll_returns_changed_tools(self):
+        config_mod.subscribe("*", lambda _t: None)
+        assert config_mod.poll_changes() == set()
+        config_mod.save_config("a", {})
+        with config_mod.transaction("b") as txn:
+            txn["x"] = 1
+        # Announcements from another process look the same: a line per write
+        with open(config_mod.CONFIG_DIR / config_mod._CHANGES_LOG, "a") as fh:
+            fh.write("c\n")
+        assert config_mod.poll_changes() == {"a", "b", "c"}
+
+    def test_unsubscribe(self):
+        seen = []
+        unsubscribe = config_mod.subscribe("tool", seen.append)
+        unsubscribe()
+        config_mod.save_config("tool", {"v": 1})
+        config_mod.poll_changes()
+        assert seen == []
+
+    def test_truncated_log_notifies_everyone(self):
+        seen = []
+        config_mod.subscribe("tool", seen.append)
+        config_mod.save_config("x", {"v": 1})
+        config_mod.poll_changes()
+        (config_mod.CONFIG_DIR / config_mod._CHANGES_LOG).write_text("")
+        config_mod.poll_changes()
+        assert seen == ["tool"]
+
+    def test_live_config_value_stays_current(self):
+        default = {"en": "English"}
+        languages = config_mod.live_config_value("translator", "languages", default)
+        assert languages == {"en": "English"}
+        config_mod.set_config_value("translator", "languages", {"es": "Spanish"})
+        config_mod.poll_changes()
+        assert languages == {"es": "Spanish"}
+        assert default == {"en": "English"}
+
+    def test_live_value_swaps_rather_than_mutates(self):
+        config_mod.set_config_value("translator", "languages", {"en": "English", "fr": "French"})
+        languages = config_mod.live_config_value("translator", "languages", {})
+        reading = iter(languages.items())
+        next(reading)
+        config_mod.set_config_value("translator", "languages", {"es": "Spanish"})
+        config_mod.poll_changes()
+        # a reader mid-iteration finishes its own snapshot without errors
+        assert list(reading) == [("fr", "French")]
+        assert list(languages) == ["es"]
+
+    def test_live_list_reads_like_a_list(self):
+        topics = config_mod.live_config_value("research", "topics", ["asylum", "waivers"])
+        assert topics == ["asylum", "waivers"]
+        assert ["All"] + topics == ["All", "asylum", "waivers"]
+        assert topics[0] == "asylum" and "waivers" in topics
+        assert topics.copy() == ["asylum", "waivers"] and type(topics.copy()) is list
+
+    def test_nothing_loaded_or_watched_until_first_read(self):
+        load = MagicMock(return_value={"a": 1})
+        with patch.object(config_mod, "_watcher", None):
+            value = config_mod.live_value("tool", load)
+            load.assert_not_called()
+            assert config_mod._watcher is None
+            assert value["a"] == 1
+            assert value.get("b") is None
+            assert config_mod._watcher is not None
+        load.assert_called_once()
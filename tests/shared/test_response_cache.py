@@ -0,0 +1,90 @@
+"""Tests for shared/response_cache.py — content-addressed Claude response cache."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import shared.response_cache as rc_mod
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache_dir(tmp_path):
+    with patch.object(rc_mod, "_CACHE_DIR", tmp_path / "response-cache"):
+        yield
+
+
+class TestCacheKey:
+    def test_same_inputs_same_key(self):
+        assert rc_mod.cache_key("m", "sys", "user", 100) == rc_mod.cache_key("m", "sys", "user", 100)
+
+    def test_every_field_matters(self):
+        base = rc_mod.cache_key("m", "sys", "user", 100)
+        assert rc_mod.cache_key("m2", "sys", "user", 100) != base
+        assert rc_mod.cache_key("m", "sys2", "user", 100) != base
+        assert rc_mod.cache_key("m", "sys", "user2", 100) != base
+        assert rc_mod.cache_key("m", "sys", "user", 200) != base
+
+    def test_field_boundaries_are_unambiguous(self):
+        assert rc_mod.cache_key("m", "ab", "c", 1) != rc_mod.cache_key("m", "a", "bc", 1)
+
+
+class TestGetPut:
+    def test_miss_returns_none(self):
+        assert rc_mod.get("nope") is None
+
+    def test_roundtrip(self):
+        rc_mod.put("k", "hello", tool_name="t", model="m",
+                   input_tokens=10, output_tokens=5, cost_usd=0.01)
+        hit = rc_mod.get("k")
+        assert hit["text"] == "hello"
+        assert hit["input_tokens"] == 10
+        assert hit["cost_usd"] == pytest.approx(0.01)
+
+    def test_expired_entry_is_dropped(self):
+        rc_mod.put("k", "hello", tool_name="t", model="m")
+        with patch.object(rc_mod.time, "time", return_value=time.time() + 7200):
+            assert rc_mod.get("k", ttl_hours=1) is None
+        assert rc_mod.get_cache_info()["entries"] == 0
+
+    def test_lru_eviction_keeps_recently_used(self):
+        one_kb = "x" * 1024
+        max_mb = 2.5 / 1024  # room for two 1 KB entries
+        clock = [1000.0]
+        with patch.object(rc_mod.time, "time", side_effect=lambda: clock[0]):
+            for key in ("a", "b"):
+                rc_mod.put(key, one_kb, tool_name="t", model="m", max_mb=max_mb)
+                clock[0] += 1
+            assert rc_mod.get("a") is not None  # a is now more recent than b
+            clock[0] += 1
+            rc_mod.put("c", one_kb, tool_name="t", model="m", max_mb=max_mb)
+            assert rc_mod.get("b") is None
+            assert rc_mod.get("a") is not None
+            assert rc_mod.get("c") is not None
+
+    def test_clear(self):
+        rc_mod.put("a", "1", tool_name="t", model="m")
+        rc_mod.put("b", "2", tool_name="t", model="m")
+        assert rc_mod.clear() == 2
+        assert rc_mod.get_cache_info() == {"entries": 0, "bytes": 0}
+
+
+class TestSettings:
+    def test_disabled_by_default(self):
+        with patch("shared.config_store.load_config", return_value=None):
+            assert rc_mod.is_enabled("brief-builder") is False
+            assert rc_mod.load_settings()["ttl_hours"] == rc_mod.DEFAULT_TTL_HOURS
+
+    def test_per_tool_flag(self):
+        cfg = {"tools": {"brief-builder": True}}
+        with patch("shared.config_store.load_config", return_value=cfg):
+            assert rc_mod.is_enabled("brief-builder") is True
+            assert rc_mod.is_enabled("timeline-builder") is False
+
+    def test_cacheable_tools_are_real_callers_plus_cached_ones(self):
+        assert rc_mod.cacheable_tools() == rc_mod.CACHING_TOOLS
+        assert "document-assembler" in rc_mod.CACHING_TOOLS
+        rc_mod.put("k", "hello", tool_name="hearing-prep", model="m")
+        assert rc_mod.cacheable_tools()["hearing-prep"] == "Hearing Prep"
@@ -127,3 +127,631 @@ class TestDefaultFields:
 
     def test_no_duplicates(self):
         assert len(sf_mod.DEFAULT_FIELDS) == len(set(sf_mod.DEFAULT_FIELDS))
+
+
+# ── Record cache ─────────────────────────────────────────────────────────
+
+
+class TestRecordCache:
+    @pytest.fixture(autouse=True)
+    def sf(self):
+        sf_mod.clear_record_cache()
+        sf = MagicMock()
+        sf.query.side_effect = self._query
+        self.queries = []
+        with patch.object(sf_mod, "_sf_conn", return_value=sf):
+            yield sf
+        sf_mod.clear_record_cache()
+
+    def _query(self, soql):
+        self.queries.append(soql)
+        if "FROM Contact " in soql:
+            return {"records": [{"attributes": {}, "Id": "003A", "Name": f"v{len(self.queries)}"}]}
+        if "FROM LC_Task__c" in soql:
+            return {"records": [{"Id": "a0T1", "Name": "T-1", "For__c": "x"}]}
+        if "FROM Legal_Case__c" in soql:
+            return {"records": [{"Id": "a0L1", "Name": "LC-1"}]}
+        return {"records": [{"Id": "a0C1", "Contact__r": {"Name": "Kid"}, "Role__c": "Child"}]}
+
+    def test_repeat_lookup_served_from_cache(self):
+        first = sf_mod.get_client("1234")
+        second = sf_mod.get_client("1234")
+        assert first == second
+        assert len(self.queries) == 1
+
+    def test_returns_copies(self):
+        sf_mod.get_client("1234")["Name"] = "changed"
+        assert sf_mod.get_client("1234")["Name"] == "v1"
+
+    def test_different_fields_are_separate_entries(self):
+        sf_mod.get_client("1234")
+        sf_mod.get_client("1234", fields=["Id"])
+        assert len(self.queries) == 2
+
+    def test_refresh_bypasses_cache(self):
+        sf_mod.get_client("1234")
+        assert sf_mod.get_client("1234", refresh=True)["Name"] == "v2"
+        assert sf_mod.get_client("1234")["Name"] == "v2"
+
+    def test_expires_after_ttl(self):
+        sf_mod.get_client("1234")
+        with patch.object(sf_mod, "RECORD_CACHE_TTL", -1):
+            sf_mod.get_client("1234")
+        assert len(self.queries) == 2
+
+    def test_update_client_invalidates_contact(self):
+        sf_mod.get_client("1234")
+        sf_mod.update_client("003A", {"Name": "New"})
+        sf_mod.get_client("1234")
+        assert len(self.queries) == 2
+
+    def test_task_writes_invalidate_task_list(self, sf):
+        sf.LC_Task__c.create.return_value = {"id": "a0T2"}
+        sf_mod.get_lc_tasks("003A")
+        sf_mod.update_lc_task("a0T1", "y")
+        sf_mod.get_lc_tasks("003A")
+        sf_mod.create_lc_task("003A", "z")
+        sf_mod.get_lc_tasks("003A")
+        sf_mod.delete_lc_task("a0T1")
+        sf_mod.get_lc_tasks("003A")
+        assert sum("FROM LC_Task__c" in q for q in self.queries) == 4
+
+    def test_update_legal_case_invalidates_cases_and_beneficiaries(self):
+        sf_mod.get_legal_cases("003A")
+        sf_mod.get_case_beneficiaries("a0L1")
+        sf_mod.get_legal_cases("003A")
+        sf_mod.get_case_beneficiaries("a0L1")
+        assert len(self.queries) == 2
+        sf_mod.update_legal_case("a0L1", {"Name": "x"})
+        sf_mod.get_legal_cases("003A")
+        sf_mod.get_case_beneficiaries("a0L1")
+        assert len(self.queries) == 4
+
+    def test_unrelated_write_keeps_cache(self):
+        sf_mod.get_legal_cases("003A")
+        sf_mod.update_lc_task("a0T9", "y")
+        sf_mod.get_legal_cases("003A")
+        assert len(self.queries) == 1
+
+
+# ── Composite client snapshot ────────────────────────────────────────────
+
+
+def _part(ref, records, status=200):
+    return {"referenceId": ref, "httpStatusCode": status,
+            "body": {"records": [{"attributes": {}, **r} for r in records]}}
+
+
+class TestClientSnapshot:
+    @pytest.fixture(autouse=True)
+    def sf(self):
+        sf_mod.clear_record_cache()
+        sf = MagicMock()
+        sf.sf_version = "59.0"
+        sf.restful.return_value = {"compositeResponse": [
+            _part("contact", [{"Id": "003A", "Name": "Maria"}]),
+            _part("cases", [{"Id": "a0L1", "Name": "LC-1",
+                             "Primary_Attorney__r": {"Name": "Ana"}}]),
+            _part("tasks", [{"Id": "a0T1", "Name": "T-1", "For__c": "x"}]),
+            _part("Contact_Plus__c", [{"Id": "a0P1"}]),
+            _part("Contact_Plus_1__c", []),
+        ]}
+        with patch.object(sf_mod, "_sf_conn", return_value=sf):
+            yield sf
+        sf_mod.clear_record_cache()
+
+    def test_one_composite_request(self, sf):
+        snap = sf_mod.get_client_snapshot("1234")
+        assert sf.restful.call_count == 1
+        sf.query.assert_not_called()
+        assert snap["client"] == {"Id": "003A", "Name": "Maria"}
+        assert snap["legal_cases"] == [{"Id": "a0L1", "Name": "LC-1",
+                                        "Primary_Attorney__r_Name": "Ana"}]
+        assert snap["tasks"] == [{"Id": "a0T1", "Name": "T-1", "For__c": "x"}]
+        assert snap["related"] == {"Contact_Plus__c": {"Id": "a0P1"}, "Contact_Plus_1__c": None}
+
+    def test_dependent_queries_reference_contact(self, sf):
+        sf_mod.get_client_snapshot("1234")
+        payload = sf.restful.call_args.kwargs["json"]
+        assert payload["allOrNone"] is False
+        urls = {r["referenceId"]: r["url"] for r in payload["compositeRequest"]}
+        assert urls["contact"].startswith("/services/data/v59.0/query?q=")
+        assert "@{contact.records[0].Id}" in urls["tasks"]
+
+    def test_primes_record_cache(self, sf):
+        sf_mod.get_client_snapshot("1234")
+        assert sf_mod.get_lc_tasks("003A")[0]["Id"] == "a0T1"
+        assert sf_mod.get_legal_cases("003A")[0]["Id"] == "a0L1"
+        assert sf_mod.get_client("1234")["Name"] == "Maria"
+        sf.query.assert_not_called()
+
+    def test_snapshot_invalidated_by_task_create(self, sf):
+        sf.LC_Task__c.create.return_value = {"id": "a0T2"}
+        sf_mod.get_client_snapshot("1234")
+        sf_mod.get_client_snapshot("1234")
+        assert sf.restful.call_count == 1
+        sf_mod.create_lc_task("003A", "new")
+        sf_mod.get_client_snapshot("1234")
+        assert sf.restful.call_count == 2
+
+    def test_no_contact_returns_none(self, sf):
+        sf.restful.return_value = {"compositeResponse": [_part("contact", [])]}
+        assert sf_mod.get_client_snapshot("9999") is None
+
+    def test_failed_cases_part_uses_fallback_query(self, sf):
+        parts = sf.restful.return_value["compositeResponse"]
+        parts[1] = {"referenceId": "cases", "httpStatusCode": 400, "body": [{"errorCode": "INVALID_FIELD"}]}
+        sf.query.return_value = {"records": [{"Id": "a0L9", "Name": "LC-9"}]}
+        snap = sf_mod.get_client_snapshot("1234")
+        assert [c["Id"] for c in snap["legal_cases"]] == ["a0L9"]
+
+    def test_falls_back_to_sequential_when_composite_fails(self, sf):
+        sf.restful.side_effect = RuntimeError("composite not enabled")
+        sf.query.side_effect = lambda soql: {"records": [{"Id": "003A", "Name": "Maria"}]}
+        snap = sf_mod.get_client_snapshot("1234")
+        assert snap["client"]["Name"] == "Maria"
+        assert "legal_cases" in snap and "tasks" in snap
+
+
+# ── Describe cache ───────────────────────────────────────────────────────
+
+
+def _response(status, body=None, last_modified="Mon, 05 Oct 2026 10:00:00 GMT"):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = body
+    resp.headers = {"Last-Modified": last_modified} if status == 200 else {}
+    return resp
+
+
+_CONTACT_DESCRIBE = {"fields": [
+    {"name": "LastName", "label": "Last Name", "type": "string", "updateable": True},
+    {"name": "Gender__c", "label": "Gender", "type": "picklist",
+     "picklistValues": [{"label": "F", "value": "F", "active": True},
+                        {"label": "X", "value": "X", "active": False}]},
+]}
+
+
+class TestDescribeCache:
+    @pytest.fixture(autouse=True)
+    def sf(self, tmp_path):
+        import shared.sf_describe_cache as dc_mod
+
+        sf = MagicMock()
+        sf.base_url = "https://example.my.salesforce.com/services/data/v59.0/"
+        sf.headers = {"Authorization": "Bearer x"}
+        sf.session.get.return_value = _response(200, _CONTACT_DESCRIBE)
+        with patch.object(dc_mod, "_CACHE_DIR", tmp_path / "sf-describe"), \
+             patch.object(sf_mod, "_sf_conn", return_value=sf):
+            dc_mod._memo.clear()
+            self.dc = dc_mod
+            yield sf
+
+    def test_describe_persisted_and_reused(self, sf):
+        first = sf_mod.describe_object_fields("Contact")
+        assert [f["name"] for f in first] == ["Gender__c", "LastName"]
+        assert sf_mod.get_field_metadata()["Gender__c"]["picklistValues"] == [
+            {"label": "F", "value": "F"}
+        ]
+        assert sf.session.get.call_count == 1
+        assert self.dc.load("Contact")["last_modified"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+
+    def test_other_process_reads_from_disk(self, sf):
+        sf_mod.describe_object_fields("Contact")
+        self.dc._memo.clear()  # as if in a fresh process
+        sf_mod.get_field_metadata(["LastName"])
+        assert sf.session.get.call_count == 1
+
+    def test_stale_entry_revalidated_with_if_modified_since(self, sf):
+        sf_mod.describe_object_fields("Contact")
+        sf.session.get.return_value = _response(304)
+        with patch.object(self.dc, "REVALIDATE_AFTER", -1):
+            fields = sf_mod.describe_object_fields("Contact")
+        assert len(fields) == 2
+        headers = sf.session.get.call_args.kwargs["headers"]
+        assert headers["If-Modified-Since"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+        assert headers["Authorization"] == "Bearer x"
+
+    def test_changed_schema_replaces_entry(self, sf):
+        sf_mod.describe_object_fields("Contact")
+        changed = {"fields": [{"name": "New__c", "label": "New", "type": "string"}]}
+        sf.session.get.return_value = _response(200, changed, "Tue, 06 Oct 2026 09:00:00 GMT")
+        with patch.object(self.dc, "REVALIDATE_AFTER", -1):
+            assert [f["name"] for f in sf_mod.describe_object_fields("Contact")] == ["New__c"]
+        assert self.dc.load("Contact")["last_modified"] == "Tue, 06 Oct 2026 09:00:00 GMT"
+
+    def test_unreachable_salesforce_serves_stale_copy(self, sf):
+        sf_mod.describe_object_fields("Contact")
+        sf.session.get.side_effect = ConnectionError("offline")
+        with patch.object(self.dc, "REVALIDATE_AFTER", -1):
+            assert len(sf_mod.describe_object_fields("Contact")) == 2
+
+    def test_refresh_clears_cache(self, sf):
+        sf_mod.describe_object_fields("Contact")
+        assert sf_mod.refresh_describe_cache() == 1
+        sf_mod.describe_object_fields("Contact")
+        assert sf.session.get.call_count == 2
+        assert sf.session.get.call_args.kwargs["headers"].get("If-Modified-Since") is None
+
+    def test_global_describe_cached(self, sf):
+        sf.session.get.return_value = _response(200, {"sobjects": [
+            {"name": "Contact", "label": "Contact", "custom": False, "queryable": True},
+            {"name": "Hidden", "label": "Hidden", "custom": False, "queryable": False},
+        ]})
+        assert [o["name"] for o in sf_mod.list_sf_objects()] == ["Contact"]
+        sf_mod.list_sf_objects()
+        assert sf.session.get.call_count == 1
+        assert sf.session.get.call_args.args[0].endswith("/sobjects/")
+
+
+# ── sObject Collections writes ───────────────────────────────────────────
+
+
+class TestCollectionWrites:
+    @pytest.fixture(autouse=True)
+    def sf(self):
+        sf_mod.clear_record_cache()
+        sf = MagicMock()
+        sf.restful.side_effect = self._restful
+        self.requests = []
+        with patch.object(sf_mod, "_sf_conn", return_value=sf):
+            yield sf
+        sf_mod.clear_record_cache()
+
+    def _restful(self, path, method="GET", **kwargs):
+        self.requests.append((path, method, kwargs))
+        if path == "composite":
+            return {"compositeResponse": [
+                {"referenceId": r["referenceId"], "httpStatusCode": 200,
+                 "body": {"records": [{"Id": "a0P1"}] if r["referenceId"] == "Contact_Plus__c" else []}}
+                for r in kwargs["json"]["compositeRequest"]
+            ]}
+        if method == "DELETE":
+            return [{"id": i, "success": True, "errors": []} for i in kwargs["params"]["ids"].split(",")]
+        return [
+            {"id": r.get("Id") or f"new{n}", "success": r.get("Bad__c") is None,
+             "errors": [] if r.get("Bad__c") is None
+             else [{"statusCode": "INVALID_FIELD", "message": "bad", "fields": ["Bad__c"]}]}
+            for n, r in enumerate(kwargs["json"]["records"])
+        ]
+
+    def test_update_chunks_by_200_with_per_record_results(self):
+        records = [{"Id": f"a0C{i}", "Role__c": "Child"} for i in range(450)]
+        records[300]["Bad__c"] = 1
+        results = sf_mod.update_records("Case_Contact__c", records)
+        assert [len(kw["json"]["records"]) for _, _, kw in self.requests] == [200, 200, 50]
+        assert all(method == "PATCH" for _, method, _ in self.requests)
+        assert self.requests[0][2]["json"]["records"][0]["attributes"] == {"type": "Case_Contact__c"}
+        assert len(results) == 450
+        assert [i for i, r in enumerate(results) if not r["success"]] == [300]
+        assert results[300]["errors"][0]["fields"] == ["Bad__c"]
+
+    def test_mixed_types_keep_their_attributes(self):
+        sf_mod.update_records("", [
+            {"attributes": {"type": "Contact"}, "Id": "003A", "FirstName": "Ana"},
+            {"attributes": {"type": "Contact_Plus__c"}, "Id": "a0P1", "X__c": 1},
+        ])
+        types = [r["attributes"]["type"] for r in self.requests[0][2]["json"]["records"]]
+        assert types == ["Contact", "Contact_Plus__c"]
+
+    def test_update_requires_ids(self):
+        with pytest.raises(ValueError):
+            sf_mod.update_records("Contact", [{"FirstName": "Ana"}])
+
+    def test_failed_request_reported_per_record(self, sf):
+        sf.restful.side_effect = RuntimeError("503")
+        results = sf_mod.update_records("Contact", [{"Id": "003A"}, {"Id": "003B"}])
+        assert [r["errors"][0]["message"] for r in results] == ["503", "503"]
+        with pytest.raises(RuntimeError):
+            sf_mod.update_records("Contact", [{"Id": "003A"}], all_or_none=True)
+
+    def test_update_invalidates_cached_reads(self, sf):
+        sf.query.return_value = {"records": [{"Id": "a0C1", "Role__c": "Child"}]}
+        sf_mod.get_case_beneficiaries("a0L1")
+        sf_mod.update_records("Case_Contact__c", [{"Id": "a0C1", "Role__c": "Spouse"}])
+        sf_mod.get_case_beneficiaries("a0L1")
+        assert sf.query.call_count == 2
+
+    def test_create_and_delete(self):
+        created = sf_mod.create_records("LC_Task__c", [{"Contact__c": "003A", "For__c": "x"}])
+        assert created[0]["success"] and self.requests[0][1] == "POST"
+        deleted = sf_mod.delete_records(["a0T1", "a0T2"])
+        assert [r["id"] for r in deleted] == ["a0T1", "a0T2"]
+        assert self.requests[1][2]["params"] == {"ids": "a0T1,a0T2", "allOrNone": "false"}
+
+    def test_related_records_one_lookup_one_create(self):
+        related = sf_mod.get_related_records("003A", ["Contact_Plus__c", "Contact_Plus_1__c"])
+        assert related == {"Contact_Plus__c": {"Id": "a0P1"}, "Contact_Plus_1__c": {"Id": "new0"}}
+        assert [(p, m) for p, m, _ in self.requests] == [("composite", "POST"),
+                                                        ("composite/sobjects", "POST")]
+        assert self.requests[1][2]["json"]["records"] == [
+            {"attributes": {"type": "Contact_Plus_1__c"}, "Contact__c": "003A"}
+        ]
+
+
+# ── Bulk API 2.0 ─────────────────────────────────────────────────────────
+
+
+class _BulkResponse:
+    def __init__(self, status=200, body=None, csv_text="", headers=None):
+        import io
+
+        self.status_code = status
+        self._body = body
+        self.raw = io.BytesIO(csv_text.encode("utf-8"))
+        self.headers = headers or {}
+        self.text = json.dumps(body)
+        self.closed = False
+
+    def json(self):
+        return self._body
+
+    def close(self):
+        self.closed = True
+
+
+class TestBulkApi:
+    @pytest.fixture(autouse=True)
+    def sf(self):
+        sf = MagicMock()
+        sf.base_url = "https://x.my.salesforce.com/services/data/v59.0/"
+        sf.headers = {"Authorization": "Bearer t"}
+        sf.session.request.side_effect = self._request
+        self.calls = []
+        self.states = ["InProgress", "JobComplete"]
+        self.uploads = []
+        with patch.object(sf_mod, "_sf_conn", return_value=sf), \
+             patch.object(sf_mod.time, "sleep") as sleep:
+            self.sleep = sleep
+            yield sf
+
+    def _request(self, method, url, headers=None, data=None, params=None, stream=False,
+                 timeout=None):
+        path = url.split("/jobs/")[1]
+        self.calls.append((method, path, params))
+        if method == "POST":
+            return _BulkResponse(body={"id": f"750J{len(self.calls)}", "state": "Open"})
+        if method == "PUT":
+            self.uploads.append(data.read().decode("utf-8"))
+            return _BulkResponse(201)
+        if method == "PATCH":
+            return _BulkResponse(body={"state": json.loads(data)["state"]})
+        if path.endswith("/results"):
+            if not params.get("locator"):
+                return _BulkResponse(csv_text='"Id","Name"\n"003A","Ana ""Annie"" Lopez"\n',
+                                     headers={"Sforce-Locator": "MjAwMDA"})
+            return _BulkResponse(csv_text='"Id","Name"\n"003B","Line\nBreak"\n',
+                                 headers={"Sforce-Locator": "null"})
+        if "failedResults" in path:
+            return _BulkResponse(csv_text='"sf__Id","sf__Error","Id"\n"","INVALID_ID","bad"\n')
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return _BulkResponse(body={"state": state, "numberRecordsProcessed": 3,
+                                   "numberRecordsFailed": 1, "errorMessage": "boom"})
+
+    def test_query_streams_all_pages(self):
+        rows = list(sf_mod.bulk_query("SELECT Id, Name FROM Contact", page_size=1))
+        assert rows == [{"Id": "003A", "Name": 'Ana "Annie" Lopez'},
+                        {"Id": "003B", "Name": "Line\nBreak"}]
+        assert self.calls[0][:2] == ("POST", "query")
+        result_calls = [c for c in self.calls if c[1].endswith("/results")]
+        assert [c[2].get("locator") for c in result_calls] == [None, "MjAwMDA"]
+        self.sleep.assert_called_once_with(sf_mod.BULK_POLL_INTERVAL)
+
+    def test_query_is_lazy(self):
+        rows = sf_mod.bulk_query("SELECT Id FROM Contact")
+        assert self.calls == []
+        next(rows)
+        assert len([c for c in self.calls if c[1].endswith("/results")]) == 1
+
+    def test_failed_job_raises(self):
+        self.states = ["Failed"]
+        with pytest.raises(sf_mod.BulkJobError, match="boom") as info:
+            list(sf_mod.bulk_query("SELECT Bad__c FROM Contact"))
+        assert info.value.job["state"] == "Failed"
+
+    def test_poll_timeout(self):
+        self.states = ["InProgress"]
+        with pytest.raises(TimeoutError):
+            sf_mod.bulk_wait("750X", "query", timeout=5)
+
+    def test_ingest_uploads_csv_and_waits(self):
+        rows = ({"Id": f"003{i}", "Intake_Year__c": 2020 + i, "Note__c": None} for i in range(3))
+        result = sf_mod.bulk_ingest("Contact", "update", rows)
+        assert self.uploads == ["Id,Intake_Year__c,Note__c\n0030,2020,\n0031,2021,\n0032,2022,\n"]
+        assert [c[:2] for c in self.calls[:3]] == [
+            ("POST", "ingest"), ("PUT", "ingest/750J1/batches"), ("PATCH", "ingest/750J1")]
+        assert result == {"jobs": ["750J1"], "processed": 3, "failed": 1}
+
+    def test_ingest_splits_large_uploads(self):
+        with patch.object(sf_mod, "BULK_MAX_UPLOAD_BYTES", 40):
+            result = sf_mod.bulk_ingest("Contact", "delete",
+                                        ({"Id": f"003{i:015d}"} for i in range(3)), wait=False)
+        assert len(result["jobs"]) == 2
+        assert all(u.startswith("Id\n") for u in self.uploads)
+        assert sum(u.count("\n") - 1 for u in self.uploads) == 3
+
+    def test_ingest_nothing_to_do(self):
+        assert sf_mod.bulk_ingest("Contact", "update", iter([])) == \
+            {"jobs": [], "processed": 0, "failed": 0}
+        assert self.calls == []
+
+    def test_failed_rows(self):
+        assert list(sf_mod.bulk_ingest_results("750J1")) == [
+            {"sf__Id": "", "sf__Error": "INVALID_ID", "Id": "bad"}]
+
+    def test_http_error_message(self, sf):
+        sf.session.request.side_effect = lambda *a, **k: _BulkResponse(
+            400, [{"errorCode": "INVALIDJOB", "message": "unknown object Foo"}])
+        with pytest.raises(RuntimeError, match="unknown object Foo"):
+            sf_mod.bulk_create_query_job("SELECT Id FROM Foo")
+
+    def test_expired_session_logs_in_again_once(self, sf):
+        fresh = MagicMock()
+        fresh.base_url = sf.base_url
+        fresh.session.request.side_effect = self._request
+        sf.session.request.side_effect = lambda *a, **k: _BulkResponse(
+            401, [{"errorCode": "INVALID_SESSION_ID", "message": "Session expired"}])
+        conns = [sf]
+        with patch.object(sf_mod, "_sf_conn", side_effect=lambda: conns[-1]), \
+             patch.object(sf_mod, "_drop_connection", side_effect=lambda: conns.append(fresh)) as drop:
+            result = sf_mod.bulk_ingest("Contact", "update", iter([{"Id": "003A"}]), wait=False)
+        drop.assert_called_once()
+        assert sf.session.request.call_count == 1
+        assert result["jobs"] == ["750J1"]
+        assert self.uploads == ["Id\n003A\n"]
+
+
+# ── API usage and limits ─────────────────────────────────────────────────
+
+
+class TestApiUsage:
+    @pytest.fixture(autouse=True)
+    def tracker(self):
+        with patch("shared.usage_tracker.record_salesforce_call") as record_call, \
+             patch("shared.usage_tracker.record_api_limit") as record_limit, \
+             patch("shared.usage_tracker.get_api_limit", return_value=None) as get_limit, \
+             patch.object(sf_mod, "_limit_recorded_at", 0.0):
+            self.record_call, self.record_limit, self.get_limit = record_call, record_limit, get_limit
+            yield
+
+    def _response(self, url, header="api-usage=1200/15000"):
+        resp = MagicMock()
+        resp.url = url
+        resp.headers = {"Sforce-Limit-Info": header}
+        return resp
+
+    def test_hook_counts_call_and_records_usage(self):
+        with patch.object(sf_mod, "current_tool", return_value="cover-letters"):
+            sf_mod._on_sf_response(self._response(
+                "https://x.my.salesforce.com/services/data/v59.0/query?q=SELECT"))
+        self.record_call.assert_called_once_with("cover-letters", "query")
+        self.record_limit.assert_called_once_with("salesforce", 1200, 15000)
+
+    def test_usage_recorded_at_most_every_interval(self):
+        url = "https://x.my.salesforce.com/services/data/v59.0/sobjects/Contact/003A"
+        sf_mod._on_sf_response(self._response(url))
+        sf_mod._on_sf_response(self._response(url, "api-usage=1201/15000"))
+        assert self.record_call.call_count == 2
+        assert self.record_limit.call_count == 1
+
+    def test_hook_never_raises(self):
+        self.record_call.side_effect = RuntimeError("disk full")
+        sf_mod._on_sf_response(self._response("https://x/services/data/v59.0/query"))
+
+    def test_operation_labels(self):
+        base = "https://x.my.salesforce.com"
+        assert sf_mod._operation_of(f"{base}/services/data/v59.0/composite/sobjects") == "composite"
+        assert sf_mod._operation_of(f"{base}/services/data/v59.0/jobs/query/750X") == "jobs"
+        assert sf_mod._operation_of(f"{base}/services/oauth2/token") == "auth"
+
+    def test_instrument_adds_hook_once(self):
+        sf = MagicMock()
+        sf.session.hooks = {"response": []}
+        sf_mod._instrument(sf)
+        sf_mod._instrument(sf)
+        assert sf.session.hooks["response"] == [sf_mod._on_sf_response]
+
+    def test_tool_from_script_path(self, monkeypatch):
+        monkeypatch.delenv("SF_TOOL_NAME", raising=False)
+        sf_mod._process_tool.cache_clear()
+        try:
+            monkeypatch.setattr("sys.argv", ["/srv/my-new-website/cover-letters/app/dashboard.py"])
+            assert sf_mod._process_tool() == "cover-letters"
+            sf_mod._process_tool.cache_clear()
+            monkeypatch.setattr("sys.argv", ["/srv/my-new-website/shared/sf_mirror.py"])
+            assert sf_mod._process_tool() == "sf_mirror"
+            sf_mod._process_tool.cache_clear()
+            monkeypatch.setenv("SF_TOOL_NAME", "admin-panel")
+            assert sf_mod._process_tool() == "admin-panel"
+        finally:
+            sf_mod._process_tool.cache_clear()
+
+    def test_limits_endpoint_when_recorded_figures_are_stale(self):
+        sf = MagicMock()
+        sf.restful.return_value = {"DailyApiRequests": {"Max": 15000, "Remaining": 3000}}
+        self.get_limit.return_value = {"used": 1, "limit": 15000, "fraction": 0.0,
+                                       "checked_at": 0.0}
+        with patch.object(sf_mod, "_sf_conn", return_value=sf):
+            limits = sf_mod.get_api_limits()
+        sf.restful.assert_called_once_with("limits")
+        assert (limits["used"], limits["fraction"]) == (12000, pytest.approx(0.8))
+        self.record_limit.assert_called_once_with("salesforce", 12000, 15000)
+
+    def test_fresh_recorded_figures_skip_the_call(self):
+        import time
+
+        self.get_limit.return_value = {"used": 1, "limit": 15000, "fraction": 0.0,
+                                       "checked_at": time.time()}
+        with patch.object(sf_mod, "_sf_conn") as conn:
+            assert sf_mod.get_api_limits()["used"] == 1
+        conn.assert_not_called()
+
+    @pytest.mark.parametrize("fraction, threshold, expected", [
+        (0.5, 0.8, False), (0.85, 0.8, True), (0.85, 0.9, False),
+    ])
+    def test_background_throttle(self, fraction, threshold, expected):
+        limits = {"used": int(fraction * 100), "limit": 100, "fraction": fraction,
+                  "checked_at": 0.0}
+        with patch.object(sf_mod, "get_api_limits", return_value=limits), \
+             patch("shared.config_store.load_config",
+                   return_value={"background_max_fraction": threshold}):
+            assert sf_mod.background_throttled() is expected
+
+    def test_unreadable_limits_do_not_throttle(self):
+        with patch.object(sf_mod, "get_api_limits", side_effect=RuntimeError("offline")):
+            assert sf_mod.background_throttled() is False
+
+
+# ── Connection handling ──────────────────────────────────────────────────
+
+
+class SalesforceExpiredSession(Exception):
+    """Stands in for simple_salesforce.exceptions.SalesforceExpiredSession."""
+
+
+class TestConnection:
+    @pytest.fixture(autouse=True)
+    def _isolate(self, tmp_path):
+        with patch.object(sf_mod, "_SF_SESSION_PATH", tmp_path / ".sf_session.json"), \
+             patch.object(sf_mod, "_sf", None):
+            yield
+
+    def test_restored_session_is_not_probed(self):
+        sf_mod._SF_SESSION_PATH.write_text(json.dumps({"session_id": "s", "sf_instance": "i"}))
+        fake_sdk = MagicMock()
+        with patch.dict("sys.modules", {"simple_salesforce": fake_sdk}):
+            sf = sf_mod._restore_session()
+        assert sf is fake_sdk.Salesforce.return_value
+        sf.query.assert_not_called()
+
+    def test_concurrent_callers_connect_once(self):
+        import threading
+        import time
+
+        def slow_login():
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch.object(sf_mod, "_restore_session", return_value=None), \
+             patch.object(sf_mod, "_get_connection", side_effect=slow_login) as login:
+            threads = [threading.Thread(target=sf_mod._sf_conn) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert login.call_count == 1
+
+    def test_expired_session_logs_in_again_once(self):
+        stale, fresh = MagicMock(), MagicMock()
+        stale.query.side_effect = SalesforceExpiredSession("INVALID_SESSION_ID")
+        fresh.query.return_value = {"records": []}
+        # the reset drops the saved session, so the second connect logs in
+        with patch.object(sf_mod, "_restore_session", side_effect=[stale, None]), \
+             patch.object(sf_mod, "_get_connection", return_value=fresh), \
+             patch.dict("os.environ", {"SF_GATEWAY": "off"}):
+            sf_mod._sf_conn()
+            sf_mod._SF_SESSION_PATH.write_text("{}")
+            assert sf_mod.get_lc_tasks("003Z", refresh=True) == []
+        assert stale.query.call_count == 1
+        assert fresh.query.call_count == 1
+        assert not sf_mod._SF_SESSION_PATH.exists()
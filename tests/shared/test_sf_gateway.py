@@ -0,0 +1,181 @@
+"""Tests for shared/sf_gateway.py — forwarding salesforce_client calls to one shared process."""
+
+from __future__ import annotations
+
+import base64
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import shared.salesforce_client as sf_mod
+import shared.sf_gateway as gw_mod
+
+
+@pytest.fixture()
+def discovery(tmp_path):
+    with patch.object(gw_mod, "_DISCOVERY_PATH", tmp_path / ".sf_gateway.json"), \
+         patch.object(gw_mod, "_down_until", 0.0):
+        yield tmp_path / ".sf_gateway.json"
+
+
+@pytest.fixture()
+def gateway(discovery):
+    """A gateway serving on a free port in a thread, with a mocked Salesforce."""
+    fake_sf = MagicMock()
+    server, token = gw_mod.make_server()
+    gw_mod._write_discovery(server.server_address[1], token)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with patch.object(sf_mod, "_sf_conn", return_value=fake_sf):
+            yield fake_sf
+    finally:
+        server.shutdown()
+        server.server_close()
+        sf_mod.clear_record_cache()
+
+
+class TestForwarding:
+    def test_call_runs_in_gateway(self, gateway):
+        gateway.query.return_value = {"records": [{"Id": "003A", "Customer_ID__c": "1234"}]}
+        with patch.object(gw_mod, "try_call", wraps=gw_mod.try_call) as try_call:
+            result = sf_mod.get_client("1234", fields=["Id", "Customer_ID__c"])
+        assert result == {"Id": "003A", "Customer_ID__c": "1234"}
+        assert try_call.call_args.args[0] == "get_client"
+        assert gateway.query.call_count == 1
+
+    def test_gateway_errors_raise_without_direct_retry(self, gateway):
+        gateway.Contact.update.side_effect = ValueError("INVALID_FIELD: Bad__c")
+        with pytest.raises(ValueError, match="INVALID_FIELD") as info:
+            sf_mod.update_client("003A", {"Bad__c": 1})
+        assert not isinstance(info.value, gw_mod.GatewayError)
+        assert gateway.Contact.update.call_count == 1
+
+    def test_shared_exception_types_rebuilt(self, gateway):
+        gateway.query.side_effect = sf_mod.BulkJobError("job 750X failed")
+        with pytest.raises(sf_mod.BulkJobError, match="750X"):
+            sf_mod.get_client("1234", refresh=True)
+
+    def test_unknown_exception_types_become_gateway_errors(self):
+        error = gw_mod._rebuild_error(
+            {"ok": False, "error": "boom", "type": "Weird", "module": "some.plugin", "args": ["boom"]})
+        assert isinstance(error, gw_mod.GatewayError)
+        assert (str(error), error.error_type) == ("boom", "Weird")
+
+    def test_reset_connection_runs_in_gateway(self, gateway):
+        assert "reset_connection" in sf_mod.GATEWAY_FUNCTIONS
+        with patch.object(sf_mod, "_drop_connection") as drop, \
+             patch.object(gw_mod, "try_call", wraps=gw_mod.try_call) as try_call:
+            sf_mod.reset_connection()
+        assert try_call.call_args.args[0] == "reset_connection"
+        drop.assert_called_once()
+
+    def test_bytes_round_trip(self, gateway):
+        gateway.ContentVersion.create.return_value = {"id": "068X"}
+        data = bytes(range(256))
+        assert sf_mod.upload_file_to_contact("003A", data, "scan", "pdf") == "068X"
+        sent = gateway.ContentVersion.create.call_args.args[0]
+        assert base64.b64decode(sent["VersionData"]) == data
+
+    def test_encoding_keeps_bytes_and_nesting(self):
+        value = {"a": [b"\x00\xff", {"b": (1, "x")}]}
+        assert gw_mod._decode(json.loads(json.dumps(gw_mod._encode(value)))) == \
+            {"a": [b"\x00\xff", {"b": [1, "x"]}]}
+
+    def test_shared_cache_lives_in_gateway(self, gateway):
+        gateway.query.return_value = {"records": [{"Id": "a0T1", "Name": "T-1", "For__c": "x"}]}
+        sf_mod.get_lc_tasks("003A")
+        sf_mod.get_lc_tasks("003A")
+        assert gateway.query.call_count == 1
+        # nested calls inside the gateway ran there too: the write below
+        # invalidated the gateway's entry, so the next read queries again
+        gateway.LC_Task__c.update.return_value = None
+        sf_mod.update_lc_task("a0T1", "new")
+        sf_mod.get_lc_tasks("003A")
+        assert gateway.query.call_count == 2
+
+    def test_calls_attributed_to_the_calling_tool(self, gateway):
+        seen = []
+        gateway.query.side_effect = lambda soql: seen.append(sf_mod.current_tool()) or {"records": []}
+        main = threading.current_thread()
+
+        def process_tool():  # the gateway's own name on its threads
+            return "cover-letters" if threading.current_thread() is main else "sf_gateway"
+
+        with patch.object(sf_mod, "_process_tool", side_effect=process_tool):
+            sf_mod.get_legal_cases("003A", refresh=True)
+        assert seen == ["cover-letters"]
+
+    def test_health(self, gateway):
+        assert gw_mod.is_running()
+
+
+class TestFallback:
+    def test_no_discovery_file_runs_directly(self, discovery):
+        with patch.object(sf_mod, "_sf_conn") as conn:
+            conn.return_value.query.return_value = {"records": []}
+            assert sf_mod.get_client("9999", refresh=True) is None
+        conn.return_value.query.assert_called_once()
+
+    def test_unreachable_gateway_runs_directly_and_backs_off(self, discovery):
+        discovery.write_text(json.dumps({"port": 1, "token": "t", "pid": 0}))
+        with patch.object(sf_mod, "_sf_conn") as conn:
+            conn.return_value.query.return_value = {"records": []}
+            sf_mod.get_client("9999", refresh=True)
+            with patch.object(gw_mod, "_discover") as discover:
+                sf_mod.get_client("9998", refresh=True)
+        discover.assert_not_called()  # marked down, not retried for a while
+        assert conn.return_value.query.call_count == 2
+
+    def test_wrong_token_falls_back(self, gateway, discovery):
+        info = json.loads(discovery.read_text())
+        discovery.write_text(json.dumps({**info, "token": "stale"}))
+        with patch.object(sf_mod, "_sf_conn") as conn:
+            conn.return_value.query.return_value = {"records": []}
+            assert sf_mod.get_client("9999", refresh=True) is None
+        conn.return_value.query.assert_called_once()
+
+    def test_env_switch_disables_gateway(self, gateway, monkeypatch):
+        monkeypatch.setenv("SF_GATEWAY", "off")
+        with patch.object(gw_mod, "try_call") as try_call:
+            sf_mod.clear_record_cache()
+        try_call.assert_not_called()
+
+    def test_unregistered_function_rejected(self, gateway):
+        with pytest.raises(gw_mod.GatewayError, match="unknown function"):
+            gw_mod.try_call("_sf_conn", (), {})
+
+
+class TestRateLimiter:
+    def test_burst_then_refill(self):
+        limiter = gw_mod._RateLimiter(rate=2)
+        with patch.object(gw_mod.time, "sleep") as sleep:
+            limiter.acquire()
+            limiter.acquire()
+            limiter._updated -= 0.5  # half a second later one call is allowed again
+            limiter.acquire()
+        sleep.assert_not_called()
+        assert limiter._tokens < 1
+
+    def test_waits_when_empty(self):
+        limiter = gw_mod._RateLimiter(rate=50)
+        started = gw_mod.time.monotonic()
+        for _ in range(55):
+            limiter.acquire()
+        assert gw_mod.time.monotonic() - started >= 0.08
+
+
+class TestHelpersForFormerDirectCallers:
+    def test_get_record_through_gateway(self, gateway):
+        gateway.query.return_value = {"records": [{"attributes": {}, "Id": "a0P1", "X__c": "v"}]}
+        assert sf_mod.get_record("Contact_Plus__c", "a0P1", ["X__c"]) == {"Id": "a0P1", "X__c": "v"}
+        assert gateway.query.call_args.args[0] == (
+            "SELECT Id, X__c FROM Contact_Plus__c WHERE Id = 'a0P1' LIMIT 1")
+
+    def test_send_contact_email_through_gateway(self, gateway):
+        gateway.restful.return_value = [{"isSuccess": True}]
+        result = sf_mod.send_contact_email("003A", "a@b.c", "Hi", "Body", "Firm")
+        assert result["success"]
+        assert gateway.restful.call_args.args[0] == "actions/standard/emailSimple"
@@ -0,0 +1,244 @@
+"""Tests for shared/sf_mirror.py — incremental Salesforce mirror and client search."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import shared.salesforce_client as sf_mod
+import shared.sf_mirror as mirror_mod
+
+_real_sf_conn = sf_mod._sf_conn
+
+
+def _contact(sf_id, cid, first, last, a_number="", stamp="2026-10-01T10:00:00.000+0000", **extra):
+    return {
+        "attributes": {"type": "Contact"},
+        "Id": sf_id,
+        "Customer_ID__c": cid,
+        "FirstName": first,
+        "LastName": last,
+        "Name": f"{first} {last}",
+        "A_Number__c": a_number,
+        "SystemModstamp": stamp,
+        "IsDeleted": False,
+        **extra,
+    }
+
+
+class _FakeSF:
+    """Answers query_all_iter from per-object record lists."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, list[dict]] = {"Contact": [], "Legal_Case__c": [], "LC_Task__c": []}
+        self.queries: list[str] = []
+
+    def query_all_iter(self, soql, include_deleted=False):
+        assert include_deleted
+        self.queries.append(soql)
+        obj = soql.split(" FROM ")[1].split()[0]
+        return iter(self.records[obj])
+
+
+@pytest.fixture()
+def sf(tmp_path):
+    fake = _FakeSF()
+    fake.records["Contact"] = [
+        _contact("003A", "1234", "María", "García", "A123-456-789"),
+        _contact("003B", "1250", "Mario", "Garcetti", "",
+                 stamp="2026-10-02T08:30:00.000+0000"),
+        _contact("003C", "2001", "Ana", "Lopez", "987654321"),
+    ]
+    fake.records["Legal_Case__c"] = [{
+        "Id": "a0L1", "Name": "LC-1", "Primary_Applicant__c": "003A",
+        "Primary_Attorney__r": {"Name": "Jane"}, "SystemModstamp": "2026-10-01T10:00:00.000+0000",
+        "IsDeleted": False,
+    }]
+    fake.records["LC_Task__c"] = [{
+        "Id": "a0T1", "Name": "T-1", "For__c": "Filing", "Contact__c": "003A",
+        "SystemModstamp": "2026-10-01T10:00:00.000+0000", "IsDeleted": False,
+    }]
+    with patch.object(mirror_mod, "_MIRROR_DIR", tmp_path / "sf-mirror"), \
+         patch.object(sf_mod, "_sf_conn", return_value=fake):
+        mirror_mod.sync()
+        yield fake
+
+
+class TestSync:
+    def test_initial_sync_mirrors_all_objects(self, sf):
+        assert mirror_mod.get_client("1234")["Name"] == "María García"
+        assert mirror_mod.get_legal_cases("003A") == [
+            {"Id": "a0L1", "Name": "LC-1", "Primary_Applicant__c": "003A",
+             "Primary_Attorney__r_Name": "Jane"}
+        ]
+        assert mirror_mod.get_lc_tasks("003A")[0]["For__c"] == "Filing"
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert status["Contact"]["mirrored"] == 3
+        assert status["Contact"]["watermark"] == "2026-10-02T08:30:00.000+0000"
+
+    def test_first_query_has_no_watermark(self, sf):
+        contact_query = sf.queries[0]
+        assert "SystemModstamp >=" not in contact_query
+        assert " WHERE " not in contact_query  # clients are filtered locally
+        assert "IsDeleted" in contact_query
+
+    def test_incremental_sync_uses_watermark(self, sf):
+        sf.queries.clear()
+        sf.records["Contact"] = [
+            _contact("003C", "2001", "Ana", "Lopez-Ruiz", stamp="2026-10-03T09:00:00.000+0000"),
+        ]
+        assert mirror_mod.sync()["Contact"] == 1
+        assert "SystemModstamp >= 2026-10-02T08:30:00Z" in sf.queries[0]
+        assert mirror_mod.get_client("2001")["LastName"] == "Lopez-Ruiz"
+        assert mirror_mod.search("ruiz")[0]["Id"] == "003C"
+
+    def test_deleted_rows_removed(self, sf):
+        sf.records["Contact"] = [{**_contact("003B", "1250", "Mario", "Garcetti"), "IsDeleted": True}]
+        mirror_mod.sync()
+        assert mirror_mod.get_client("1250") is None
+        assert [r["Id"] for r in mirror_mod.search("garcetti")] == []
+
+    def test_cleared_customer_id_removes_contact(self, sf):
+        sf.records["Contact"] = [_contact("003B", None, "Mario", "Garcetti",
+                                          stamp="2026-10-03T09:00:00.000+0000")]
+        mirror_mod.sync()
+        assert mirror_mod.get_client("1250") is None
+        assert [r["Id"] for r in mirror_mod.search("garcetti")] == []
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert status["Contact"]["mirrored"] == 2
+
+    def test_non_clients_never_mirrored(self, sf):
+        sf.records["Contact"] = [_contact("003Z", None, "Opposing", "Counsel",
+                                          stamp="2026-10-03T09:00:00.000+0000")]
+        mirror_mod.sync()
+        assert mirror_mod.search("counsel") == []
+
+    def test_full_sync_ignores_watermark(self, sf):
+        sf.queries.clear()
+        mirror_mod.sync(full=True)
+        assert "SystemModstamp >=" not in sf.queries[0]
+
+    def test_failed_object_recorded_others_continue(self, sf):
+        original = sf.query_all_iter
+
+        def flaky(soql, include_deleted=False):
+            if "FROM Legal_Case__c" in soql:
+                raise RuntimeError("No such column 'Bar_Number__c'")
+            return original(soql, include_deleted)
+
+        sf.query_all_iter = flaky
+        results = mirror_mod.sync()
+        assert results["Legal_Case__c"] == 0
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert "Bar_Number__c" in status["Legal_Case__c"]["error"]
+        assert status["Legal_Case__c"]["watermark"] == "2026-10-01T10:00:00.000+0000"
+
+    def test_connection_failure_recorded_not_raised(self, sf, capsys):
+        with patch.object(sf_mod, "_sf_conn", side_effect=RuntimeError("INVALID_LOGIN")):
+            assert mirror_mod.sync() == {"Contact": 0, "Legal_Case__c": 0, "LC_Task__c": 0}
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert all("INVALID_LOGIN" in s["error"] for s in status.values())
+        assert capsys.readouterr().out == ""
+        mirror_mod.sync()
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert all(s["error"] == "" for s in status.values())
+
+    def test_expired_restored_session_logs_in_again(self, sf, tmp_path):
+        class SalesforceExpiredSession(Exception):
+            pass
+
+        def expired(soql, include_deleted=False):
+            raise SalesforceExpiredSession("INVALID_SESSION_ID")
+
+        stale = _FakeSF()
+        stale.query_all_iter = expired
+        sf.records["Contact"].append(
+            _contact("003D", "3001", "Luis", "Ramos", stamp="2026-10-03T09:00:00.000+0000"))
+        session_path = tmp_path / ".sf_session.json"
+        session_path.write_text("{}")
+        # the drop removes the saved session, so the second connect logs in
+        with patch.object(sf_mod, "_sf_conn", _real_sf_conn), \
+             patch.object(sf_mod, "_sf", None), \
+             patch.object(sf_mod, "_SF_SESSION_PATH", session_path), \
+             patch.object(sf_mod, "_instrument"), \
+             patch.object(sf_mod, "_restore_session", side_effect=[stale, None]), \
+             patch.object(sf_mod, "_get_connection", return_value=sf) as login:
+            results = mirror_mod.sync()
+        login.assert_called_once()
+        assert not session_path.exists()
+        assert results["Contact"] == len(sf.records["Contact"])
+        assert mirror_mod.get_client("3001")["Id"] == "003D"
+        status = {s["object"]: s for s in mirror_mod.get_sync_status()}
+        assert all(s["error"] == "" for s in status.values())
+
+
+class TestSearch:
+    def test_prefix_on_name_words(self, sf):
+        # equal scores fall back to name order
+        assert [r["Id"] for r in mirror_mod.search("garc")] == ["003A", "003B"]
+
+    def test_all_words_must_match(self, sf):
+        assert [r["Id"] for r in mirror_mod.search("mar garci")] == ["003A"]
+
+    def test_accents_ignored(self, sf):
+        assert mirror_mod.search("maria garcia")[0]["Id"] == "003A"
+
+    def test_exact_word_ranks_first(self, sf):
+        sf.records["Contact"].append(_contact("003D", "3000", "Anabel", "Aaron"))
+        mirror_mod.sync(full=True)
+        assert mirror_mod.search("ana")[0]["Id"] == "003C"
+
+    def test_customer_id_prefix(self, sf):
+        assert [r["Id"] for r in mirror_mod.search("12")] == ["003A", "003B"]
+
+    def test_a_number_in_any_format(self, sf):
+        for query in ("A123-456-789", "a 123456", "123 456"):
+            assert [r["Id"] for r in mirror_mod.search(query)] == ["003A"], query
+
+    def test_typo_tolerant_fallback(self, sf):
+        assert mirror_mod.search("lopes")[0]["Id"] == "003C"
+
+    def test_no_match(self, sf):
+        assert mirror_mod.search("zzz") == []
+        assert mirror_mod.search("   ") == []
+
+    def test_limit(self, sf):
+        assert len(mirror_mod.search("garc", limit=1)) == 1
+
+    def test_salesforce_client_api(self, sf):
+        assert sf_mod.search_clients("lopez")[0]["Customer_ID__c"] == "2001"
+
+    def test_fast_on_a_realistic_directory(self, sf):
+        sf.records["Contact"] = [
+            _contact(f"003X{i:05d}", str(10000 + i), f"First{i % 700}", f"Last{i % 1300}",
+                     f"{200000000 + i}")
+            for i in range(5000)
+        ]
+        mirror_mod.sync()
+        started = time.perf_counter()
+        for query in ("last12", "first3 last4", "10042", "2000001", "lopez"):
+            mirror_mod.search(query)
+        per_query_ms = (time.perf_counter() - started) * 1000 / 5
+        assert per_query_ms < 50  # typically well under 10 ms
+
+
+class TestRunForever:
+    def test_backs_off_while_api_usage_is_high(self):
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            if len(waits) == 5:
+                raise KeyboardInterrupt
+
+        throttled = iter([True, True, True, False, True])
+        with patch.object(sf_mod, "background_throttled", side_effect=lambda: next(throttled)), \
+             patch.object(mirror_mod, "sync") as sync, \
+             patch.object(mirror_mod, "MAX_BACKOFF", 1000), \
+             patch.object(mirror_mod.time, "sleep", side_effect=sleep):
+            with pytest.raises(KeyboardInterrupt):
+                mirror_mod.run_forever(300)
+        assert waits == [600, 1000, 1000, 300, 600]
+        assert sync.call_count == 1
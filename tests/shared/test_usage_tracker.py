@@ -18,9 +18,15 @@ def _isolate_tracker_files(tmp_path):
     config_dir = tmp_path / "config"
     config_dir.mkdir(parents=True)
     with patch.object(tracker_mod, "_CONFIG_DIR", config_dir), \
+         patch.object(tracker_mod, "_USAGE_DIR", config_dir / "api-usage"), \
          patch.object(tracker_mod, "_USAGE_FILE", config_dir / "api-usage.json"), \
-         patch.object(tracker_mod, "_BUDGETS_FILE", config_dir / "api-budgets.json"):
+         patch.object(tracker_mod, "_BUDGETS_FILE", config_dir / "api-budgets.json"), \
+         patch.object(tracker_mod, "_last_retention_day", ""), \
+         patch.object(tracker_mod, "_spend", {}), \
+         patch.object(tracker_mod, "_spend_month", ""), \
+         patch.object(tracker_mod, "_budgets_cache", None):
         yield
+        tracker_mod.flush()  # don't let queued entries land in another test's dir
 
 
 # ── Cost estimation ──────────────────────────────────────────────────────
@@ -46,6 +52,18 @@ class TestEstimateCost:
     def test_zero_tokens(self):
         assert tracker_mod.estimate_cost("claude-sonnet-4-5-20250929", 0, 0) == 0.0
 
+    def test_prompt_cache_pricing(self):
+        model = "claude-sonnet-4-5-20250929"
+        cost = tracker_mod.estimate_cost(model, 100, 0, cache_write_tokens=1000,
+                                         cache_read_tokens=10_000)
+        expected = (100 + 1000 * 1.25 + 10_000 * 0.10) * 3.00 / 1_000_000
+        assert cost == pytest.approx(expected)
+
+    def test_batch_discount(self):
+        full = tracker_mod.estimate_cost("claude-sonnet-4-5-20250929", 1000, 500)
+        batch = tracker_mod.estimate_cost("claude-sonnet-4-5-20250929", 1000, 500, batch=True)
+        assert batch == pytest.approx(full * tracker_mod.BATCH_DISCOUNT)
+
 
 # ── Logging and loading entries ──────────────────────────────────────────
 
@@ -100,6 +118,84 @@ class TestTrimOldEntries:
         assert loaded[0]["tool"] == "recent"
 
 
+# ── Append-only day files ────────────────────────────────────────────────
+
+
+class TestAppendOnlyStore:
+    def test_log_appends_without_rewriting(self):
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+        tracker_mod.flush()
+        with patch.object(tracker_mod, "_write_partition") as rewrite, \
+             patch.object(tracker_mod, "_load_entries") as load:
+            tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+            tracker_mod.flush()
+        rewrite.assert_not_called()
+        load.assert_not_called()
+        day_file = tracker_mod._partition_path(datetime.now().strftime("%Y-%m-%d"))
+        assert len(day_file.read_text().splitlines()) == 2
+
+    def test_concurrent_writers_do_not_drop_entries(self):
+        import threading
+
+        def worker(n):
+            for _ in range(50):
+                tracker_mod.log_api_call(service="anthropic", tool=f"tool-{n}", operation="o")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(tracker_mod._load_entries()) == 400
+
+    def test_torn_line_is_skipped(self):
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+        tracker_mod.flush()
+        day_file = tracker_mod._partition_path(datetime.now().strftime("%Y-%m-%d"))
+        with open(day_file, "a") as fh:
+            fh.write('{"timestamp": "20')
+        assert len(tracker_mod._load_entries()) == 1
+
+    def test_retention_drops_whole_day_files(self):
+        old_day = (datetime.now() - timedelta(days=120)).strftime("%Y-%m-%d")
+        tracker_mod._write_partition(old_day, [{"timestamp": f"{old_day}T10:00:00", "tool": "old"}])
+        tracker_mod.log_api_call(service="anthropic", tool="new", operation="o")
+        tracker_mod.flush()
+        assert not tracker_mod._partition_path(old_day).exists()
+        assert [e["tool"] for e in tracker_mod._load_entries()] == ["new"]
+
+    def test_migrates_legacy_file(self):
+        now = datetime.now()
+        legacy = [
+            {"timestamp": (now - timedelta(days=100)).isoformat(timespec="seconds"), "tool": "expired"},
+            {"timestamp": (now - timedelta(days=2)).isoformat(timespec="seconds"), "tool": "a"},
+            {"timestamp": now.isoformat(timespec="seconds"), "tool": "b"},
+        ]
+        tracker_mod._USAGE_FILE.write_text(json.dumps(legacy))
+        tracker_mod.log_api_call(service="anthropic", tool="c", operation="o")
+
+        # appended after entries already logged that day, so b follows c
+        assert sorted(e["tool"] for e in tracker_mod._load_entries()) == ["a", "b", "c"]
+        assert not tracker_mod._USAGE_FILE.exists()
+        assert tracker_mod._USAGE_FILE.with_name("api-usage.json.migrated").exists()
+        # Second call is a no-op
+        assert tracker_mod.migrate_legacy_usage_file() == 0
+
+    def test_legacy_migration_keeps_entries_appended_meanwhile(self):
+        now = datetime.now().isoformat(timespec="seconds")
+        tracker_mod._USAGE_FILE.write_text(json.dumps([{"timestamp": now, "tool": "legacy"}]))
+        append = tracker_mod._append_entries
+
+        def append_alongside_other_process(entries):
+            # another process logs to the same day file mid-migration
+            append([{"timestamp": now, "tool": "other"}])
+            return append(entries)
+
+        with patch.object(tracker_mod, "_append_entries", side_effect=append_alongside_other_process):
+            assert tracker_mod.migrate_legacy_usage_file() == 1
+        assert sorted(e["tool"] for e in tracker_mod._load_entries()) == ["legacy", "other"]
+
+
 # ── Query helpers ────────────────────────────────────────────────────────
 
 
@@ -198,6 +294,198 @@ class TestGetDailyBreakdown:
         # Sorted by date ascending
         assert breakdown[0]["date"] < breakdown[1]["date"]
 
+    def test_daily_breakdown_includes_queued_entries(self):
+        # Just after the cutoff, so it is summed from the partial first day's file
+        ts = (datetime.now() - timedelta(days=1, seconds=-60)).isoformat(timespec="seconds")
+        with patch.object(tracker_mod._writer, "_ensure_thread"):
+            tracker_mod._writer.submit({"timestamp": ts, "service": "anthropic", "tool": "t",
+                                        "operation": "o", "estimated_cost_usd": 0.25})
+        breakdown = tracker_mod.get_daily_breakdown(1)
+        assert sum(d["calls"] for d in breakdown) == 1
+        assert abs(sum(d["cost_usd"] for d in breakdown) - 0.25) < 1e-9
+
+
+# ── Background writer ────────────────────────────────────────────────────
+
+
+class TestBackgroundWriter:
+    def test_log_does_not_touch_disk(self):
+        with patch.object(tracker_mod, "_write_batch", return_value=[]) as write:
+            tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+            write.assert_not_called()
+            assert tracker_mod.get_writer_stats()["pending"] == 1
+            tracker_mod.flush()
+            write.assert_called_once()
+        assert tracker_mod.get_writer_stats()["pending"] == 0
+
+    def test_batch_written_with_one_append_per_day(self):
+        with patch.object(tracker_mod._writer, "_ensure_thread"):
+            for i in range(5):
+                tracker_mod.log_api_call(service="anthropic", tool=f"t{i}", operation="o")
+        with patch.object(tracker_mod.os, "write", wraps=tracker_mod.os.write) as write:
+            tracker_mod.flush()
+        assert write.call_count == 1
+        assert len(tracker_mod._load_entries()) == 5
+
+    def test_reads_flush_pending_entries(self):
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+        assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 1
+
+    def test_full_queue_drops_and_counts(self):
+        with patch.object(tracker_mod, "_MAX_QUEUE", 2):
+            writer = tracker_mod._UsageWriter()
+        with patch.object(writer, "_ensure_thread"):
+            for _ in range(5):
+                writer.submit({"timestamp": datetime.now().isoformat()})
+        assert writer.pending() == 2
+        assert writer.dropped == 3
+
+    def test_failed_write_is_retried_not_dropped(self):
+        writer = tracker_mod._UsageWriter()
+        with patch.object(tracker_mod, "_writer", writer), \
+             patch.object(writer, "_ensure_thread"):
+            tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+            with patch.object(tracker_mod.os, "write", side_effect=OSError("disk full")):
+                tracker_mod.flush()
+            stats = tracker_mod.get_writer_stats()
+            assert (stats["pending"], stats["dropped"], stats["failed_writes"]) == (1, 0, 1)
+            tracker_mod.flush()
+            assert len(tracker_mod._load_entries()) == 1
+            assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 1
+
+    def test_background_thread_flushes_on_timer(self):
+        import time
+
+        with patch.object(tracker_mod, "_FLUSH_INTERVAL", 0.05):
+            writer = tracker_mod._UsageWriter()
+            writer.submit({"timestamp": datetime.now().isoformat(timespec="seconds"),
+                           "service": "anthropic", "tool": "t"})
+            deadline = time.time() + 2
+            while writer.pending() and time.time() < deadline:
+                time.sleep(0.01)
+        assert writer.pending() == 0
+        writer.flush()  # waits for the thread's in-flight write to finish
+        assert len(tracker_mod._load_entries()) == 1
+
+
+# ── Rollups ──────────────────────────────────────────────────────────────
+
+
+class TestRollups:
+    def test_summaries_do_not_scan_raw_entries(self):
+        for i in range(3):
+            tracker_mod.log_api_call(
+                service="anthropic", tool="brief-builder", operation="draft",
+                model="claude-sonnet-4-5-20250929", input_tokens=100, output_tokens=10,
+                estimated_cost_usd=0.01,
+            )
+        tracker_mod.log_api_call(service="google_translate", tool="translator",
+                                 operation="translate", input_tokens=500,
+                                 estimated_cost_usd=0.01)
+        tracker_mod.flush()
+        with patch.object(tracker_mod, "_load_entries") as load:
+            summary = tracker_mod.get_monthly_summary()
+            tools = tracker_mod.get_per_tool_breakdown()
+            daily = tracker_mod.get_daily_breakdown(30)
+        load.assert_not_called()
+        assert summary["anthropic"]["calls"] == 3
+        assert summary["anthropic"]["input_tokens"] == 300
+        assert summary["google_translate"]["characters"] == 500
+        assert {t["tool"]: t["calls"] for t in tools} == {"brief-builder": 3, "translator": 1}
+        assert daily[-1]["calls"] == 4
+        assert daily[-1]["tokens"] == 830
+
+    def test_cache_tokens_rolled_up(self):
+        tracker_mod.log_api_call(service="anthropic", tool="hearing-prep", operation="evaluate",
+                                 input_tokens=50, output_tokens=10,
+                                 cache_write_tokens=2000, cache_read_tokens=0)
+        tracker_mod.log_api_call(service="anthropic", tool="hearing-prep", operation="evaluate",
+                                 input_tokens=60, output_tokens=10,
+                                 cache_write_tokens=100, cache_read_tokens=2000)
+        summary = tracker_mod.get_monthly_summary()["anthropic"]
+        assert summary["cache_write_tokens"] == 2100
+        assert summary["cache_read_tokens"] == 2000
+        entries = tracker_mod.get_entries_since(1)
+        assert {e.get("cache_read_tokens", 0) for e in entries} == {0, 2000}
+
+    def test_old_rollup_db_gains_cache_columns(self):
+        import sqlite3
+
+        tracker_mod._USAGE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(tracker_mod._USAGE_DIR / "rollups.db")
+        conn.execute(
+            "CREATE TABLE usage_rollups (day TEXT NOT NULL, service TEXT NOT NULL, "
+            "tool TEXT NOT NULL, model TEXT NOT NULL, calls INTEGER NOT NULL DEFAULT 0, "
+            "input_tokens INTEGER NOT NULL DEFAULT 0, output_tokens INTEGER NOT NULL DEFAULT 0, "
+            "cost_usd REAL NOT NULL DEFAULT 0, PRIMARY KEY (day, service, tool, model))"
+        )
+        conn.commit()
+        conn.close()
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o",
+                                 input_tokens=1, cache_read_tokens=500)
+        assert tracker_mod.get_monthly_summary()["anthropic"]["cache_read_tokens"] == 500
+
+    def test_rebuild_matches_raw_entries(self):
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o",
+                                 input_tokens=5, output_tokens=5, estimated_cost_usd=0.5)
+        tracker_mod.flush()
+        # Day files edited behind the rollups' back (e.g. restored from backup)
+        now = datetime.now().isoformat(timespec="seconds")
+        day_file = tracker_mod._partition_path(now[:10])
+        with open(day_file, "a") as fh:
+            fh.write(json.dumps({"timestamp": now, "service": "anthropic", "tool": "t",
+                                 "operation": "o", "input_tokens": 1, "output_tokens": 1,
+                                 "estimated_cost_usd": 0.25}) + "\n")
+        assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 1
+        tracker_mod.rebuild_rollups()
+        summary = tracker_mod.get_monthly_summary()["anthropic"]
+        assert summary["calls"] == 2
+        assert abs(summary["cost_usd"] - 0.75) < 1e-9
+
+    def test_rebuild_and_concurrent_write_count_each_entry_once(self):
+        import threading
+
+        tracker_mod.log_api_call(service="anthropic", tool="t", operation="o")
+        tracker_mod.flush()
+        entry = {"timestamp": datetime.now().isoformat(timespec="seconds"),
+                 "service": "anthropic", "tool": "t", "operation": "o"}
+        # Another writer (its own connection, as in another process) arrives
+        # while the rebuild is reading the day files
+        writer = threading.Thread(target=tracker_mod._write_batch, args=([entry],))
+        read_entries = tracker_mod._read_entries
+
+        def read_during_write(since=""):
+            writer.start()
+            writer.join(0.2)
+            assert writer.is_alive()  # waiting for the rebuild's write lock
+            return read_entries(since)
+
+        with patch.object(tracker_mod, "_read_entries", side_effect=read_during_write):
+            tracker_mod.rebuild_rollups()
+        writer.join()
+        assert len(tracker_mod._load_entries()) == 2
+        assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 2
+
+    def test_built_from_day_files_on_first_use(self):
+        now = datetime.now().isoformat(timespec="seconds")
+        tracker_mod._write_partition(now[:10], [
+            {"timestamp": now, "service": "anthropic", "tool": "t", "operation": "o",
+             "input_tokens": 1, "output_tokens": 2, "estimated_cost_usd": 0.1},
+        ])
+        assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 1
+
+    def test_daily_breakdown_partial_first_day(self):
+        now = datetime.now()
+        inside = (now - timedelta(days=7) + timedelta(minutes=5)).isoformat(timespec="seconds")
+        outside = (now - timedelta(days=7) - timedelta(minutes=5)).isoformat(timespec="seconds")
+        entries = [
+            {"timestamp": outside, "service": "a", "tool": "t", "operation": "o"},
+            {"timestamp": inside, "service": "a", "tool": "t", "operation": "o"},
+        ]
+        tracker_mod._save_entries(entries)
+        total = sum(d["calls"] for d in tracker_mod.get_daily_breakdown(7))
+        assert total == 1
+
 
 # ── Budgets ──────────────────────────────────────────────────────────────
 
@@ -217,3 +505,162 @@ class TestBudgets:
         tracker_mod._BUDGETS_FILE.write_text("BAD")
         budgets = tracker_mod.load_budgets()
         assert "anthropic_monthly_usd" in budgets
+
+
+
+# ── Budget guard ─────────────────────────────────────────────────────────
+
+
+class TestBudgetGuard:
+    def _spend(self, service, cost):
+        tracker_mod.log_api_call(service=service, tool="t", operation="o",
+                                 estimated_cost_usd=cost)
+
+    def test_under_budget(self):
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 10.0, "google_monthly_usd": 5.0})
+        self._spend("anthropic", 2.0)
+        status = tracker_mod.check_budget("anthropic")
+        assert status["exceeded"] is False
+        assert abs(status["spent_usd"] - 2.0) < 1e-9
+        assert abs(status["fraction"] - 0.2) < 1e-9
+
+    def test_seeded_once_then_kept_in_memory(self):
+        self._spend("anthropic", 1.0)
+        tracker_mod.check_budget("anthropic")
+        with patch.object(tracker_mod, "_query_rollups") as query:
+            self._spend("anthropic", 3.0)
+            spent = tracker_mod.get_month_to_date_spend("anthropic")
+        query.assert_not_called()
+        assert abs(spent - 4.0) < 1e-9
+
+    def test_reseeds_to_pick_up_other_processes(self):
+        tracker_mod.check_budget("anthropic")
+        # Another app's spend lands in the rollups without touching our totals
+        tracker_mod._write_batch([{"timestamp": datetime.now().isoformat(timespec="seconds"),
+                                   "service": "anthropic", "estimated_cost_usd": 7.0}])
+        assert tracker_mod.get_month_to_date_spend("anthropic") == 0.0
+        with patch.object(tracker_mod, "_BUDGET_RESEED_SECONDS", -1):
+            assert abs(tracker_mod.get_month_to_date_spend("anthropic") - 7.0) < 1e-9
+
+    def test_warn_mode_reports_but_allows(self, capsys):
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 1.0, "google_monthly_usd": 5.0,
+                                  "enforcement": "warn"})
+        self._spend("anthropic", 1.5)
+        status = tracker_mod.check_budget("anthropic", tool="brief-builder")
+        assert status["exceeded"] is True
+        assert status["warning"].startswith("Monthly Anthropic budget of $1.00 reached")
+        assert status["warning"].endswith("brief-builder")
+        assert tracker_mod.get_budget_warnings() == [
+            "Monthly Anthropic budget of $1.00 reached ($1.50 spent this month)"]
+        assert capsys.readouterr().out == ""
+
+    def test_no_warnings_under_budget_or_when_blocking(self):
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 1.0, "enforcement": "warn"})
+        self._spend("anthropic", 0.5)
+        assert tracker_mod.check_budget("anthropic")["warning"] == ""
+        assert tracker_mod.get_budget_warnings() == []
+        self._spend("anthropic", 1.0)
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 1.0, "enforcement": "block"})
+        assert tracker_mod.get_budget_warnings() == []
+
+    def test_block_mode_raises(self):
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 1.0, "enforcement": "block"})
+        self._spend("anthropic", 1.5)
+        with pytest.raises(tracker_mod.BudgetExceededError):
+            tracker_mod.check_budget("anthropic")
+
+    def test_estimated_cost_counts_toward_budget(self):
+        tracker_mod.save_budgets({"google_monthly_usd": 1.0, "enforcement": "block"})
+        self._spend("google_translate", 0.6)
+        tracker_mod.check_budget("google_translate", 0.3)
+        with pytest.raises(tracker_mod.BudgetExceededError):
+            tracker_mod.check_budget("google_translate", 0.5)
+
+    def test_off_mode_never_blocks(self):
+        tracker_mod.save_budgets({"anthropic_monthly_usd": 1.0, "enforcement": "off"})
+        self._spend("anthropic", 5.0)
+        assert tracker_mod.check_budget("anthropic")["exceeded"] is False
+
+
+# ── Response-cache stats ─────────────────────────────────────────────────
+
+
+class TestCacheStats:
+    def test_empty_summary(self):
+        summary = tracker_mod.get_cache_summary()
+        assert summary["hits"] == 0
+        assert summary["hit_rate"] == 0.0
+        assert summary["tools"] == []
+
+    def test_hits_misses_and_savings(self):
+        tracker_mod.record_cache_lookup("brief-builder", hit=False)
+        tracker_mod.record_cache_lookup("brief-builder", hit=True, saved_usd=0.05)
+        tracker_mod.record_cache_lookup("brief-builder", hit=True, saved_usd=0.05)
+        tracker_mod.record_cache_lookup("timeline-builder", hit=False, saved_usd=1.0)
+        summary = tracker_mod.get_cache_summary()
+        assert summary["hits"] == 2
+        assert summary["misses"] == 2
+        assert summary["hit_rate"] == pytest.approx(0.5)
+        assert summary["saved_usd"] == pytest.approx(0.10)
+        assert summary["tools"][0]["tool"] == "brief-builder"
+
+    def test_lookups_are_counted_in_memory_until_flushed(self):
+        with patch.object(tracker_mod, "_rollup_conn") as rollup_conn:
+            for _ in range(50):
+                tracker_mod.record_cache_lookup("brief-builder", hit=True, saved_usd=0.01)
+            tracker_mod.record_cache_lookup("brief-builder", hit=False)
+        rollup_conn.assert_not_called()
+        summary = tracker_mod.get_cache_summary()
+        assert (summary["hits"], summary["misses"]) == (50, 1)
+        assert summary["saved_usd"] == pytest.approx(0.5)
+
+    def test_cache_stats_do_not_count_as_api_calls(self):
+        tracker_mod.record_cache_lookup("brief-builder", hit=True, saved_usd=0.05)
+        assert tracker_mod.get_monthly_summary()["anthropic"]["calls"] == 0
+
+
+class TestSalesforceCalls:
+    def test_counts_per_tool_and_operation(self):
+        for _ in range(3):
+            tracker_mod.record_salesforce_call("cover-letters", "query")
+        tracker_mod.record_salesforce_call("sf_mirror", "query")
+        tracker_mod.record_salesforce_call("sf_mirror", "composite")
+        summary = tracker_mod.get_salesforce_summary()
+        assert summary["today"] == summary["month"] == 5
+        assert summary["tools"][0] == {"tool": "cover-letters", "month": 3, "today": 3}
+        assert summary["operations_today"] == {"query": 4, "composite": 1}
+
+    def test_calls_are_counted_in_memory_until_flushed(self):
+        with patch.object(tracker_mod, "_rollup_conn") as rollup_conn:
+            for _ in range(100):
+                tracker_mod.record_salesforce_call("cover-letters", "query")
+        rollup_conn.assert_not_called()
+        assert tracker_mod.get_salesforce_summary()["today"] == 100
+
+    def test_counts_kept_when_database_write_fails(self):
+        tracker_mod.record_salesforce_call("cover-letters", "query")
+        with patch.object(tracker_mod, "_record_counts", return_value=False):
+            tracker_mod.flush()
+        tracker_mod.record_salesforce_call("cover-letters", "query")
+        assert tracker_mod.get_salesforce_summary()["today"] == 2
+
+    def test_retention_prunes_old_days(self):
+        old_day = (datetime.now() - timedelta(days=120)).strftime("%Y-%m-%d")
+        tracker_mod._rollup_conn().execute(
+            "INSERT INTO sf_calls (day, tool, operation, calls) VALUES (?, 'old', 'query', 7)",
+            (old_day,),
+        )
+        tracker_mod._drop_expired_partitions()
+        assert tracker_mod._rollup_conn().execute("SELECT COUNT(*) FROM sf_calls").fetchone()[0] == 0
+
+    def test_salesforce_calls_are_not_billed_api_calls(self):
+        tracker_mod.record_salesforce_call("cover-letters", "query")
+        assert tracker_mod.get_per_tool_breakdown() == []
+
+    def test_api_limit_keeps_latest(self):
+        assert tracker_mod.get_api_limit("salesforce") is None
+        tracker_mod.record_api_limit("salesforce", 100, 15000)
+        tracker_mod.record_api_limit("salesforce", 12000, 15000)
+        limit = tracker_mod.get_api_limit("salesforce")
+        assert (limit["used"], limit["limit"]) == (12000, 15000)
+        assert limit["fraction"] == pytest.approx(0.8)
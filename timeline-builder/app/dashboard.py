@@ -35,7 +35,14 @@ from app.events import (
     parsed_date_to_display,
     save_timeline,
 )
-from app.doc_extractor import compile_exhibit_pdf, extract_events_from_documents, extract_pages_from_pdf
+from app.doc_extractor import (
+    collect_extraction_batch,
+    compile_exhibit_pdf,
+    estimate_extraction,
+    extract_events_from_documents,
+    extract_pages_from_pdf,
+    submit_extraction_batch,
+)
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from shared.google_upload import upload_to_google_docs
@@ -816,6 +823,12 @@ with tab_extract:
         # Cache combined list for extraction
         st.session_state["_extract_doc_data"] = all_doc_data
 
+        _est = estimate_extraction(all_doc_data, list(EVENT_CATEGORIES.keys()))
+        st.caption(
+            f"About {_est['batches']} AI call{'s' if _est['batches'] != 1 else ''}, "
+            f"estimated ${_est['cost_usd']:.2f} (half that if queued overnight)."
+        )
+
         # Extract button
         if st.button(
             "Extract Timeline Events",
@@ -825,6 +838,51 @@ with tab_extract:
             st.session_state["_run_extraction"] = True
             st.rerun()
 
+        # Not urgent? Queue it as a Message Batch at half the price
+        if st.button(
+            "Queue Extraction Overnight (half price)",
+            use_container_width=True,
+            help="Results usually arrive within a few hours. Load them from Queued Extractions below.",
+        ):
+            try:
+                batch_id = submit_extraction_batch(all_doc_data, list(EVENT_CATEGORIES.keys()))
+                st.toast(f"Queued extraction batch {batch_id}")
+            except Exception as exc:
+                st.error(f"Could not queue extraction: {exc}")
+
+    # Queued (batch) extractions from this or earlier sessions
+    from shared.claude_client import forget_batch, list_batches, poll_batch
+
+    queued = list_batches("timeline-builder")
+    if queued:
+        with st.expander(f"Queued Extractions ({len(queued)})"):
+            for rec in queued:
+                qc1, qc2, qc3 = st.columns([4, 1, 1])
+                with qc1:
+                    st.markdown(f"**{html_mod.escape(rec.get('label', rec['id']))}**")
+                    st.caption(
+                        f"{rec.get('created_at', '')[:16].replace('T', ' ')} — "
+                        f"{rec.get('request_count', 0)} batches — {rec.get('status', '')}"
+                    )
+                with qc2:
+                    if st.button("Load", key=f"_batch_load_{rec['id']}"):
+                        try:
+                            if poll_batch(rec["id"])["status"] != "ended":
+                                st.info("Still processing — check back later.")
+                            else:
+                                extracted = collect_extraction_batch(rec["id"])
+                                st.session_state.extracted_events = extracted
+                                st.session_state.extraction_selections = {
+                                    i: True for i in range(len(extracted))
+                                }
+                                st.rerun()
+                        except Exception as exc:
+                            st.error(f"Could not load batch: {exc}")
+                with qc3:
+                    if st.button("Remove", key=f"_batch_forget_{rec['id']}"):
+                        forget_batch(rec["id"])
+                        st.rerun()
+
     # Run extraction if flagged (runs on the rerun after button click)
     if st.session_state.get("_run_extraction"):
         st.session_state["_run_extraction"] = False
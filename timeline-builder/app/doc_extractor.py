@@ -16,7 +16,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from app.events import CATEGORY_DESCRIPTIONS, EVENT_CATEGORIES
 
-BATCH_SIZE = 25  # pages per AI call
+# Token budgets per AI call — pages are packed to fit (see shared/chunker.py)
+MAX_INPUT_TOKENS = 24_000
+MAX_OUTPUT_TOKENS = 3_500   # headroom under max_tokens=4096
+OUTPUT_RATIO = 0.15         # event JSON is a small fraction of the page text
 
 
 def extract_pages_from_pdf(pdf_bytes: bytes) -> list[str]:
@@ -106,6 +109,76 @@ def _parse_ai_response(raw: str) -> list[dict]:
     return []
 
 
+def _is_event_json(raw: str) -> bool:
+    """Whether *raw* contains a parseable event array (used for model fallback)."""
+    if _parse_ai_response(raw):
+        return True
+    # A legitimately empty result still counts as valid
+    return re.fullmatch(r"(?:```(?:json)?)?\s*\[\s*\]\s*(?:```)?", raw.strip()) is not None
+
+
+def _page_batches(
+    docs: list[dict], system_prompt: str
+) -> tuple[list[tuple[str, int, list[str]]], int, float]:
+    """Split documents into ``(doc_name, start_page, pages)`` batches.
+
+    Consecutive pages are packed to the token budgets above, so dense
+    pages get smaller batches and sparse ones larger. Batches with no
+    text are left out; their count is returned alongside so progress
+    totals still cover every page. Also returns the estimated total cost.
+    """
+    from shared.chunker import estimate_tokens, pack
+
+    jobs: list[tuple[str, int, list[str]]] = []
+    skipped = 0
+    cost = 0.0
+    for doc in docs:
+        chunks = pack(
+            doc["pages"] or [""],
+            max_input_tokens=MAX_INPUT_TOKENS,
+            max_output_tokens=MAX_OUTPUT_TOKENS,
+            output_ratio=OUTPUT_RATIO,
+            prompt_tokens=estimate_tokens(system_prompt) + estimate_tokens(doc["name"]) + 8,
+            tool_name="timeline-builder",
+            operation="extract",
+        )
+        for chunk in chunks:
+            if all(not p.strip() for p in chunk.items):
+                skipped += 1
+                continue
+            # Page numbers are 1-indexed
+            jobs.append((doc["name"], chunk.start + 1, chunk.items))
+            cost += chunk.estimated_cost_usd
+    return jobs, skipped, cost
+
+
+def estimate_extraction(docs: list[dict], categories: list[str]) -> dict:
+    """Preview an extraction run: ``{"batches": int, "cost_usd": float}``."""
+    jobs, _, cost = _page_batches(docs, _build_system_prompt(categories))
+    return {"batches": len(jobs), "cost_usd": cost}
+
+
+def _events_from_response(raw_response: str, doc_name: str) -> list[dict]:
+    """Turn one batch's raw AI response into timeline event dicts."""
+    events: list[dict] = []
+    for event in _parse_ai_response(raw_response):
+        # Ensure source citation is in the description
+        source = event.get("source", f"{doc_name}")
+        desc = event.get("description", "")
+        # Only append if the doc name doesn't already appear in a bracket citation
+        if source and doc_name not in desc:
+            desc = f"{desc} [{source}]" if desc else f"[{source}]"
+
+        events.append({
+            "date": event.get("date", ""),
+            "category": event.get("category", "Personal"),
+            "title": event.get("title", "Untitled event"),
+            "description": desc,
+            "source": source,
+        })
+    return events
+
+
 def extract_events_from_documents(
     docs: list[dict],
     categories: list[str],
@@ -128,68 +201,97 @@ def extract_events_from_documents(
         Extracted events with keys: date, category, title, description, source.
     """
     from shared.claude_client import draft_with_claude
+    from shared.claude_executor import run_batches
 
     system_prompt = _build_system_prompt(categories)
 
-    # Count total batches for progress
-    total_batches = 0
-    for doc in docs:
-        page_count = len(doc["pages"])
-        total_batches += max(1, (page_count + BATCH_SIZE - 1) // BATCH_SIZE)
+    # Split every document into page batches; empty batches need no AI call
+    jobs, skipped, _ = _page_batches(docs, system_prompt)
+
+    total_batches = skipped + len(jobs)
+    if on_progress and skipped:
+        on_progress(skipped, total_batches)
+
+    def _extract(job: tuple[str, int, list[str]]) -> str:
+        doc_name, start_page, batch_pages = job
+        return draft_with_claude(
+            system_prompt=system_prompt,
+            user_message=_build_user_message(doc_name, batch_pages, start_page),
+            max_tokens=4096,
+            tool_name="timeline-builder",
+            operation="extract",
+            # Same long system prompt for every batch: cache it
+            cache_prompt=True,
+            validate=_is_event_json,
+        )
+
+    # Batches run concurrently; responses come back in document/page order
+    responses = run_batches(
+        _extract,
+        jobs,
+        on_done=(lambda done, _total: on_progress(skipped + done, total_batches))
+        if on_progress else None,
+        return_exceptions=True,
+    )
 
     all_events: list[dict] = []
-    completed = 0
     errors: list[str] = []
 
-    for doc in docs:
-        doc_name = doc["name"]
-        pages = doc["pages"]
-
-        for batch_start in range(0, max(len(pages), 1), BATCH_SIZE):
-            batch_pages = pages[batch_start : batch_start + BATCH_SIZE]
-            if not batch_pages or all(not p.strip() for p in batch_pages):
-                completed += 1
-                if on_progress:
-                    on_progress(completed, total_batches)
-                continue
-
-            # Page numbers are 1-indexed
-            start_page = batch_start + 1
-            user_message = _build_user_message(doc_name, batch_pages, start_page)
-
-            try:
-                raw_response = draft_with_claude(
-                    system_prompt=system_prompt,
-                    user_message=user_message,
-                    max_tokens=4096,
-                    tool_name="timeline-builder",
-                )
-                parsed = _parse_ai_response(raw_response)
-                for event in parsed:
-                    # Ensure source citation is in the description
-                    source = event.get("source", f"{doc_name}")
-                    desc = event.get("description", "")
-                    # Only append if the doc name doesn't already appear in a bracket citation
-                    if source and doc_name not in desc:
-                        desc = f"{desc} [{source}]" if desc else f"[{source}]"
-
-                    all_events.append({
-                        "date": event.get("date", ""),
-                        "category": event.get("category", "Personal"),
-                        "title": event.get("title", "Untitled event"),
-                        "description": desc,
-                        "source": source,
-                    })
-            except Exception as exc:
-                errors.append(f"{doc_name} (pages {start_page}-{start_page + len(batch_pages) - 1}): {exc}")
-
-            completed += 1
-            if on_progress:
-                on_progress(completed, total_batches)
+    for (doc_name, start_page, batch_pages), raw_response in zip(jobs, responses):
+        try:
+            if isinstance(raw_response, Exception):
+                raise raw_response
+            all_events.extend(_events_from_response(raw_response, doc_name))
+        except Exception as exc:
+            errors.append(f"{doc_name} (pages {start_page}-{start_page + len(batch_pages) - 1}): {exc}")
 
     return all_events
 
 
+def submit_extraction_batch(docs: list[dict], categories: list[str], label: str = "") -> str:
+    """Queue timeline extraction for *docs* as a half-price Message Batch.
+
+    Returns the batch id. Results usually arrive within a few hours;
+    fetch them with ``collect_extraction_batch``.
+    """
+    from shared.claude_client import submit_batch
+
+    system_prompt = _build_system_prompt(categories)
+    jobs, _, _ = _page_batches(docs, system_prompt)
+    requests = [
+        {
+            "system_prompt": system_prompt,
+            "user_message": _build_user_message(doc_name, batch_pages, start_page),
+            "max_tokens": 4096,
+            "cache_prompt": True,
+            "operation": "extract",
+        }
+        for doc_name, start_page, batch_pages in jobs
+    ]
+    return submit_batch(
+        requests,
+        tool_name="timeline-builder",
+        label=label or ", ".join(d["name"] for d in docs),
+        context={"doc_names": [doc_name for doc_name, _, _ in jobs]},
+    )
+
+
+def collect_extraction_batch(batch_id: str) -> list[dict]:
+    """Events from a finished extraction batch, in document/page order.
+
+    Raises RuntimeError if the batch is still processing.
+    """
+    from shared.claude_client import collect_batch, load_batch
+
+    record = load_batch(batch_id) or {}
+    doc_names = record.get("context", {}).get("doc_names", [])
+    events: list[dict] = []
+    for doc_name, raw_response in zip(doc_names, collect_batch(batch_id)):
+        if raw_response:
+            events.extend(_events_from_response(raw_response, doc_name))
+    return events
+
+
 def compile_exhibit_pdf(docs: list[dict]) -> tuple[bytes, list[dict]]:
     """Merge source PDFs into an exhibit package with TOC and separator pages.
 
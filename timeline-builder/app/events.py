@@ -10,6 +10,7 @@ from __future__ import annotations
 import json
 import re
 import uuid
+from collections.abc import Mapping
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -21,11 +22,11 @@ DATA_DIR = BASE_DIR / "data" / "timelines"
 
 import sys as _sys
 _sys.path.insert(0, str(BASE_DIR.parent))
-from shared.config_store import get_config_value
+from shared.config_store import live_config_value
 
 # ── Category definitions ─────────────────────────────────────────────────────
 
-_DEFAULT_EVENT_CATEGORIES: dict[str, str] = {
+_DEFAULT_EVENT_CATEGORIES: Mapping[str, str] = {
     "Persecution": "#dc3545",   # red — incidents of harm, threats, discrimination
     "Travel": "#0d6efd",        # blue — departure, transit countries, arrival in US
     "Legal": "#198754",         # green — applications filed, RFEs, hearings, decisions
@@ -33,7 +34,7 @@ _DEFAULT_EVENT_CATEGORIES: dict[str, str] = {
     "Medical": "#6f42c1",       # purple — injuries, treatment, psychological evaluations
 }
 
-_DEFAULT_CATEGORY_DESCRIPTIONS: dict[str, str] = {
+_DEFAULT_CATEGORY_DESCRIPTIONS: Mapping[str, str] = {
     "Persecution": "Incidents of harm, threats, discrimination",
     "Travel": "Departure, transit countries, arrival in US",
     "Legal": "Applications filed, RFEs, hearings, decisions",
@@ -42,8 +43,8 @@ _DEFAULT_CATEGORY_DESCRIPTIONS: dict[str, str] = {
 }
 
 # ── Config-aware loading (JSON override with hardcoded fallback) ─────────────
-EVENT_CATEGORIES: dict[str, str] = get_config_value("timeline-builder", "event_categories", _DEFAULT_EVENT_CATEGORIES)
-CATEGORY_DESCRIPTIONS: dict[str, str] = get_config_value("timeline-builder", "category_descriptions", _DEFAULT_CATEGORY_DESCRIPTIONS)
+EVENT_CATEGORIES: Mapping[str, str] = live_config_value("timeline-builder", "event_categories", _DEFAULT_EVENT_CATEGORIES)
+CATEGORY_DESCRIPTIONS: Mapping[str, str] = live_config_value("timeline-builder", "category_descriptions", _DEFAULT_CATEGORY_DESCRIPTIONS)
 
 # ── Data model ───────────────────────────────────────────────────────────────
 